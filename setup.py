@@ -12,18 +12,29 @@ setup(
         "torch>=1.0.0",
         "PyPDF2>=3.0.0",
         "reportlab>=4.0.0",
+        "numpy>=1.24.0",
+        "prometheus-client>=0.19.0",
         "python-docx>=0.8.11",
         "pdf2docx>=0.5.6"
     ],
+    entry_points={
+        "console_scripts": [
+            "presidio-nl=src.cli:main"
+        ]
+    },
     extras_require={
         "test": [
             "pytest>=7.0.0",
             "pytest-cov>=4.0.0",
             "pytest-asyncio>=0.21.0",
+            "pytest-benchmark>=4.0.0",
             "psutil>=5.9.0",
             "requests>=2.31.0",
             "httpx>=0.24.0",
             "fastapi>=0.68.0"
+        ],
+        "tesserocr": [
+            "tesserocr>=2.6.0"
         ]
     }
 ) 
\ No newline at end of file
@@ -2,21 +2,43 @@
 import os
 os.environ['TORCHDYNAMO_DISABLE'] = '1'
 
+import logging
+from contextlib import asynccontextmanager
+
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 
-from .routes import analysis, anonymization, health
+from ..core.memory import format_memory_report, memory_report
+from .lanes import shutdown_lanes
+from .metrics import InFlightMiddleware, metrics_response
+from .routes import admin, analysis, anonymization, downloads, health, jobs
+from .uploads import UploadSizeLimitMiddleware
 
 # Get configuration from environment variables
 API_HOST = os.getenv("API_HOST", "0.0.0.0")
 API_PORT = int(os.getenv("API_PORT", "8080"))
 API_ROOT_PATH = os.getenv("API_ROOT_PATH", "/api/v1")
 
+logger = logging.getLogger(__name__)
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """Start background workers on startup and stop them on shutdown."""
+    # De modellen zijn bij het importeren van de routes geladen
+    logger.info(format_memory_report(memory_report()))
+    anonymization.storage_reaper.start()
+    jobs.start_workers()
+    yield
+    jobs.stop_workers()
+    anonymization.storage_reaper.stop()
+    shutdown_lanes()
+
 app = FastAPI(
     title="Presidio-NL API",
     description="API voor Nederlandse tekst analyse en anonimisatie",
     version="0.1.0",
-    root_path=API_ROOT_PATH
+    root_path=API_ROOT_PATH,
+    lifespan=lifespan
 )
 
 # Configure CORS
@@ -28,8 +50,19 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+# Te grote uploads weigeren voordat ze volledig ontvangen zijn
+app.add_middleware(UploadSizeLimitMiddleware)
+app.add_middleware(InFlightMiddleware)
+
 # Include routers
 app.include_router(health.router)
 app.include_router(analysis.router)
 app.include_router(anonymization.router)
-app.include_router(anonymization.download_router) 
\ No newline at end of file
+app.include_router(downloads.router)
+app.include_router(jobs.router)
+app.include_router(admin.router)
+
+@app.get("/metrics", include_in_schema=False)
+async def metrics():
+    """Prometheus metrics: stage latencies, model load times, queue depth and storage usage."""
+    return metrics_response()
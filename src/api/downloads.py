@@ -0,0 +1,235 @@
+"""File responses with range requests, strong ETags and streaming zip archives."""
+import hashlib
+import logging
+import os
+import re
+import threading
+import zipfile
+from collections import OrderedDict
+from pathlib import Path
+from typing import Iterable, Iterator, Optional, Tuple
+
+from fastapi import Request, Response
+from fastapi.responses import StreamingResponse
+
+logger = logging.getLogger(__name__)
+
+# Grootte van de blokken waarin bestanden gelezen en verstuurd worden
+CHUNK_SIZE = int(os.environ.get('DOWNLOAD_CHUNK_SIZE', 64 * 1024))
+
+# Aantal bestanden waarvan de ETag in het geheugen bewaard wordt
+ETAG_CACHE_SIZE = int(os.environ.get('ETAG_CACHE_SIZE', 4096))
+
+_RANGE_PATTERN = re.compile(r"^bytes=(\d*)-(\d*)$")
+
+
+class RangeNotSatisfiable(Exception):
+    """The requested byte range lies outside the file."""
+
+
+class ETagCache:
+    """
+    Strong ETags (SHA-256 of the content) for files, computed once per version.
+
+    Entries are keyed by path, size and modification time, so a rewritten
+    file gets a new ETag without hashing unchanged files on every request.
+    """
+
+    def __init__(self, max_entries: int = ETAG_CACHE_SIZE):
+        """
+        Initialize the cache.
+
+        Args:
+            max_entries: Maximum number of files to remember
+        """
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[Tuple[str, int, int], str]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, path: Path, stat: Optional[os.stat_result] = None) -> str:
+        """
+        Return the quoted ETag of a file.
+
+        Args:
+            path: File to identify
+            stat: Optional result of os.stat for the file
+
+        Returns:
+            ETag header value
+        """
+        stat = stat or path.stat()
+        key = (str(path), stat.st_size, stat.st_mtime_ns)
+        with self._lock:
+            if key in self._entries:
+                self._entries.move_to_end(key)
+                return self._entries[key]
+
+        digest = hashlib.sha256()
+        with open(path, 'rb') as f:
+            for chunk in iter(lambda: f.read(CHUNK_SIZE), b""):
+                digest.update(chunk)
+        etag = f'"{digest.hexdigest()}"'
+
+        with self._lock:
+            self._entries[key] = etag
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+        return etag
+
+
+etag_cache = ETagCache()
+
+
+def parse_range(header: str, size: int) -> Optional[Tuple[int, int]]:
+    """
+    Parse a single byte range from a Range header.
+
+    Multiple ranges are not supported; the whole file is sent instead,
+    which HTTP allows.
+
+    Args:
+        header: Value of the Range header
+        size: Size of the file in bytes
+
+    Returns:
+        Inclusive (start, end) offsets, or None to send the whole file
+
+    Raises:
+        RangeNotSatisfiable: If the range does not overlap the file
+    """
+    match = _RANGE_PATTERN.match(header.strip())
+    if match is None:
+        return None
+
+    first, last = match.groups()
+    if not first and not last:
+        return None
+    if not first:
+        # Laatste N bytes
+        length = int(last)
+        if length == 0:
+            raise RangeNotSatisfiable()
+        return max(size - length, 0), size - 1
+
+    start = int(first)
+    end = min(int(last), size - 1) if last else size - 1
+    if start >= size or start > end:
+        raise RangeNotSatisfiable()
+    return start, end
+
+
+def _etag_matches(header: str, etag: str) -> bool:
+    tags = [tag.strip() for tag in header.split(",")]
+    return "*" in tags or etag in tags
+
+
+def iter_file(path: Path, start: int = 0, length: Optional[int] = None) -> Iterator[bytes]:
+    """Yield (part of) a file in CHUNK_SIZE blocks."""
+    with open(path, 'rb') as f:
+        f.seek(start)
+        remaining = length
+        while remaining is None or remaining > 0:
+            chunk = f.read(CHUNK_SIZE if remaining is None else min(CHUNK_SIZE, remaining))
+            if not chunk:
+                break
+            if remaining is not None:
+                remaining -= len(chunk)
+            yield chunk
+
+
+def file_response(request: Request, path: Path, media_type: str, filename: str) -> Response:
+    """
+    Serve a file with ETag, If-None-Match and Range support.
+
+    Args:
+        request: The incoming request
+        path: File to send
+        media_type: Content type of the file
+        filename: Name for the Content-Disposition header
+
+    Returns:
+        200 with the file, 206 with a byte range, 304 if the client copy is
+        current, or 416 for a range outside the file
+    """
+    stat = path.stat()
+    etag = etag_cache.get(path, stat)
+    headers = {
+        "ETag": etag,
+        "Accept-Ranges": "bytes",
+        "Content-Disposition": f'attachment; filename="{filename}"',
+    }
+
+    if_none_match = request.headers.get("if-none-match")
+    if if_none_match and _etag_matches(if_none_match, etag):
+        return Response(status_code=304, headers=headers)
+
+    range_header = request.headers.get("range")
+    if_range = request.headers.get("if-range")
+    if range_header and (if_range is None or if_range.strip() == etag):
+        try:
+            byte_range = parse_range(range_header, stat.st_size)
+        except RangeNotSatisfiable:
+            headers["Content-Range"] = f"bytes */{stat.st_size}"
+            return Response(status_code=416, headers=headers)
+
+        if byte_range is not None:
+            start, end = byte_range
+            headers["Content-Range"] = f"bytes {start}-{end}/{stat.st_size}"
+            headers["Content-Length"] = str(end - start + 1)
+            return StreamingResponse(
+                iter_file(path, start, end - start + 1),
+                status_code=206,
+                media_type=media_type,
+                headers=headers
+            )
+
+    headers["Content-Length"] = str(stat.st_size)
+    return StreamingResponse(iter_file(path), media_type=media_type, headers=headers)
+
+
+class _ZipStream:
+    """Write-only, unseekable file object that collects what zipfile writes."""
+
+    def __init__(self):
+        self._chunks = []
+
+    def write(self, data: bytes) -> int:
+        self._chunks.append(bytes(data))
+        return len(data)
+
+    def flush(self) -> None:
+        pass
+
+    def take(self) -> bytes:
+        data = b"".join(self._chunks)
+        self._chunks = []
+        return data
+
+
+def iter_zip(files: Iterable[Tuple[Path, str]]) -> Iterator[bytes]:
+    """
+    Build a zip archive on the fly and yield it in pieces.
+
+    Because the output is unseekable, zipfile writes sizes and checksums in a
+    data descriptor after each member; nothing is buffered beyond one chunk.
+    Members are stored without compression since PDFs are already compressed.
+
+    Args:
+        files: (path, name in archive) pairs
+
+    Yields:
+        Parts of the zip archive
+    """
+    stream = _ZipStream()
+    with zipfile.ZipFile(stream, mode='w', compression=zipfile.ZIP_STORED) as archive:
+        for path, name in files:
+            # De grootte staat vooraf vast, zodat zipfile zelf bepaalt of zip64 nodig is
+            info = zipfile.ZipInfo.from_file(path, arcname=name)
+            info.compress_type = zipfile.ZIP_STORED
+            with archive.open(info, mode='w') as member:
+                for chunk in iter_file(path):
+                    member.write(chunk)
+                    data = stream.take()
+                    if data:
+                        yield data
+    yield stream.take()
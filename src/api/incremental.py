@@ -0,0 +1,100 @@
+"""WebSocket sessions for incremental analysis of documents being edited."""
+import json
+import logging
+import os
+from typing import Any, Dict, Optional
+
+from fastapi import HTTPException, WebSocket, WebSocketDisconnect
+
+from ..core.incremental import IncrementalDocument
+from .lanes import Lane
+from .serialization import lean_entities
+
+logger = logging.getLogger(__name__)
+
+# Maximale grootte van een document in een sessie
+INCREMENTAL_MAX_CHARS = int(os.environ.get('INCREMENTAL_MAX_CHARS', 1_000_000))
+
+
+def _error(detail: str) -> Dict[str, Any]:
+    return {"type": "error", "detail": detail}
+
+
+def _entities(document: IncrementalDocument, reanalyzed: int) -> Dict[str, Any]:
+    return {
+        "type": "entities",
+        "version": document.version,
+        "reanalyzed": reanalyzed,
+        "entities": lean_entities(document.results())
+    }
+
+
+async def incremental_session(websocket: WebSocket, analyzer, lane: Lane) -> None:
+    """
+    Run an editing session on a WebSocket.
+
+    The client opens a document with {"type": "open", "text": ..., "entities": [...]}
+    and then sends {"type": "edit", "version": ..., "edits": [{"start", "end", "text"}]}.
+    After every message the server replies with all entities of the current
+    document version; only paragraphs changed by the edits are analyzed again.
+    Invalid messages get an error reply and the session continues.
+
+    Args:
+        websocket: The WebSocket connection
+        analyzer: DutchTextAnalyzer used for the paragraphs
+        lane: Execution lane the analysis runs on
+    """
+    await websocket.accept()
+    document: Optional[IncrementalDocument] = None
+
+    try:
+        while True:
+            raw = await websocket.receive_text()
+            try:
+                message = json.loads(raw)
+                if not isinstance(message, dict):
+                    raise ValueError("Bericht moet een JSON object zijn")
+
+                if message.get("type") == "open":
+                    text = message.get("text")
+                    if not isinstance(text, str):
+                        raise ValueError("Veld 'text' ontbreekt of is geen string")
+                    if len(text) > INCREMENTAL_MAX_CHARS:
+                        raise ValueError(f"Document te groot (maximaal {INCREMENTAL_MAX_CHARS} tekens)")
+                    document = IncrementalDocument(analyzer, message.get("entities"))
+                    reanalyzed = await lane.run(document.set_text, text)
+
+                elif message.get("type") == "edit":
+                    if document is None:
+                        raise ValueError("Open eerst een document")
+                    version = message.get("version")
+                    if version is not None and version != document.version:
+                        raise ValueError(
+                            f"Versie {version} komt niet overeen met de huidige versie {document.version}"
+                        )
+                    edits = message.get("edits")
+                    if not isinstance(edits, list) or not all(isinstance(edit, dict) for edit in edits):
+                        raise ValueError("Veld 'edits' moet een lijst van wijzigingen zijn")
+                    added = sum(len(edit.get("text") or "") for edit in edits)
+                    if len(document.text) + added > INCREMENTAL_MAX_CHARS:
+                        raise ValueError(f"Document te groot (maximaal {INCREMENTAL_MAX_CHARS} tekens)")
+                    reanalyzed = await lane.run(document.apply_edits, edits)
+
+                else:
+                    raise ValueError("Onbekend berichttype; gebruik 'open' of 'edit'")
+
+            except (ValueError, KeyError, TypeError) as e:
+                await websocket.send_json(_error(str(e)))
+                continue
+            except HTTPException as e:
+                await websocket.send_json(_error(e.detail))
+                continue
+            except Exception as e:
+                logger.error(f"Incremental analysis failed: {str(e)}", exc_info=True)
+                await websocket.send_json(_error(f"Error analyzing text: {str(e)}"))
+                continue
+
+            await websocket.send_json(_entities(document, reanalyzed))
+
+    except WebSocketDisconnect:
+        logger.debug("Incremental analysis session closed")
@@ -0,0 +1,314 @@
+"""Local job queue for asynchronous PDF processing."""
+import json
+import logging
+import sqlite3
+import threading
+import time
+import uuid
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Set, Union
+
+logger = logging.getLogger(__name__)
+
+# Job statussen
+QUEUED = "queued"
+RUNNING = "running"
+DONE = "done"
+FAILED = "failed"
+
+
+class JobQueue:
+    """
+    Persistent job queue in a local SQLite database.
+
+    No external broker is needed: the API and the workers share the database
+    file, and jobs survive a restart of the process.
+    """
+
+    def __init__(self, db_path: Union[str, Path]):
+        """
+        Initialize the queue and create the jobs table if needed.
+
+        Args:
+            db_path: Path of the SQLite database file
+        """
+        self.db_path = str(db_path)
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(self.db_path, check_same_thread=False, isolation_level=None)
+        self._conn.row_factory = sqlite3.Row
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("""
+            CREATE TABLE IF NOT EXISTS jobs (
+                id TEXT PRIMARY KEY,
+                status TEXT NOT NULL,
+                filename TEXT NOT NULL,
+                input_path TEXT NOT NULL,
+                options TEXT NOT NULL,
+                pages_done INTEGER NOT NULL DEFAULT 0,
+                pages_total INTEGER,
+                result TEXT,
+                error TEXT,
+                created_at REAL NOT NULL,
+                updated_at REAL NOT NULL
+            )
+        """)
+        self._conn.execute("CREATE INDEX IF NOT EXISTS jobs_status ON jobs (status, created_at)")
+
+        # Wordt gezet bij elke nieuwe job zodat wachtende workers direct verder gaan
+        self.new_job = threading.Event()
+
+    @staticmethod
+    def new_id() -> str:
+        """Generate a job id, e.g. to name the upload before submitting."""
+        return uuid.uuid4().hex
+
+    def submit(
+        self,
+        filename: str,
+        input_path: Union[str, Path],
+        options: Dict[str, Any],
+        job_id: Optional[str] = None
+    ) -> str:
+        """
+        Add a job to the queue.
+
+        Args:
+            filename: Original name of the uploaded file
+            input_path: Path of the stored upload
+            options: Processing options (entities, use_ocr, ...)
+            job_id: Optional id from new_id(); generated when omitted
+
+        Returns:
+            Id of the new job
+        """
+        job_id = job_id or self.new_id()
+        now = time.time()
+        with self._lock:
+            self._conn.execute(
+                "INSERT INTO jobs (id, status, filename, input_path, options, created_at, updated_at) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?)",
+                (job_id, QUEUED, filename, str(input_path), json.dumps(options), now, now)
+            )
+        self.new_job.set()
+        return job_id
+
+    def claim(self) -> Optional[Dict[str, Any]]:
+        """
+        Take the oldest queued job and mark it as running.
+
+        Returns:
+            The claimed job, or None when the queue is empty
+        """
+        with self._lock:
+            self._conn.execute("BEGIN IMMEDIATE")
+            try:
+                row = self._conn.execute(
+                    "SELECT * FROM jobs WHERE status = ? ORDER BY created_at LIMIT 1", (QUEUED,)
+                ).fetchone()
+                if row is None:
+                    self._conn.execute("COMMIT")
+                    return None
+                self._conn.execute(
+                    "UPDATE jobs SET status = ?, updated_at = ? WHERE id = ?",
+                    (RUNNING, time.time(), row["id"])
+                )
+                self._conn.execute("COMMIT")
+            except Exception:
+                self._conn.execute("ROLLBACK")
+                raise
+
+        job = self._to_dict(row)
+        job["status"] = RUNNING
+        return job
+
+    def update_progress(self, job_id: str, pages_done: int, pages_total: Optional[int]) -> None:
+        """Record how many pages of a running job have been processed."""
+        with self._lock:
+            self._conn.execute(
+                "UPDATE jobs SET pages_done = ?, pages_total = ?, updated_at = ? WHERE id = ?",
+                (pages_done, pages_total, time.time(), job_id)
+            )
+
+    def complete(self, job_id: str, result: Dict[str, Any]) -> None:
+        """Mark a job as done and store its result."""
+        with self._lock:
+            self._conn.execute(
+                "UPDATE jobs SET status = ?, result = ?, updated_at = ? WHERE id = ?",
+                (DONE, json.dumps(result), time.time(), job_id)
+            )
+
+    def fail(self, job_id: str, error: str) -> None:
+        """Mark a job as failed."""
+        with self._lock:
+            self._conn.execute(
+                "UPDATE jobs SET status = ?, error = ?, updated_at = ? WHERE id = ?",
+                (FAILED, error, time.time(), job_id)
+            )
+
+    def get(self, job_id: str) -> Optional[Dict[str, Any]]:
+        """Return a job by id, or None if it does not exist."""
+        with self._lock:
+            row = self._conn.execute("SELECT * FROM jobs WHERE id = ?", (job_id,)).fetchone()
+        return self._to_dict(row) if row is not None else None
+
+    def depth(self) -> int:
+        """Number of jobs waiting to be processed."""
+        with self._lock:
+            return self._conn.execute(
+                "SELECT COUNT(*) FROM jobs WHERE status = ?", (QUEUED,)
+            ).fetchone()[0]
+
+    def heartbeat(self, job_ids: List[str]) -> None:
+        """Renew the lease of running jobs, so other workers do not take them over."""
+        now = time.time()
+        with self._lock:
+            self._conn.executemany(
+                "UPDATE jobs SET updated_at = ? WHERE id = ? AND status = ?",
+                [(now, job_id, RUNNING) for job_id in job_ids]
+            )
+
+    def requeue_running(self, lease: float = 0.0) -> int:
+        """
+        Put running jobs whose worker stopped back in the queue.
+
+        A running job counts as abandoned when it has not been updated (by
+        progress or heartbeat) for lease seconds; jobs of live workers in
+        other processes sharing the database are left alone.
+
+        Args:
+            lease: Seconds without an update before a running job is requeued
+
+        Returns:
+            Number of requeued jobs
+        """
+        now = time.time()
+        with self._lock:
+            cursor = self._conn.execute(
+                "UPDATE jobs SET status = ?, pages_done = 0, updated_at = ? WHERE status = ? AND updated_at <= ?",
+                (QUEUED, now, RUNNING, now - lease)
+            )
+        if cursor.rowcount:
+            self.new_job.set()
+        return cursor.rowcount
+
+    def purge(self, max_age: float) -> List[Dict[str, Any]]:
+        """
+        Remove finished jobs older than max_age seconds.
+
+        Returns:
+            The removed jobs
+        """
+        cutoff = time.time() - max_age
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT * FROM jobs WHERE status IN (?, ?) AND updated_at < ?", (DONE, FAILED, cutoff)
+            ).fetchall()
+            self._conn.execute(
+                "DELETE FROM jobs WHERE status IN (?, ?) AND updated_at < ?", (DONE, FAILED, cutoff)
+            )
+        return [self._to_dict(row) for row in rows]
+
+    def close(self) -> None:
+        """Close the database connection."""
+        with self._lock:
+            self._conn.close()
+
+    @staticmethod
+    def _to_dict(row: sqlite3.Row) -> Dict[str, Any]:
+        job = dict(row)
+        job["options"] = json.loads(job["options"])
+        job["result"] = json.loads(job["result"]) if job["result"] else None
+        return job
+
+
+class JobWorkerPool:
+    """Threads that take jobs from a JobQueue and process them."""
+
+    def __init__(
+        self,
+        queue: JobQueue,
+        handler: Callable[[Dict[str, Any], Callable[[int, Optional[int]], None]], Dict[str, Any]],
+        workers: int = 1,
+        poll_interval: float = 1.0,
+        heartbeat_interval: float = 60.0
+    ):
+        """
+        Initialize the worker pool.
+
+        Args:
+            queue: Queue to take jobs from
+            handler: Function that processes a job; it receives the job and a
+                progress callback (pages done, pages total) and returns the result
+            workers: Number of worker threads
+            poll_interval: Maximum time a worker waits before checking the queue again
+            heartbeat_interval: Seconds between lease renewals of running jobs;
+                must be well below the lease used by requeue_running
+        """
+        self.queue = queue
+        self.handler = handler
+        self.workers = workers
+        self.poll_interval = poll_interval
+        self.heartbeat_interval = heartbeat_interval
+        self._stop = threading.Event()
+        self._threads: List[threading.Thread] = []
+        self._running: Set[str] = set()
+        self._running_lock = threading.Lock()
+
+    def start(self) -> None:
+        """Start the worker threads."""
+        self._stop.clear()
+        for i in range(self.workers):
+            thread = threading.Thread(target=self._run, name=f"job-worker-{i}", daemon=True)
+            thread.start()
+            self._threads.append(thread)
+        thread = threading.Thread(target=self._heartbeat, name="job-heartbeat", daemon=True)
+        thread.start()
+        self._threads.append(thread)
+        logger.info(f"Started {self.workers} job worker(s)")
+
+    def stop(self, timeout: Optional[float] = None) -> None:
+        """Stop the worker threads after their current job."""
+        self._stop.set()
+        self.queue.new_job.set()
+        for thread in self._threads:
+            thread.join(timeout)
+        self._threads = []
+
+    def _run(self) -> None:
+        while not self._stop.is_set():
+            job = self.queue.claim()
+            if job is None:
+                self.queue.new_job.wait(self.poll_interval)
+                self.queue.new_job.clear()
+                continue
+            self.process(job)
+
+    def _heartbeat(self) -> None:
+        while not self._stop.wait(self.heartbeat_interval):
+            with self._running_lock:
+                running = list(self._running)
+            if running:
+                try:
+                    self.queue.heartbeat(running)
+                except Exception as e:
+                    logger.error(f"Job heartbeat failed: {str(e)}", exc_info=True)
+
+    def process(self, job: Dict[str, Any]) -> None:
+        """Process a single claimed job and record the outcome."""
+        job_id = job["id"]
+        logger.debug(f"Processing job {job_id}: {job['filename']}")
+
+        def progress(pages_done: int, pages_total: Optional[int]) -> None:
+            self.queue.update_progress(job_id, pages_done, pages_total)
+
+        with self._running_lock:
+            self._running.add(job_id)
+        try:
+            result = self.handler(job, progress)
+            self.queue.complete(job_id, result)
+        except Exception as e:
+            logger.error(f"Job {job_id} failed: {str(e)}", exc_info=True)
+            self.queue.fail(job_id, str(e))
+        finally:
+            with self._running_lock:
+                self._running.discard(job_id)
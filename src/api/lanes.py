@@ -0,0 +1,224 @@
+"""Priority lanes: separate executors for interactive and bulk work."""
+import asyncio
+import contextvars
+import logging
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, AsyncIterator, Callable, Optional, TypeVar
+
+from fastapi import HTTPException
+
+from .metrics import LANE_ACTIVE, LANE_QUEUED, LANE_REJECTED, LANE_WAIT_SECONDS
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+# Korte tekst requests (UI): eigen workers zodat ze niet achter PDFs wachten
+INTERACTIVE_WORKERS = int(os.environ.get('INTERACTIVE_WORKERS', 2))
+INTERACTIVE_QUEUE = int(os.environ.get('INTERACTIVE_QUEUE', 64))
+
+# PDFs en batches: gebruiken de capaciteit die interactief werk overlaat
+BULK_WORKERS = int(os.environ.get('BULK_WORKERS', 1))
+BULK_QUEUE = int(os.environ.get('BULK_QUEUE', 16))
+
+# Maximale tijd dat bulk werk wacht tot de interactieve lane leeg is
+BULK_MAX_YIELD = float(os.environ.get('BULK_MAX_YIELD', 2.0))
+
+
+class Reservation:
+    """
+    A queue slot taken by Lane.admit, held until a task takes it over.
+
+    The slot counts as a queued task from the moment the request is
+    admitted, so work done before the task is submitted (such as receiving
+    an upload) cannot let more requests through than the queue allows.
+    Release it when the request ends; after a task took it over that is a
+    no-op. Used as a context manager it is released on exit.
+    """
+
+    def __init__(self, lane: "Lane"):
+        """Initialize a held slot of a lane."""
+        self._lane = lane
+        self._held = True
+
+    def take(self) -> bool:
+        """Hand the slot over to a task; return False if it was already taken or released."""
+        held, self._held = self._held, False
+        return held
+
+    def release(self) -> None:
+        """Give the slot back if no task took it over."""
+        if self.take():
+            self._lane._update(queued=-1)
+
+    async def release_after(self, stream: AsyncIterator[T]) -> AsyncIterator[T]:
+        """Yield from a (response) stream and release the slot when it ends."""
+        try:
+            async for item in stream:
+                yield item
+        finally:
+            self.release()
+
+    def __enter__(self) -> "Reservation":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.release()
+
+
+class Lane:
+    """
+    Bounded executor for one class of work.
+
+    Each lane has its own worker threads and queue limit, so a burst in one
+    lane cannot delay the other. A lane with yield_to set gives way to that
+    lane: before starting a task it waits (up to max_yield seconds) until the
+    other lane has nothing queued or running.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        workers: int,
+        max_queue: int,
+        yield_to: Optional["Lane"] = None,
+        max_yield: float = BULK_MAX_YIELD
+    ):
+        """
+        Initialize the lane.
+
+        Args:
+            name: Lane name, used in thread names and as metrics label
+            workers: Number of tasks processed at the same time
+            max_queue: Maximum number of waiting tasks before requests are refused
+            yield_to: Optional lane that gets priority over this one
+            max_yield: Maximum seconds a task waits for the priority lane
+        """
+        self.name = name
+        self.workers = workers
+        self.max_queue = max_queue
+        self.yield_to = yield_to
+        self.max_yield = max_yield
+        self._executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix=f"lane-{name}")
+        self._lock = threading.Lock()
+        self._queued = 0
+        self._active = 0
+        self._idle = threading.Event()
+        self._idle.set()
+
+    def _update(self, queued: int = 0, active: int = 0) -> None:
+        with self._lock:
+            self._apply(queued, active)
+
+    def _apply(self, queued: int, active: int) -> None:
+        # Aanroeper houdt self._lock vast
+        self._queued += queued
+        self._active += active
+        LANE_QUEUED.labels(self.name).set(self._queued)
+        LANE_ACTIVE.labels(self.name).set(self._active)
+        if self._queued + self._active:
+            self._idle.clear()
+        else:
+            self._idle.set()
+
+    def stats(self) -> dict:
+        """Return the number of queued and running tasks."""
+        with self._lock:
+            return {"queued": self._queued, "active": self._active, "workers": self.workers}
+
+    def admit(self) -> Reservation:
+        """
+        Reserve a place in the queue for another task.
+
+        The check and the reservation happen under one lock, so concurrent
+        requests cannot all pass while the queue is still empty.
+
+        Returns:
+            The reserved slot; pass it to run() or release it
+
+        Raises:
+            HTTPException: 429 if the queue is full
+        """
+        with self._lock:
+            full = self._queued >= self.max_queue
+            if not full:
+                self._apply(queued=1, active=0)
+        if full:
+            LANE_REJECTED.labels(self.name).inc()
+            raise HTTPException(
+                status_code=429,
+                detail="Te veel verzoeken in behandeling, probeer het later opnieuw",
+                headers={"Retry-After": "1"}
+            )
+        return Reservation(self)
+
+    def _execute(self, func: Callable[..., T], args: tuple, queued_at: float) -> T:
+        self._update(queued=-1, active=1)
+        try:
+            LANE_WAIT_SECONDS.labels(self.name).observe(time.perf_counter() - queued_at)
+            if self.yield_to is not None:
+                self.yield_to._idle.wait(self.max_yield)
+            return func(*args)
+        finally:
+            self._update(active=-1)
+
+    async def run(
+        self,
+        func: Callable[..., T],
+        *args: Any,
+        admit: bool = True,
+        reservation: Optional[Reservation] = None
+    ) -> T:
+        """
+        Run a function on the lane's workers and wait for the result.
+
+        The function runs in a copy of the caller's context, so stage
+        profiling of the request keeps working.
+
+        Args:
+            func: Function to run
+            *args: Arguments for func
+            admit: Refuse with 429 when the queue is full; set to False for
+                follow-up work of a request that was already admitted
+            reservation: Slot from admit() that this task takes over; when
+                it was already taken the task is queued without a check
+
+        Returns:
+            The result of func
+        """
+        if reservation is None and admit:
+            reservation = self.admit()
+        if reservation is None or not reservation.take():
+            self._update(queued=1)
+        context = contextvars.copy_context()
+        future = self._executor.submit(context.run, self._execute, func, args, time.perf_counter())
+        # Een geannuleerde taak die nog niet gestart was telt niet meer als wachtend
+        future.add_done_callback(lambda f: f.cancelled() and self._update(queued=-1))
+        return await asyncio.wrap_future(future)
+
+    def call(self, func: Callable[..., T], *args: Any) -> T:
+        """
+        Run a function in the calling thread as work of this lane.
+
+        For threads that already exist, such as the job workers: the task is
+        counted in the lane's metrics and gives way to the priority lane.
+        """
+        self._update(queued=1)
+        return self._execute(func, args, time.perf_counter())
+
+    def shutdown(self) -> None:
+        """Stop the workers after the tasks that are already queued."""
+        self._executor.shutdown(wait=False)
+
+
+interactive_lane = Lane("interactive", INTERACTIVE_WORKERS, INTERACTIVE_QUEUE)
+bulk_lane = Lane("bulk", BULK_WORKERS, BULK_QUEUE, yield_to=interactive_lane)
+
+
+def shutdown_lanes() -> None:
+    """Stop the workers of all lanes."""
+    interactive_lane.shutdown()
+    bulk_lane.shutdown()
@@ -0,0 +1,72 @@
+"""Prometheus metrics of the API process and the /metrics response."""
+from fastapi import Response
+from prometheus_client import CONTENT_TYPE_LATEST, Counter, Gauge, Histogram, generate_latest
+
+IN_FLIGHT = Gauge(
+    "presidio_requests_in_flight",
+    "HTTP requests currently being handled"
+)
+
+JOB_QUEUE_DEPTH = Gauge(
+    "presidio_job_queue_depth",
+    "Jobs waiting to be processed"
+)
+
+STORAGE_FILES = Gauge(
+    "presidio_storage_files",
+    "Number of files in container storage"
+)
+
+STORAGE_BYTES = Gauge(
+    "presidio_storage_bytes",
+    "Total size of the files in container storage"
+)
+
+LANE_QUEUED = Gauge(
+    "presidio_lane_queued",
+    "Tasks waiting for a worker, per execution lane",
+    ["lane"]
+)
+
+LANE_ACTIVE = Gauge(
+    "presidio_lane_active",
+    "Tasks being processed, per execution lane",
+    ["lane"]
+)
+
+LANE_WAIT_SECONDS = Histogram(
+    "presidio_lane_wait_seconds",
+    "Time tasks waited before processing started, per execution lane",
+    ["lane"],
+    buckets=(0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0)
+)
+
+LANE_REJECTED = Counter(
+    "presidio_lane_rejected_total",
+    "Requests refused because the lane queue was full",
+    ["lane"]
+)
+
+
+class InFlightMiddleware:
+    """Count the HTTP requests that are being handled."""
+
+    def __init__(self, app):
+        """Initialize the middleware around an ASGI application."""
+        self.app = app
+
+    async def __call__(self, scope, receive, send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        IN_FLIGHT.inc()
+        try:
+            await self.app(scope, receive, send)
+        finally:
+            IN_FLIGHT.dec()
+
+
+def metrics_response() -> Response:
+    """Render all registered metrics in the Prometheus text format."""
+    return Response(content=generate_latest(), media_type=CONTENT_TYPE_LATEST)
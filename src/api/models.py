@@ -1,5 +1,5 @@
 """API models for request and response data."""
-from typing import List, Dict, Optional
+from typing import Any, List, Dict, Optional
 from pydantic import BaseModel
 
 class TextRequest(BaseModel):
@@ -17,6 +17,7 @@ class AnalysisResponse(BaseModel):
     """Response model for text analysis."""
     text: str
     entities_found: List[Entity]
+    profile: Optional[Dict[str, Any]] = None
 
 class EntityFound(BaseModel):
     """Found entity in text."""
@@ -34,6 +35,7 @@ class AnonymizeResponse(BaseModel):
     original_text: str
     anonymized_text: str
     entities_found: List[EntityFound]
+    profile: Optional[Dict[str, Any]] = None
 
 class ProcessResponse(BaseModel):
     """Response model for PDF processing."""
@@ -42,5 +44,25 @@ class ProcessResponse(BaseModel):
     input_file: str
     output_file: str
     download_link: str
+    ocr: Optional[Dict[str, Any]] = None
     message: Optional[str] = None
-    error: Optional[str] = None 
\ No newline at end of file
+    error: Optional[str] = None
+    profile: Optional[Dict[str, Any]] = None
+    memory: Optional[Dict[str, Optional[int]]] = None
+
+class JobResponse(BaseModel):
+    """Status of an asynchronous PDF processing job."""
+    job_id: str
+    status: str
+    filename: str
+    pages_done: int = 0
+    pages_total: Optional[int] = None
+    created_at: float
+    updated_at: float
+    download_link: Optional[str] = None
+    result: Optional[ProcessResponse] = None
+    error: Optional[str] = None
+
+class ZipRequest(BaseModel):
+    """Request model for downloading multiple files as a zip archive."""
+    filenames: List[str]
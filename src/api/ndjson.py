@@ -0,0 +1,171 @@
+"""Newline-delimited JSON (NDJSON) streaming for batch endpoints."""
+import json
+import logging
+import os
+from typing import Any, AsyncIterator, Awaitable, Callable, Dict, List, Optional, Tuple
+
+from fastapi import Request
+from fastapi.concurrency import run_in_threadpool
+from fastapi.responses import StreamingResponse
+from pydantic import BaseModel, ValidationError
+
+from ..core.batching import Batcher, Record, payloads, result_lines
+
+logger = logging.getLogger(__name__)
+
+NDJSON_MEDIA_TYPE = "application/x-ndjson"
+
+# Aantal documenten dat samen door de analyzer gaat
+BATCH_SIZE = int(os.environ.get('BATCH_SIZE', 32))
+
+# Maximale grootte van één regel (document) in de request
+BATCH_MAX_LINE_BYTES = int(os.environ.get('BATCH_MAX_LINE_BYTES', 10 * 1024 * 1024))
+
+
+class BatchDocument(BaseModel):
+    """One document (line) in a batch request."""
+    text: str
+    id: Optional[str] = None
+
+
+class NDJSONStreamingResponse(StreamingResponse):
+    """
+    Streaming response that is written while the request body is still read.
+
+    The default StreamingResponse listens for a client disconnect on the
+    receive channel, which would compete with the request stream that the
+    response generator consumes. A disconnect is raised by the request
+    stream itself, so the extra listener is not needed.
+    """
+
+    media_type = NDJSON_MEDIA_TYPE
+
+    async def __call__(self, scope, receive, send) -> None:
+        await self.stream_response(send)
+        if self.background is not None:
+            await self.background()
+
+
+def encode_line(data: Dict[str, Any]) -> bytes:
+    """Serialise one result as an NDJSON line."""
+    return json.dumps(data, ensure_ascii=False).encode('utf-8') + b"\n"
+
+
+class LineTooLong(ValueError):
+    """A request line is longer than BATCH_MAX_LINE_BYTES."""
+
+    def __init__(self, index: int):
+        super().__init__(f"Regel groter dan {BATCH_MAX_LINE_BYTES} bytes")
+        self.index = index
+
+
+async def iter_lines(request: Request) -> AsyncIterator[Tuple[int, bytes]]:
+    """
+    Yield the non-empty lines of the request body, with their index, as they arrive.
+
+    The index is the zero-based line number in the body: empty lines are
+    skipped but still counted, as in the CLI, so the index of an output line
+    always matches the line number of its input. Every chunk is scanned only
+    once; the parts of a line that spans chunks are joined when it ends.
+
+    Raises:
+        LineTooLong: If a line is longer than BATCH_MAX_LINE_BYTES
+    """
+    parts: List[bytes] = []  # Begin van de huidige regel uit eerdere chunks
+    size = 0
+    index = 0
+    async for chunk in request.stream():
+        start = 0
+        while (end := chunk.find(b"\n", start)) >= 0:
+            if size + end - start > BATCH_MAX_LINE_BYTES:
+                raise LineTooLong(index)
+            line = b"".join(parts + [chunk[start:end]]) if parts else chunk[start:end]
+            parts, size = [], 0
+            if line.strip():
+                yield index, line
+            index += 1
+            start = end + 1
+        if start < len(chunk):
+            parts.append(chunk[start:])
+            size += len(chunk) - start
+            if size > BATCH_MAX_LINE_BYTES:
+                raise LineTooLong(index)
+    line = b"".join(parts)
+    if line.strip():
+        yield index, line
+
+
+def parse_document(line: bytes) -> Tuple[Optional[BatchDocument], Optional[str]]:
+    """
+    Parse one request line.
+
+    Returns:
+        The document, or None and an error message for an invalid line
+    """
+    try:
+        data = json.loads(line)
+        if not isinstance(data, dict):
+            return None, "Regel moet een JSON object zijn"
+        if data.get("id") is not None:
+            data["id"] = str(data["id"])
+        return BatchDocument(**data), None
+    except json.JSONDecodeError as e:
+        return None, f"Ongeldige JSON: {str(e)}"
+    except ValidationError as e:
+        return None, f"Ongeldig document: {e.errors()[0]['msg']}"
+
+
+async def stream_batches(
+    request: Request,
+    handler: Callable[[List[BatchDocument]], List[Dict[str, Any]]],
+    batch_size: int = BATCH_SIZE,
+    run: Callable[..., Awaitable[Any]] = run_in_threadpool
+) -> AsyncIterator[bytes]:
+    """
+    Read documents from an NDJSON request and stream one result line per document.
+
+    Documents are collected in batches of batch_size and processed by
+    handler in a worker thread (via run); the results of a batch are sent
+    before the next batch is read, so memory use is bounded by the batch
+    size rather than the request size. Every output line carries the
+    zero-based "index" of its input line, counting empty lines (and the
+    "id" if one was given).
+    Invalid lines and failed batches produce lines with an "error" field;
+    the stream goes on.
+
+    Args:
+        request: Request with one JSON object per line ({"text": ..., "id": ...})
+        handler: Function that processes a list of documents and returns
+            one result dict per document
+        batch_size: Number of documents per handler call
+        run: Coroutine function that runs handler off the event loop
+            (default: the threadpool; the API passes its bulk lane)
+
+    Yields:
+        Encoded NDJSON lines
+    """
+    async def flush(batch: List[Record]) -> AsyncIterator[bytes]:
+        documents = payloads(batch)
+        try:
+            results = await run(handler, documents) if documents else []
+            batch_error = None
+        except Exception as e:
+            logger.error(f"Batch failed: {str(e)}", exc_info=True)
+            results, batch_error = [], str(e)
+
+        for line in result_lines(batch, results, batch_error):
+            yield encode_line(line)
+
+    batcher = Batcher(batch_size)
+    try:
+        async for index, line in iter_lines(request):
+            document, error = parse_document(line)
+            batch = batcher.add((index, document.id if document else None, document, error))
+            if batch is not None:
+                async for output in flush(batch):
+                    yield output
+    except LineTooLong as e:
+        batcher.add((e.index, None, None, str(e)))
+
+    async for output in flush(batcher.take()):
+        yield output
@@ -0,0 +1,71 @@
+"""Opt-in profiling of a single request via the profile query parameter."""
+from contextlib import ExitStack
+from typing import Any, Dict, Optional
+
+from fastapi import HTTPException, Request
+
+from ..core.instrumentation import ProfilerBusy, profile_calls, profile_stages
+from .security import require_admin
+
+# Waarden van de profile query parameter
+TIMINGS = "timings"
+CPROFILE = "cprofile"
+PROFILE_PATTERN = f"^({TIMINGS}|{CPROFILE})$"
+PROFILE_DESCRIPTION = (
+    "timings (tijd per verwerkingsstap) of cprofile (cProfile statistieken, "
+    "alleen met beheertoken)"
+)
+
+
+class RequestProfiler:
+    """
+    Profile the processing done inside a with block.
+
+    With mode None nothing is recorded and result stays None. With
+    "timings" result holds the stage timing tree; with "cprofile" it also
+    holds the cProfile summary and the raw pstats data.
+    """
+
+    def __init__(self, request: Request, mode: Optional[str]):
+        """
+        Initialize the profiler.
+
+        Args:
+            request: The incoming request (checked for the admin token for cprofile)
+            mode: None, "timings" or "cprofile"
+
+        Raises:
+            HTTPException: 403 if cprofile is requested without a valid admin token
+        """
+        if mode == CPROFILE:
+            require_admin(request)
+        self.mode = mode
+        self.result: Optional[Dict[str, Any]] = None
+        self._stack = ExitStack()
+        self._stage_profile = None
+        self._call_profile = None
+
+    def __enter__(self) -> "RequestProfiler":
+        if self.mode == CPROFILE:
+            try:
+                self._call_profile = self._stack.enter_context(profile_calls())
+            except ProfilerBusy:
+                raise HTTPException(
+                    status_code=409,
+                    detail="Er loopt al een cProfile sessie, probeer het later opnieuw"
+                )
+        if self.mode is not None:
+            self._stage_profile = self._stack.enter_context(profile_stages())
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        self._stack.close()
+        if self._stage_profile is None or exc_type is not None:
+            return
+
+        self.result = {"mode": self.mode, "timings": self._stage_profile.tree()}
+        if self._call_profile is not None:
+            self.result["cprofile"] = {
+                "summary": self._call_profile.summary(),
+                "pstats": self._call_profile.dump()
+            }
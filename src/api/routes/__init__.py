@@ -1,4 +1,4 @@
 """API route modules."""
-from . import health, analysis, anonymization
+from . import health, analysis, anonymization, downloads, jobs, admin
 
-__all__ = ["health", "analysis", "anonymization"] 
\ No newline at end of file
+__all__ = ["health", "analysis", "anonymization", "downloads", "jobs", "admin"] 
\ No newline at end of file
@@ -0,0 +1,26 @@
+"""Administrative routes for finding memory leaks; all require the admin token."""
+from fastapi import APIRouter, Depends, Query
+
+from ...core.memory import allocation_tracker
+from ..security import require_admin
+
+router = APIRouter(prefix="/admin", tags=["admin"], dependencies=[Depends(require_admin)])
+
+@router.post("/memory/snapshot")
+def memory_snapshot(
+    limit: int = Query(20, ge=1, le=500, description="Aantal allocatieplekken in het resultaat"),
+    group_by: str = Query("lineno", pattern="^(lineno|filename|traceback)$", description="Groepering van allocaties")
+):
+    """
+    Take a tracemalloc snapshot and return the top allocation sites by growth since the previous one.
+
+    The first call starts tracing (status "started"); the next calls return
+    the difference with the snapshot before them (status "diff"). Tracing
+    slows down the service until it is stopped with DELETE.
+    """
+    return allocation_tracker.snapshot(limit, group_by)
+
+@router.delete("/memory/snapshot")
+def stop_memory_tracing():
+    """Stop tracemalloc and discard the previous snapshot."""
+    return {"stopped": allocation_tracker.stop()}
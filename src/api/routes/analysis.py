@@ -1,21 +1,55 @@
 """Routes for text analysis."""
-from fastapi import APIRouter, HTTPException
+from functools import partial
+from typing import List, Optional
 
+from fastapi import APIRouter, HTTPException, Query, Request, WebSocket
+
+from ..incremental import incremental_session
+from ..lanes import bulk_lane, interactive_lane
 from ..models import TextRequest, AnalysisResponse, Entity
-from ...core.analyzer import DutchTextAnalyzer
+from ..profiling import PROFILE_DESCRIPTION, PROFILE_PATTERN, RequestProfiler
+from ..ndjson import BATCH_SIZE, BatchDocument, NDJSONStreamingResponse, stream_batches
+from ..serialization import COLUMNAR, FORMAT_PATTERN, FULL, lean_entities, lean_response
+from .anonymization import document_processor
 
 router = APIRouter()
-analyzer = DutchTextAnalyzer()
+# Eén set modellen voor de hele API: spaCy en RobBERT worden niet twee keer geladen
+analyzer = document_processor.analyzer
 
 @router.post("/analyze", response_model=AnalysisResponse)
-async def analyze_text(request: TextRequest):
+async def analyze_text(
+    request: TextRequest,
+    http_request: Request,
+    response_format: str = Query(
+        FULL,
+        alias="format",
+        pattern=FORMAT_PATTERN,
+        description="full, lean (alleen posities, types en scores) of columnar (lean als arrays)"
+    ),
+    profile: Optional[str] = Query(None, pattern=PROFILE_PATTERN, description=PROFILE_DESCRIPTION)
+):
     """
     Analyze text for entities.
     
-    Returns a list of found entities with their positions and scores.
+    Returns a list of found entities with their positions and scores. The
+    lean and columnar formats leave out the echoed text and are compressed
+    when the client accepts it. With profile set, the response also holds
+    the time spent per processing stage.
     """
+    profiler = RequestProfiler(http_request, profile)
+    
+    def analyze():
+        with profiler:
+            return analyzer.analyze_text(request.text, request.entities)
+    
     try:
-        results = analyzer.analyze_text(request.text, request.entities)
+        results = await interactive_lane.run(analyze)
+        
+        if response_format != FULL:
+            data = {"entities": lean_entities(results, columnar=response_format == COLUMNAR)}
+            if profiler.result is not None:
+                data["profile"] = profiler.result
+            return lean_response(http_request, data)
         
         entities_found = [
             Entity(
@@ -28,9 +62,12 @@ async def analyze_text(request: TextRequest):
         
         return AnalysisResponse(
             text=request.text,
-            entities_found=entities_found
+            entities_found=entities_found,
+            profile=profiler.result
         )
     
+    except HTTPException:
+        raise
     except ValueError as e:
         raise HTTPException(
             status_code=422,
@@ -40,4 +77,52 @@ async def analyze_text(request: TextRequest):
         raise HTTPException(
             status_code=500,
             detail=f"Error analyzing text: {str(e)}"
-        ) 
\ No newline at end of file
+        )
+
+@router.post("/analyze/batch", response_class=NDJSONStreamingResponse)
+async def analyze_batch(
+    request: Request,
+    entities: Optional[List[str]] = Query(None, description="Optionele lijst van entiteiten om te detecteren")
+):
+    """
+    Analyze many texts in one request.
+    
+    The request body is NDJSON with one {"text": ..., "id": ...} object per
+    line. Results are streamed back as NDJSON, one line per document in input
+    order, while the rest of the request is still being processed. Runs in
+    the bulk lane.
+    """
+    slot = bulk_lane.admit()
+    
+    def handle(documents: List[BatchDocument]) -> List[dict]:
+        texts = [document.text for document in documents]
+        return [
+            {
+                "entities_found": [
+                    {
+                        "entity_type": result.entity_type,
+                        "text": text[result.start:result.end],
+                        "start": result.start,
+                        "end": result.end,
+                        "score": result.score
+                    }
+                    for result in results
+                ]
+            }
+            for text, results in zip(texts, analyzer.analyze_batch(texts, entities, batch_size=BATCH_SIZE))
+        ]
+    
+    return NDJSONStreamingResponse(
+        slot.release_after(stream_batches(request, handle, run=partial(bulk_lane.run, reservation=slot)))
+    )
+
+@router.websocket("/analyze/ws")
+async def analyze_incremental(websocket: WebSocket):
+    """
+    Analyze a document while it is being edited.
+    
+    The client sends the document once and then only its edits; the server
+    keeps the document and re-analyzes just the changed paragraphs, replying
+    with all entities at their current offsets. Runs in the interactive lane.
+    """
+    await incremental_session(websocket, analyzer, interactive_lane)
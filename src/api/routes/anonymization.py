@@ -2,17 +2,28 @@
 import os
 import logging
 import tempfile
+import uuid
+from functools import partial
 from pathlib import Path
-from typing import List, Optional
-from fastapi import APIRouter, File, UploadFile, Query, HTTPException
+from typing import Callable, Dict, List, Optional
+from fastapi import APIRouter, File, UploadFile, Query, HTTPException, Request
 from pydantic import BaseModel
-from fastapi.responses import FileResponse
 from PyPDF2 import PdfReader
 import time
 
-from ...core.document import DocumentProcessor
+from ...core.document import OUTPUT_AUTO, OUTPUT_MODES, DocumentProcessor
+from ...core.instrumentation import PDF_PEAK_MEMORY_BYTES
+from ...core.memory import PeakMemory
 from ...core.ocr import OCRProcessor
 from ..models import AnonymizeResponse, ProcessResponse
+from ..downloads import etag_cache
+from ..lanes import bulk_lane, interactive_lane
+from ..metrics import STORAGE_BYTES, STORAGE_FILES
+from ..profiling import PROFILE_DESCRIPTION, PROFILE_PATTERN, RequestProfiler
+from ..ndjson import BATCH_SIZE, BatchDocument, NDJSONStreamingResponse, stream_batches
+from ..serialization import COLUMNAR, FORMAT_PATTERN, FULL, lean_entities, lean_response
+from ..storage import StorageIndex, StorageReaper
+from ..uploads import spool_upload
 
 # Set up logging
 logging.basicConfig(level=logging.DEBUG)
@@ -26,27 +37,40 @@ if not STORAGE_DIR.exists():
 
 logger.info(f"Container storage directory: {STORAGE_DIR}")
 
+# Databases (index, jobs) staan buiten STORAGE_DIR: alles daarin is via /download bereikbaar
+STATE_DIR = Path(os.environ.get('STATE_DIR', STORAGE_DIR.parent / 'state'))
+STATE_DIR.mkdir(parents=True, exist_ok=True)
+
 # Define cleanup time (in seconds)
 MAX_STORAGE_TIME = int(os.environ.get('MAX_STORAGE_TIME', 3600))  # Default 1 hour
 
-# Cleanup old files
-def cleanup_old_files():
-    """Remove files older than MAX_STORAGE_TIME from container storage."""
-    current_time = time.time()
-    try:
-        for file_path in STORAGE_DIR.glob('*.pdf'):
-            if current_time - file_path.stat().st_mtime > MAX_STORAGE_TIME:
-                logger.info(f"Removing old file from container: {file_path}")
-                file_path.unlink()
-    except Exception as e:
-        logger.error(f"Error during cleanup: {str(e)}")
+# Verlopen bestanden worden door een achtergrond thread opgeruimd (zie app lifespan)
+STORAGE_MAX_MB = int(os.environ.get('STORAGE_MAX_MB', 0))  # 0 = geen quota
+REAPER_INTERVAL = float(os.environ.get('REAPER_INTERVAL', 60))
 
-# Run cleanup on startup
-cleanup_old_files()
+# Toegestane OCR resolutie per request; de standaard komt uit OCR_DPI
+PDF_MIN_DPI = int(os.environ.get('PDF_MIN_DPI', 72))
+PDF_MAX_DPI = int(os.environ.get('PDF_MAX_DPI', 600))
 
-# Create two routers: one for anonymization and one for downloads
+OUTPUT_MODE_PATTERN = f"^({'|'.join(OUTPUT_MODES)})$"
+OUTPUT_MODE_DESCRIPTION = (
+    "auto (gescande pagina's behouden en alleen entiteiten zwart maken) "
+    "of text (altijd een nieuwe PDF met geanonimiseerde tekst)"
+)
+
+storage_index = StorageIndex(os.environ.get('STORAGE_INDEX', STATE_DIR / 'storage.db'))
+storage_reaper = StorageReaper(
+    storage_index,
+    STORAGE_DIR,
+    ttl=MAX_STORAGE_TIME,
+    max_bytes=STORAGE_MAX_MB * 1024 * 1024,
+    interval=REAPER_INTERVAL
+)
+STORAGE_FILES.set_function(lambda: storage_index.usage()["files"])
+STORAGE_BYTES.set_function(lambda: storage_index.usage()["bytes"])
+
+# Create router for anonymization; downloads are in routes/downloads.py
 anonymize_router = APIRouter(prefix="/anonymize", tags=["anonymization"])
-download_router = APIRouter(tags=["downloads"])
 
 # Initialize processors
 document_processor = DocumentProcessor()
@@ -58,7 +82,9 @@ poppler_path = os.environ.get('POPPLER_PATH', r'C:\Program Files\poppler-24.02.0
 try:
     ocr_processor = OCRProcessor(
         tesseract_cmd=tesseract_cmd,
-        poppler_path=poppler_path
+        poppler_path=poppler_path,
+        # De cache bevat de OCR tekst van elke pagina (persoonsgegevens): niet in STORAGE_DIR
+        cache_dir=os.environ.get('OCR_CACHE_DIR', STATE_DIR / 'ocr_cache')
     )
 except Exception as e:
     logger.warning(f"Could not initialize OCR: {str(e)}")
@@ -72,23 +98,50 @@ class AnonymizeRequest(BaseModel):
 @anonymize_router.post("/text", response_model=AnonymizeResponse)
 async def anonymize_text(
     request: AnonymizeRequest,
-    use_ocr: bool = Query(False, description="Of OCR gebruikt moet worden (alleen relevant voor PDF bestanden)")
+    http_request: Request,
+    use_ocr: bool = Query(False, description="Of OCR gebruikt moet worden (alleen relevant voor PDF bestanden)"),
+    response_format: str = Query(
+        FULL,
+        alias="format",
+        pattern=FORMAT_PATTERN,
+        description="full, lean (zonder originele tekst, alleen posities, types en scores) of columnar (lean als arrays)"
+    ),
+    profile: Optional[str] = Query(None, pattern=PROFILE_PATTERN, description=PROFILE_DESCRIPTION)
 ) -> AnonymizeResponse:
     """
     Anonimiseer tekst.
     
     Args:
         request: AnonymizeRequest met text en optionele entities
+        http_request: De HTTP request (voor Accept-Encoding)
         use_ocr: Of OCR gebruikt moet worden (alleen relevant voor PDF bestanden)
+        response_format: Response formaat (full, lean of columnar)
+        profile: Optioneel profiel van de verwerking (timings of cprofile)
         
     Returns:
         Geanonimiseerde tekst en statistieken
     """
-    # Analyze text
-    results = document_processor.analyzer.analyze_text(request.text, request.entities)
+    profiler = RequestProfiler(http_request, profile)
+    
+    def anonymize():
+        with profiler:
+            # Analyze text
+            results = document_processor.analyzer.analyze_text(request.text, request.entities)
+            
+            # Anonymize text
+            return results, document_processor.anonymizer.anonymize_text(request.text, results)
+    
+    # Interactieve lane: wacht niet achter PDFs en batches
+    results, anonymized = await interactive_lane.run(anonymize)
     
-    # Anonymize text
-    anonymized = document_processor.anonymizer.anonymize_text(request.text, results)
+    if response_format != FULL:
+        data = {
+            "anonymized_text": anonymized,
+            "entities": lean_entities(results, columnar=response_format == COLUMNAR)
+        }
+        if profiler.result is not None:
+            data["profile"] = profiler.result
+        return lean_response(http_request, data)
     
     # Return response
     return AnonymizeResponse(
@@ -98,22 +151,72 @@ async def anonymize_text(
             "entity_type": r.entity_type,
             "text": request.text[r.start:r.end],
             "score": r.score
-        } for r in results]
+        } for r in results],
+        profile=profiler.result
+    )
+
+@anonymize_router.post("/batch", response_class=NDJSONStreamingResponse)
+async def anonymize_batch(
+    request: Request,
+    entities: Optional[List[str]] = Query(None, description="Optionele lijst van entiteiten om te detecteren")
+):
+    """
+    Anonimiseer veel teksten in één request.
+    
+    De request body is NDJSON met per regel een object {"text": ..., "id": ...}.
+    De resultaten komen als NDJSON terug, één regel per document in dezelfde
+    volgorde, terwijl de rest van de request nog verwerkt wordt. Draait in
+    de bulk lane.
+    """
+    slot = bulk_lane.admit()
+    analyzer = document_processor.analyzer
+    anonymizer = document_processor.anonymizer
+    
+    def handle(documents: List[BatchDocument]) -> List[Dict]:
+        texts = [document.text for document in documents]
+        output = []
+        for text, results in zip(texts, analyzer.analyze_batch(texts, entities, batch_size=BATCH_SIZE)):
+            output.append({
+                "anonymized_text": anonymizer.anonymize_text(text, results),
+                "entities_found": [{
+                    "entity_type": r.entity_type,
+                    "text": text[r.start:r.end],
+                    "score": r.score
+                } for r in results]
+            })
+        return output
+    
+    return NDJSONStreamingResponse(
+        slot.release_after(stream_batches(request, handle, run=partial(bulk_lane.run, reservation=slot)))
     )
 
 @anonymize_router.post("/pdf", response_model=ProcessResponse)
 async def anonymize_pdf(
+    request: Request,
     file: UploadFile = File(...),
     entities: Optional[List[str]] = Query(None, description="Optionele lijst van entiteiten om te detecteren"),
-    use_ocr: bool = Query(False, description="Of OCR gebruikt moet worden voor gescande PDFs")
+    use_ocr: bool = Query(False, description="Of OCR gebruikt moet worden voor gescande PDFs"),
+    dpi: Optional[int] = Query(
+        None, ge=PDF_MIN_DPI, le=PDF_MAX_DPI, description="OCR resolutie voor deze PDF (standaard OCR_DPI)"
+    ),
+    detect_orientation: Optional[bool] = Query(
+        None, description="Paginarichting detecteren bij OCR (standaard OCR_DETECT_ORIENTATION)"
+    ),
+    output_mode: str = Query(OUTPUT_AUTO, pattern=OUTPUT_MODE_PATTERN, description=OUTPUT_MODE_DESCRIPTION),
+    profile: Optional[str] = Query(None, pattern=PROFILE_PATTERN, description=PROFILE_DESCRIPTION)
 ) -> ProcessResponse:
     """
     Anonimiseer een PDF bestand via de API.
     
     Args:
+        request: De HTTP request (voor het beheertoken bij profile=cprofile)
         file: PDF bestand
         entities: Optionele lijst van entiteiten om te detecteren
         use_ocr: Of OCR gebruikt moet worden voor gescande PDFs
+        dpi: Optionele OCR resolutie voor deze PDF
+        detect_orientation: Optioneel aan- of uitzetten van de detectie van de paginarichting
+        output_mode: auto (scans redigeren op de pagina-afbeeldingen) of text
+        profile: Optioneel profiel van de verwerking (timings of cprofile)
         
     Returns:
         ProcessResponse met statistieken en download link
@@ -123,78 +226,117 @@ async def anonymize_pdf(
 
     logger.debug(f"Starting PDF anonymization for file: {file.filename}")
     
-    # Create temporary file for processing
-    with tempfile.NamedTemporaryFile(delete=False, suffix='.pdf') as temp_in:
-        content = await file.read()
-        temp_in.write(content)
-        temp_path = Path(temp_in.name)
+    # Beheertoken en capaciteit controleren voordat de upload opgeslagen wordt;
+    # de plek in de wachtrij is vanaf nu gereserveerd
+    profiler = RequestProfiler(request, profile)
+    slot = bulk_lane.admit()
+    
+    # Upload in blokken naar een tijdelijk bestand schrijven (nooit volledig in het geheugen)
+    fd, temp_name = tempfile.mkstemp(suffix='.pdf')
+    os.close(fd)
+    temp_path = Path(temp_name)
         
-        try:
-            # Configure OCR if requested
-            if use_ocr and ocr_processor:
-                logger.debug("OCR requested and available, configuring processor")
-                document_processor.ocr_processor = ocr_processor
-            elif use_ocr:
-                logger.warning("OCR requested but not available")
-            
-            # Process PDF
-            timestamp = int(time.time())
-            output_filename = f"{timestamp}_{Path(file.filename).stem}_geanonimiseerd.pdf"
-            output_path = STORAGE_DIR / output_filename
-            
-            stats = document_processor.process_pdf(
-                input_path=temp_path,
-                output_path=output_path,
-                entities=entities
-            )
-            
-            logger.debug(f"PDF processing completed with stats: {stats}")
-            
-            # Verify file exists before returning response
-            if not output_path.exists():
-                logger.error(f"Output file not found after processing: {output_path}")
-                raise HTTPException(
-                    status_code=500,
-                    detail="PDF verwerking mislukt: output bestand niet gevonden"
+    try:
+        await spool_upload(file, temp_path)
+        
+        def process():
+            with profiler:
+                return process_uploaded_pdf(
+                    temp_path,
+                    file.filename,
+                    entities,
+                    use_ocr,
+                    dpi=dpi,
+                    detect_orientation=detect_orientation,
+                    output_mode=output_mode
                 )
-            
-            # Add download link to stats with the exact filename including timestamp
-            stats["download_link"] = f"/download/{output_filename}"  # Use the same filename with timestamp
-            
-            return ProcessResponse(**stats)
-            
-        except Exception as e:
-            logger.error(f"Error during PDF processing: {str(e)}", exc_info=True)
-            raise HTTPException(
-                status_code=500,
-                detail=f"Error processing PDF: {str(e)}"
-            )
-        finally:
-            # Cleanup temporary file
-            if temp_path.exists():
-                os.unlink(temp_path)
-
-@download_router.get("/download/{filename}")
-async def download_file(filename: str):
-    """Download a processed PDF file from container storage."""
-    file_path = STORAGE_DIR / filename
-    
-    logger.debug(f"Download requested for file: {filename}")
-    logger.debug(f"Looking for file in container storage: {file_path}")
-    
-    if not file_path.exists():
-        logger.error(f"File not found in container storage: {file_path}")
+        
+        stats = await bulk_lane.run(process, reservation=slot)
+        return ProcessResponse(**stats, profile=profiler.result)
+        
+    except HTTPException:
+        raise
+    except Exception as e:
+        logger.error(f"Error during PDF processing: {str(e)}", exc_info=True)
         raise HTTPException(
-            status_code=404, 
-            detail=f"Bestand niet gevonden. Mogelijk is de verwerking nog bezig of is het bestand verlopen (na {MAX_STORAGE_TIME} seconden)."
+            status_code=500,
+            detail=f"Error processing PDF: {str(e)}"
         )
+    finally:
+        slot.release()
+        # Cleanup temporary file
+        if temp_path.exists():
+            os.unlink(temp_path)
+
+def process_uploaded_pdf(
+    input_path: Path,
+    filename: str,
+    entities: Optional[List[str]] = None,
+    use_ocr: bool = False,
+    progress_callback: Optional[Callable[[int, int], None]] = None,
+    dpi: Optional[int] = None,
+    detect_orientation: Optional[bool] = None,
+    output_mode: str = OUTPUT_AUTO
+) -> Dict:
+    """
+    Anonymize an uploaded PDF and store the result in container storage.
     
-    return FileResponse(
-        path=str(file_path),
-        filename=filename,
-        media_type="application/pdf"
-    )
+    Args:
+        input_path: Path of the uploaded PDF
+        filename: Original filename of the upload
+        entities: Optional list of entities to detect
+        use_ocr: Whether OCR should be used for scanned PDFs
+        progress_callback: Optional function called with (pages done, pages total)
+        dpi: Optional OCR rasterisation resolution
+        detect_orientation: Optional override of the OCR orientation detection
+        output_mode: "auto" (redact scanned pages in place) or "text"
+        
+    Returns:
+        Processing statistics including the download link
+    """
+    if use_ocr and ocr_processor is None:
+        logger.warning("OCR requested but not available")
+    
+    # Per request een unieke naam; gelijktijdige uploads met dezelfde naam botsen niet
+    timestamp = int(time.time())
+    output_filename = f"{timestamp}_{uuid.uuid4().hex[:8]}_{Path(filename).stem}_geanonimiseerd.pdf"
+    output_path = STORAGE_DIR / output_filename
+    
+    # Alle opties per aanroep; de gedeelde document_processor wordt niet aangepast
+    with PeakMemory() as peak:
+        stats = document_processor.process_pdf(
+            input_path=input_path,
+            output_path=output_path,
+            entities=entities,
+            progress_callback=progress_callback,
+            ocr_processor=ocr_processor if use_ocr else None,
+            dpi=dpi,
+            output_mode=output_mode,
+            detect_orientation=detect_orientation
+        )
+    
+    PDF_PEAK_MEMORY_BYTES.labels("rss").observe(peak.rss_bytes)
+    if peak.traced_bytes is not None:
+        PDF_PEAK_MEMORY_BYTES.labels("traced").observe(peak.traced_bytes)
+    stats["memory"] = peak.to_dict()
+    logger.debug(f"PDF processing completed with stats: {stats}")
+    
+    # Verify file exists before returning response
+    if not output_path.exists():
+        logger.error(f"Output file not found after processing: {output_path}")
+        raise HTTPException(
+            status_code=500,
+            detail="PDF verwerking mislukt: output bestand niet gevonden"
+        )
+    
+    storage_index.register(output_filename, output_path.stat().st_size, MAX_STORAGE_TIME)
+    # ETag nu berekenen (in de worker), niet pas bij de eerste download
+    etag_cache.get(output_path)
+    
+    # Add download link to stats with the exact filename including timestamp
+    stats["download_link"] = f"/download/{output_filename}"  # Use the same filename with timestamp
+    
+    return stats
 
-# Export both routers
-router = anonymize_router
-download_router = download_router 
\ No newline at end of file
+# Export router
+router = anonymize_router 
\ No newline at end of file
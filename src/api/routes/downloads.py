@@ -0,0 +1,77 @@
+"""Routes for downloading processed files from container storage."""
+import logging
+from pathlib import Path
+from typing import List
+
+from fastapi import APIRouter, HTTPException, Request
+from fastapi.concurrency import run_in_threadpool
+from fastapi.responses import StreamingResponse
+
+from ..downloads import file_response, iter_zip
+from ..models import ZipRequest
+from .anonymization import STORAGE_DIR, MAX_STORAGE_TIME, storage_index
+
+logger = logging.getLogger(__name__)
+
+router = APIRouter(tags=["downloads"])
+
+def _storage_file(filename: str) -> Path:
+    """
+    Resolve a filename in container storage.
+    
+    Only processed PDFs registered in the storage index are served; other
+    files in the directory (caches, job uploads) and paths outside it are refused.
+    """
+    file_path = STORAGE_DIR / filename
+    
+    logger.debug(f"Looking for file in container storage: {file_path}")
+    
+    if (
+        Path(filename).name != filename
+        or not filename.lower().endswith('.pdf')
+        or not storage_index.contains(filename)
+        or not file_path.is_file()
+    ):
+        logger.error(f"File not found in container storage: {file_path}")
+        raise HTTPException(
+            status_code=404, 
+            detail=f"Bestand niet gevonden. Mogelijk is de verwerking nog bezig of is het bestand verlopen (na {MAX_STORAGE_TIME} seconden)."
+        )
+    return file_path
+
+@router.get("/download/{filename}")
+async def download_file(filename: str, request: Request):
+    """
+    Download a processed PDF file from container storage.
+    
+    Supports Range requests (resuming downloads) and If-None-Match with a
+    strong ETag based on the file content.
+    """
+    logger.debug(f"Download requested for file: {filename}")
+    file_path = _storage_file(filename)
+    storage_index.touch(filename)
+    # Bij een cache miss wordt het hele bestand gehasht; niet op de event loop
+    return await run_in_threadpool(file_response, request, file_path, "application/pdf", filename)
+
+@router.post("/download/zip")
+async def download_zip(request: ZipRequest):
+    """
+    Download multiple processed files as one zip archive.
+    
+    The archive is built while it is sent, so it is never held in memory or
+    written to disk as a whole.
+    """
+    filenames: List[str] = list(dict.fromkeys(request.filenames))
+    if not filenames:
+        raise HTTPException(status_code=400, detail="Geen bestanden opgegeven")
+    
+    # Alle bestanden controleren voordat de response begint
+    files = [(_storage_file(filename), filename) for filename in filenames]
+    for filename in filenames:
+        storage_index.touch(filename)
+    
+    return StreamingResponse(
+        iter_zip(files),
+        media_type="application/zip",
+        headers={"Content-Disposition": 'attachment; filename="geanonimiseerd.zip"'}
+    )
@@ -1,9 +1,22 @@
 """Health check routes."""
 from fastapi import APIRouter
 
+from ...core.memory import memory_report
+from .anonymization import storage_reaper
+
 router = APIRouter()
 
 @router.get("/health")
 async def health_check():
     """Health check endpoint."""
-    return {"status": "healthy"} 
\ No newline at end of file
+    return {"status": "healthy"}
+
+@router.get("/health/storage")
+async def storage_usage():
+    """Usage of container storage: number of files, bytes, quota and reaper statistics."""
+    return storage_reaper.usage()
+
+@router.get("/health/memory")
+async def memory_usage():
+    """Resident memory of the process, its peak and the memory added per loaded model, in bytes."""
+    return memory_report()
@@ -0,0 +1,149 @@
+"""Routes for asynchronous PDF processing jobs."""
+import logging
+import os
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional
+
+from fastapi import APIRouter, File, HTTPException, Query, UploadFile
+
+from ...core.document import OUTPUT_AUTO
+from ..jobs import DONE, JobQueue, JobWorkerPool
+from ..lanes import bulk_lane
+from ..metrics import JOB_QUEUE_DEPTH
+from ..models import JobResponse, ProcessResponse
+from ..uploads import spool_upload
+from .anonymization import (
+    OUTPUT_MODE_DESCRIPTION,
+    OUTPUT_MODE_PATTERN,
+    PDF_MAX_DPI,
+    PDF_MIN_DPI,
+    STATE_DIR,
+    MAX_STORAGE_TIME,
+    process_uploaded_pdf,
+    storage_reaper
+)
+
+logger = logging.getLogger(__name__)
+
+router = APIRouter(prefix="/jobs", tags=["jobs"])
+
+# Uploads van jobs wachten tot een worker ze oppakt; het zijn ongeanonimiseerde
+# originelen, dus ze staan buiten STORAGE_DIR (alles daarin is via /download bereikbaar)
+JOBS_DIR = Path(os.environ.get('JOBS_DIR', STATE_DIR / "jobs"))
+JOBS_DIR.mkdir(parents=True, exist_ok=True)
+
+JOB_DB = Path(os.environ.get('JOB_DB', STATE_DIR / "jobs.db"))
+JOB_WORKERS = int(os.environ.get('JOB_WORKERS', 1))
+
+# Seconden zonder heartbeat voordat een lopende job als verlaten geldt; replicas
+# of processen die JOB_DB delen nemen elkaars lopende jobs dus niet over
+JOB_LEASE = float(os.environ.get('JOB_LEASE', 300))
+
+job_queue = JobQueue(JOB_DB)
+JOB_QUEUE_DEPTH.set_function(job_queue.depth)
+
+def process_job(job: Dict[str, Any], progress: Callable[[int, Optional[int]], None]) -> Dict[str, Any]:
+    """Process a queued PDF job as bulk work and remove its upload afterwards."""
+    input_path = Path(job["input_path"])
+    try:
+        return bulk_lane.call(
+            process_uploaded_pdf,
+            input_path,
+            job["filename"],
+            job["options"].get("entities"),
+            job["options"].get("use_ocr", False),
+            progress,
+            dpi=job["options"].get("dpi"),
+            detect_orientation=job["options"].get("detect_orientation"),
+            output_mode=job["options"].get("output_mode", OUTPUT_AUTO)
+        )
+    finally:
+        if input_path.exists():
+            os.unlink(input_path)
+
+worker_pool = JobWorkerPool(job_queue, process_job, workers=JOB_WORKERS, heartbeat_interval=JOB_LEASE / 3)
+
+def maintain_jobs() -> None:
+    """Requeue abandoned jobs and remove expired jobs with their uploads."""
+    requeued = job_queue.requeue_running(JOB_LEASE)
+    if requeued:
+        logger.info(f"Requeued {requeued} interrupted job(s)")
+    for job in job_queue.purge(MAX_STORAGE_TIME):
+        Path(job["input_path"]).unlink(missing_ok=True)
+
+# Draait na elke ronde van de storage reaper (elke REAPER_INTERVAL seconden)
+storage_reaper.add_task(maintain_jobs)
+
+def start_workers() -> None:
+    """Start the job workers; jobs interrupted by a restart are picked up once their lease expired."""
+    maintain_jobs()
+    worker_pool.start()
+
+def stop_workers() -> None:
+    """Stop the job workers after their current job."""
+    worker_pool.stop()
+
+def _job_response(job: Dict[str, Any]) -> JobResponse:
+    result = job["result"] if job["status"] == DONE else None
+    return JobResponse(
+        job_id=job["id"],
+        status=job["status"],
+        filename=job["filename"],
+        pages_done=job["pages_done"],
+        pages_total=job["pages_total"],
+        created_at=job["created_at"],
+        updated_at=job["updated_at"],
+        download_link=result["download_link"] if result else None,
+        result=ProcessResponse(**result) if result else None,
+        error=job["error"]
+    )
+
+@router.post("/pdf", response_model=JobResponse, status_code=202)
+async def submit_pdf_job(
+    file: UploadFile = File(...),
+    entities: Optional[List[str]] = Query(None, description="Optionele lijst van entiteiten om te detecteren"),
+    use_ocr: bool = Query(False, description="Of OCR gebruikt moet worden voor gescande PDFs"),
+    dpi: Optional[int] = Query(
+        None, ge=PDF_MIN_DPI, le=PDF_MAX_DPI, description="OCR resolutie voor deze PDF (standaard OCR_DPI)"
+    ),
+    detect_orientation: Optional[bool] = Query(
+        None, description="Paginarichting detecteren bij OCR (standaard OCR_DETECT_ORIENTATION)"
+    ),
+    output_mode: str = Query(OUTPUT_AUTO, pattern=OUTPUT_MODE_PATTERN, description=OUTPUT_MODE_DESCRIPTION)
+) -> JobResponse:
+    """
+    Plaats een PDF in de wachtrij voor anonimisatie.
+    
+    Geeft direct een job id terug; de status is op te vragen via GET /jobs/{job_id}.
+    """
+    if not file.filename.lower().endswith('.pdf'):
+        raise HTTPException(status_code=400, detail="Alleen PDF bestanden worden ondersteund")
+    
+    # Upload opslaan onder het job id zodat de worker hem terugvindt
+    job_id = job_queue.new_id()
+    upload_path = JOBS_DIR / f"{job_id}.pdf"
+    await spool_upload(file, upload_path)
+    
+    job_queue.submit(
+        file.filename,
+        upload_path,
+        {
+            "entities": entities,
+            "use_ocr": use_ocr,
+            "dpi": dpi,
+            "detect_orientation": detect_orientation,
+            "output_mode": output_mode
+        },
+        job_id=job_id
+    )
+    logger.debug(f"Queued job {job_id} for {file.filename}")
+    
+    return _job_response(job_queue.get(job_id))
+
+@router.get("/{job_id}", response_model=JobResponse)
+async def get_job(job_id: str) -> JobResponse:
+    """Vraag de status, voortgang en download link van een job op."""
+    job = job_queue.get(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail="Job niet gevonden")
+    return _job_response(job)
@@ -0,0 +1,27 @@
+"""Access control for administrative API features."""
+import os
+import secrets
+
+from fastapi import HTTPException, Request
+
+# Token voor beheerfuncties (zoals cProfile); zonder token zijn deze uitgeschakeld
+ADMIN_TOKEN = os.environ.get('ADMIN_TOKEN', '')
+ADMIN_TOKEN_HEADER = "X-Admin-Token"
+
+
+def require_admin(request: Request) -> None:
+    """
+    Check that the request carries the admin token.
+
+    Args:
+        request: The incoming request
+
+    Raises:
+        HTTPException: 403 if no admin token is configured or the header does not match
+    """
+    if not ADMIN_TOKEN:
+        raise HTTPException(status_code=403, detail="Beheerfuncties zijn niet geconfigureerd (ADMIN_TOKEN)")
+
+    token = request.headers.get(ADMIN_TOKEN_HEADER, "")
+    if not secrets.compare_digest(token.encode('utf-8'), ADMIN_TOKEN.encode('utf-8')):
+        raise HTTPException(status_code=403, detail="Ongeldig beheertoken")
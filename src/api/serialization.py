@@ -0,0 +1,122 @@
+"""Compact response encoding: lean entity spans, fast JSON and compression."""
+import gzip
+import json
+import os
+from typing import Any, Dict, List, Optional, Sequence
+
+from fastapi import Request, Response
+
+try:
+    import orjson
+except ImportError:  # Valt terug op de standaard json module
+    orjson = None
+
+try:
+    import brotli
+except ImportError:  # Brotli is optioneel; gzip is altijd beschikbaar
+    brotli = None
+
+# Kleinere responses worden niet gecomprimeerd; de overhead is dan groter dan de winst
+COMPRESS_MIN_BYTES = int(os.environ.get('COMPRESS_MIN_BYTES', 1024))
+GZIP_LEVEL = int(os.environ.get('GZIP_LEVEL', 6))
+BROTLI_QUALITY = int(os.environ.get('BROTLI_QUALITY', 5))
+
+# Waarden van de format query parameter
+FULL = "full"
+LEAN = "lean"
+COLUMNAR = "columnar"
+RESPONSE_FORMATS = (FULL, LEAN, COLUMNAR)
+FORMAT_PATTERN = f"^({'|'.join(RESPONSE_FORMATS)})$"
+
+
+def dumps(data: Any) -> bytes:
+    """Serialise data to compact JSON bytes, with orjson when it is installed."""
+    if orjson is not None:
+        return orjson.dumps(data)
+    return json.dumps(data, ensure_ascii=False, separators=(",", ":")).encode('utf-8')
+
+
+def lean_entities(results: Sequence, columnar: bool = False) -> Any:
+    """
+    Encode analyzer results as bare spans, without the entity text.
+
+    Args:
+        results: Analyzer results (RecognizerResult)
+        columnar: Return one array per field instead of one object per entity
+
+    Returns:
+        [{"type", "start", "end", "score"}, ...] or
+        {"type": [...], "start": [...], "end": [...], "score": [...]}
+    """
+    if columnar:
+        return {
+            "type": [r.entity_type for r in results],
+            "start": [r.start for r in results],
+            "end": [r.end for r in results],
+            "score": [round(r.score, 4) for r in results],
+        }
+    return [
+        {"type": r.entity_type, "start": r.start, "end": r.end, "score": round(r.score, 4)}
+        for r in results
+    ]
+
+
+def negotiate_encoding(accept_encoding: str) -> Optional[str]:
+    """
+    Pick the best content encoding the client accepts.
+
+    Args:
+        accept_encoding: Value of the Accept-Encoding header
+
+    Returns:
+        "br", "gzip" or None for an uncompressed response
+    """
+    accepted = {}
+    for part in accept_encoding.split(","):
+        name, _, params = part.strip().partition(";")
+        quality = 1.0
+        if params.strip().startswith("q="):
+            try:
+                quality = float(params.strip()[2:])
+            except ValueError:
+                quality = 0.0
+        accepted[name.strip().lower()] = quality
+
+    for encoding in ("br", "gzip"):
+        if encoding == "br" and brotli is None:
+            continue
+        if accepted.get(encoding, accepted.get("*", 0.0)) > 0:
+            return encoding
+    return None
+
+
+def compress(body: bytes, encoding: Optional[str]) -> bytes:
+    """Compress a response body with the negotiated encoding."""
+    if encoding == "br":
+        return brotli.compress(body, quality=BROTLI_QUALITY)
+    if encoding == "gzip":
+        return gzip.compress(body, compresslevel=GZIP_LEVEL)
+    return body
+
+
+def lean_response(request: Request, data: Dict[str, Any]) -> Response:
+    """
+    Build a compact JSON response, compressed as negotiated via Accept-Encoding.
+
+    Args:
+        request: The incoming request
+        data: Response data
+
+    Returns:
+        JSON response with Content-Encoding set when compressed
+    """
+    body = dumps(data)
+    headers = {"Vary": "Accept-Encoding"}
+
+    encoding = negotiate_encoding(request.headers.get("accept-encoding", ""))
+    if encoding is not None and len(body) >= COMPRESS_MIN_BYTES:
+        body = compress(body, encoding)
+        headers["Content-Encoding"] = encoding
+
+    return Response(content=body, media_type="application/json", headers=headers)
+
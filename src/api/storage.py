@@ -0,0 +1,248 @@
+"""Expiry index and background reaper for files in container storage."""
+import logging
+import sqlite3
+import threading
+import time
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Tuple, Union
+
+logger = logging.getLogger(__name__)
+
+
+class StorageIndex:
+    """
+    SQLite index of stored files with their size, expiry and last access.
+
+    The reaper finds expired and least recently used files with an indexed
+    query instead of listing and stat-ing the whole storage directory.
+    """
+
+    def __init__(self, db_path: Union[str, Path]):
+        """
+        Initialize the index and create the table if needed.
+
+        Args:
+            db_path: Path of the SQLite database file
+        """
+        self.db_path = str(db_path)
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(self.db_path, check_same_thread=False, isolation_level=None)
+        self._conn.row_factory = sqlite3.Row
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("""
+            CREATE TABLE IF NOT EXISTS files (
+                name TEXT PRIMARY KEY,
+                size INTEGER NOT NULL,
+                created_at REAL NOT NULL,
+                last_access REAL NOT NULL,
+                expires_at REAL NOT NULL
+            )
+        """)
+        self._conn.execute("CREATE INDEX IF NOT EXISTS files_expires ON files (expires_at)")
+        self._conn.execute("CREATE INDEX IF NOT EXISTS files_access ON files (last_access)")
+
+    def register(self, name: str, size: int, ttl: float, now: Optional[float] = None) -> None:
+        """
+        Add (or replace) a file in the index.
+
+        Args:
+            name: Filename relative to the storage directory
+            size: File size in bytes
+            ttl: Seconds until the file expires
+            now: Creation time (default: current time)
+        """
+        now = time.time() if now is None else now
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO files (name, size, created_at, last_access, expires_at) "
+                "VALUES (?, ?, ?, ?, ?)",
+                (name, size, now, now, now + ttl)
+            )
+
+    def touch(self, name: str) -> None:
+        """Mark a file as recently used (for LRU eviction)."""
+        with self._lock:
+            self._conn.execute(
+                "UPDATE files SET last_access = ? WHERE name = ?", (time.time(), name)
+            )
+
+    def expired(self, limit: int, now: Optional[float] = None) -> List[str]:
+        """Return up to limit names of expired files, oldest expiry first."""
+        now = time.time() if now is None else now
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT name FROM files WHERE expires_at <= ? ORDER BY expires_at LIMIT ?", (now, limit)
+            ).fetchall()
+        return [row["name"] for row in rows]
+
+    def least_recently_used(self, limit: int) -> List[Tuple[str, int]]:
+        """Return up to limit (name, size) pairs of the least recently used files."""
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT name, size FROM files ORDER BY last_access LIMIT ?", (limit,)
+            ).fetchall()
+        return [(row["name"], row["size"]) for row in rows]
+
+    def remove(self, names: List[str]) -> None:
+        """Remove files from the index."""
+        with self._lock:
+            self._conn.executemany("DELETE FROM files WHERE name = ?", [(name,) for name in names])
+
+    def contains(self, name: str) -> bool:
+        """Check whether a file is in the index."""
+        with self._lock:
+            return self._conn.execute("SELECT 1 FROM files WHERE name = ?", (name,)).fetchone() is not None
+
+    def usage(self) -> Dict[str, int]:
+        """Return the number of indexed files and their total size in bytes."""
+        with self._lock:
+            row = self._conn.execute("SELECT COUNT(*), COALESCE(SUM(size), 0) FROM files").fetchone()
+        return {"files": row[0], "bytes": row[1]}
+
+    def close(self) -> None:
+        """Close the database connection."""
+        with self._lock:
+            self._conn.close()
+
+
+class StorageReaper:
+    """
+    Background thread that deletes expired files and enforces a size quota.
+
+    Every pass removes at most batch_size files, so a pass takes bounded time
+    even when a large backlog has expired; the next pass follows right away
+    until the backlog is gone. Other periodic cleanup (such as old jobs) can
+    be added with add_task and runs after every pass.
+    """
+
+    def __init__(
+        self,
+        index: StorageIndex,
+        directory: Union[str, Path],
+        ttl: float,
+        max_bytes: int = 0,
+        interval: float = 60.0,
+        batch_size: int = 100
+    ):
+        """
+        Initialize the reaper.
+
+        Args:
+            index: Index of the stored files
+            directory: Storage directory
+            ttl: Lifetime of files found on disk that are not in the index yet
+            max_bytes: Maximum total size of the stored files (0 for no quota)
+            interval: Seconds between passes
+            batch_size: Maximum number of files removed per pass
+        """
+        self.index = index
+        self.directory = Path(directory)
+        self.ttl = ttl
+        self.max_bytes = max_bytes
+        self.interval = interval
+        self.batch_size = batch_size
+        self.stats = {"expired": 0, "evicted": 0, "last_pass_seconds": 0.0}
+        self._tasks: List[Callable[[], Any]] = []
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def add_task(self, task: Callable[[], Any]) -> None:
+        """Run a function after every pass; errors are logged and do not stop the reaper."""
+        self._tasks.append(task)
+
+    def sync(self, pattern: str = "*.pdf") -> int:
+        """
+        Index files that are on disk but not in the index yet.
+
+        Only needed once at startup, for files written before the index
+        existed or while the index was unavailable.
+
+        Returns:
+            Number of newly indexed files
+        """
+        added = 0
+        for path in self.directory.glob(pattern):
+            if not self.index.contains(path.name):
+                stat = path.stat()
+                self.index.register(path.name, stat.st_size, self.ttl, now=stat.st_mtime)
+                added += 1
+        if added:
+            logger.info(f"Indexed {added} existing file(s) in {self.directory}")
+        return added
+
+    def _delete(self, names: List[str]) -> None:
+        for name in names:
+            try:
+                (self.directory / name).unlink()
+            except FileNotFoundError:
+                pass
+            except OSError as e:
+                logger.warning(f"Could not remove {name}: {str(e)}")
+        self.index.remove(names)
+
+    def reap(self) -> int:
+        """
+        Run one pass: remove expired files, then evict LRU files over the quota.
+
+        Returns:
+            Number of removed files
+        """
+        start = time.time()
+
+        expired = self.index.expired(self.batch_size)
+        self._delete(expired)
+        self.stats["expired"] += len(expired)
+        for name in expired:
+            logger.info(f"Removing expired file from container: {name}")
+
+        evicted = 0
+        if self.max_bytes:
+            excess = self.index.usage()["bytes"] - self.max_bytes
+            names = []
+            for name, size in self.index.least_recently_used(self.batch_size):
+                if excess <= 0:
+                    break
+                names.append(name)
+                excess -= size
+            self._delete(names)
+            evicted = len(names)
+            if evicted:
+                logger.info(f"Evicted {evicted} file(s) to stay within the storage quota")
+            self.stats["evicted"] += evicted
+
+        for task in self._tasks:
+            try:
+                task()
+            except Exception as e:
+                logger.error(f"Error during cleanup task: {str(e)}", exc_info=True)
+
+        self.stats["last_pass_seconds"] = time.time() - start
+        return len(expired) + evicted
+
+    def usage(self) -> Dict[str, Any]:
+        """Storage usage and reaper statistics."""
+        return dict(self.index.usage(), max_bytes=self.max_bytes, **self.stats)
+
+    def start(self) -> None:
+        """Index existing files and start the background thread."""
+        self.sync()
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name="storage-reaper", daemon=True)
+        self._thread.start()
+
+    def stop(self, timeout: Optional[float] = None) -> None:
+        """Stop the background thread."""
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout)
+            self._thread = None
+
+    def _run(self) -> None:
+        while not self._stop.is_set():
+            try:
+                removed = self.reap()
+            except Exception as e:
+                logger.error(f"Error during cleanup: {str(e)}", exc_info=True)
+                removed = 0
+            # Volle batch: er is waarschijnlijk meer te doen, dus direct verder
+            self._stop.wait(0 if removed >= self.batch_size else self.interval)
@@ -0,0 +1,107 @@
+"""Size-limited, chunked handling of file uploads."""
+import logging
+import os
+from pathlib import Path
+from typing import Tuple
+
+from fastapi import HTTPException, UploadFile
+from fastapi.responses import JSONResponse
+from starlette.datastructures import Headers
+
+logger = logging.getLogger(__name__)
+
+# Maximale grootte van een upload in bytes (standaard 250 MB)
+MAX_UPLOAD_SIZE = int(os.environ.get('MAX_UPLOAD_SIZE', 250 * 1024 * 1024))
+
+# Grootte van de blokken waarin uploads naar schijf geschreven worden
+UPLOAD_CHUNK_SIZE = int(os.environ.get('UPLOAD_CHUNK_SIZE', 1024 * 1024))
+
+
+def _too_large(max_size: int) -> HTTPException:
+    return HTTPException(
+        status_code=413,
+        detail=f"Bestand te groot (maximaal {max_size // (1024 * 1024)} MB)"
+    )
+
+
+class UploadSizeLimitMiddleware:
+    """
+    Reject uploads over the size limit before the body has been received.
+
+    Requests with a larger Content-Length are refused right away; for
+    chunked requests the received bytes are counted and the request is
+    aborted with 413 as soon as the limit is passed, so an oversized upload
+    is never spooled completely.
+    """
+
+    def __init__(self, app, max_size: int = MAX_UPLOAD_SIZE, path_suffixes: Tuple[str, ...] = ("/pdf",)):
+        """
+        Initialize the middleware.
+
+        Args:
+            app: ASGI application
+            max_size: Maximum request body size in bytes
+            path_suffixes: Only requests to paths ending in one of these are limited
+        """
+        self.app = app
+        self.max_size = max_size
+        self.path_suffixes = path_suffixes
+
+    async def __call__(self, scope, receive, send) -> None:
+        if scope["type"] != "http" or not scope["path"].endswith(self.path_suffixes):
+            await self.app(scope, receive, send)
+            return
+
+        content_length = Headers(scope=scope).get("content-length")
+        if content_length and content_length.isdigit() and int(content_length) > self.max_size:
+            logger.warning(f"Rejected upload of {content_length} bytes to {scope['path']}")
+            error = _too_large(self.max_size)
+            response = JSONResponse({"detail": error.detail}, status_code=error.status_code)
+            await response(scope, receive, send)
+            return
+
+        received = 0
+
+        async def limited_receive():
+            nonlocal received
+            message = await receive()
+            if message["type"] == "http.request":
+                received += len(message.get("body", b""))
+                if received > self.max_size:
+                    # Wordt door FastAPI als 413 response afgehandeld
+                    raise _too_large(self.max_size)
+            return message
+
+        await self.app(scope, limited_receive, send)
+
+
+async def spool_upload(file: UploadFile, destination: Path, max_size: int = MAX_UPLOAD_SIZE) -> int:
+    """
+    Write an upload to disk in fixed-size chunks.
+
+    Args:
+        file: Uploaded file
+        destination: Path to write to; removed again if the upload is rejected
+        max_size: Maximum size in bytes
+
+    Returns:
+        Number of bytes written
+
+    Raises:
+        HTTPException: 413 if the upload is larger than max_size
+    """
+    size = 0
+    try:
+        with open(destination, 'wb') as f:
+            while True:
+                chunk = await file.read(UPLOAD_CHUNK_SIZE)
+                if not chunk:
+                    break
+                size += len(chunk)
+                if size > max_size:
+                    raise _too_large(max_size)
+                f.write(chunk)
+    except BaseException:
+        destination.unlink(missing_ok=True)
+        raise
+    return size
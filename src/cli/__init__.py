@@ -1,5 +1,13 @@
 """CLI package for text analysis and anonymization."""
 from .cli import main
-from .commands import CommandHandler
+
+
+def __getattr__(name):
+    # CommandHandler importeert de modellen; de CLI client heeft die niet nodig
+    if name == "CommandHandler":
+        from .commands import CommandHandler
+        return CommandHandler
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
 
 __all__ = ["main", "CommandHandler"] 
\ No newline at end of file
@@ -0,0 +1,314 @@
+"""Benchmarks of fixed workloads: throughput, latency percentiles, stage timings and peak memory."""
+import json
+import os
+import platform
+import tempfile
+import time
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from ..core.instrumentation import profile_stages
+from ..core.memory import RSSSampler
+from ..corpus.generator import EMAIL, LETTER, CorpusGenerator
+from ..corpus.writer import PDF, SCANNED, write_document
+
+# Versie van het formaat van de resultaten
+BENCH_VERSION = 2
+
+# Vaste seed: elke run verwerkt exact dezelfde documenten
+BENCH_SEED = 20240
+
+# Toegestane verslechtering ten opzichte van de baseline (fractie)
+BENCH_TOLERANCE = float(os.environ.get('BENCH_TOLERANCE', 0.10))
+
+# Minimaal aantal metingen voor een percentiel; met minder is p95/p99 gewoon
+# de traagste meting en wordt het weggelaten (None)
+PERCENTILE_MIN_SAMPLES = {"p50": 1, "p95": 20, "p99": 100}
+
+MB = 1024 * 1024
+
+
+@dataclass
+class Workload:
+    """A fixed benchmark workload."""
+    name: str
+    description: str
+    count: int
+    # Maakt `count` documenten (teksten of PDF paden) met een seed in een werkdirectory
+    prepare: Callable[[Path, int, int], List[Any]]
+    # Verwerkt één document en geeft het aantal tekens terug
+    run: Callable[[Any, Any, Path], int]
+    # Reden om de workload over te slaan, of None
+    unavailable: Callable[[Any], Optional[str]] = lambda handler: None
+
+
+def _run_text(handler, text: str, work_dir: Path) -> int:
+    results = handler.analyzer.analyze_text(text)
+    handler.anonymizer.anonymize_text(text, results)
+    return len(text)
+
+
+def _prepare_texts(kind: str, size: int):
+    def prepare(work_dir: Path, count: int, seed: int) -> List[str]:
+        return [document.text for document in CorpusGenerator(seed).generate(count, [kind], size)]
+    return prepare
+
+
+def _prepare_pdfs(file_format: str, size: int):
+    def prepare(work_dir: Path, count: int, seed: int) -> List[Tuple[Path, int]]:
+        return [
+            (write_document(document, work_dir, file_format, seed), len(document.text))
+            for document in CorpusGenerator(seed).generate(count, [LETTER], size)
+        ]
+    return prepare
+
+
+def _run_pdf(use_ocr: bool):
+    def run(handler, document: Tuple[Path, int], work_dir: Path) -> int:
+        path, chars = document
+        handler.document_processor.process_pdf(
+            input_path=path,
+            output_path=work_dir / f"{path.stem}_anon.pdf",
+            ocr_processor=handler.get_ocr_processor(use_ocr)
+        )
+        return chars
+    return run
+
+
+WORKLOADS: Dict[str, Workload] = {
+    workload.name: workload
+    for workload in [
+        Workload(
+            "short", "Korte emails (~200 tekens)", 200,
+            _prepare_texts(EMAIL, 200),
+            _run_text
+        ),
+        Workload(
+            "long", "Lange brieven (~30.000 tekens)", 20,
+            _prepare_texts(LETTER, 30_000),
+            _run_text
+        ),
+        Workload(
+            "pdf", "Brieven als PDF met tekstlaag (5 pagina's)", 20,
+            _prepare_pdfs(PDF, 10_000),
+            _run_pdf(use_ocr=False)
+        ),
+        Workload(
+            "scanned", "Brieven als gescande PDF (2 pagina's, OCR)", 20,
+            _prepare_pdfs(SCANNED, 3_000),
+            _run_pdf(use_ocr=True),
+            lambda handler: None if handler.get_ocr_processor(True) is not None else "OCR niet beschikbaar"
+        ),
+    ]
+}
+
+
+def percentile(values: List[float], q: float) -> float:
+    """Return the q-th percentile (0-100) of values, interpolating between ranks."""
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    rank = (len(ordered) - 1) * q / 100
+    low = int(rank)
+    high = min(low + 1, len(ordered) - 1)
+    return ordered[low] + (ordered[high] - ordered[low]) * (rank - low)
+
+
+def _latencies(values: List[float]) -> Dict[str, Optional[float]]:
+    """Return p50/p95/p99; a percentile is None with fewer than PERCENTILE_MIN_SAMPLES values."""
+    return {
+        name: round(percentile(values, float(name[1:])), 6) if len(values) >= minimum else None
+        for name, minimum in PERCENTILE_MIN_SAMPLES.items()
+    }
+
+
+def _flatten(
+    node: Dict[str, Any],
+    prefix: str = "",
+    into: Optional[Dict[str, Tuple[float, int]]] = None
+) -> Dict[str, Tuple[float, int]]:
+    """Flatten a timing tree to {"parent/stage": (seconds, peak RSS growth in bytes)}."""
+    into = {} if into is None else into
+    for child in node["stages"]:
+        path = f"{prefix}{child['stage']}"
+        seconds, peak = into.get(path, (0.0, 0))
+        into[path] = (seconds + child["seconds"], max(peak, child.get("peak_rss_bytes", 0)))
+        _flatten(child, f"{path}/", into)
+    return into
+
+
+def run_workload(handler, workload: Workload, count: int, work_dir: Path) -> Dict[str, Any]:
+    """
+    Run one workload and measure it.
+
+    The first document is processed once before measuring, so lazy model
+    loading and first-call overhead do not count.
+
+    Args:
+        handler: CommandHandler with the models
+        workload: Workload to run
+        count: Number of documents
+        work_dir: Directory for generated input and output files
+
+    Returns:
+        Throughput, latency percentiles, peak RSS, and per stage the timings
+        and the highest growth of the RSS during the stage
+    """
+    reason = workload.unavailable(handler)
+    if reason is not None:
+        return {"skipped": reason}
+
+    documents = workload.prepare(work_dir, count, BENCH_SEED)
+    workload.run(handler, documents[0], work_dir)
+
+    latencies, chars = [], 0
+    stage_seconds: Dict[str, List[float]] = {}
+    stage_peaks: Dict[str, int] = {}
+    with RSSSampler() as rss:
+        start = time.perf_counter()
+        for document in documents:
+            with profile_stages(rss) as profile:
+                document_start = time.perf_counter()
+                chars += workload.run(handler, document, work_dir)
+                latencies.append(time.perf_counter() - document_start)
+            for path, (seconds, peak) in _flatten(profile.tree()).items():
+                stage_seconds.setdefault(path, []).append(seconds)
+                stage_peaks[path] = max(stage_peaks.get(path, 0), peak)
+        seconds = time.perf_counter() - start
+
+    return {
+        "documents": len(documents),
+        "chars": chars,
+        "seconds": round(seconds, 6),
+        "docs_per_s": round(len(documents) / seconds, 3),
+        "chars_per_s": round(chars / seconds, 1),
+        "latency": _latencies(latencies),
+        "peak_rss_mb": round(rss.peak / MB, 1),
+        "stages": {
+            path: dict(
+                seconds=round(sum(values), 6),
+                peak_rss_mb=round(stage_peaks[path] / MB, 1),
+                **_latencies(values)
+            )
+            for path, values in stage_seconds.items()
+        },
+    }
+
+
+def run_benchmarks(
+    handler,
+    names: Optional[List[str]] = None,
+    scale: float = 1.0,
+    work_dir: Optional[Path] = None
+) -> Dict[str, Any]:
+    """
+    Run the benchmark workloads.
+
+    Args:
+        handler: CommandHandler with the models
+        names: Workloads to run (default: all)
+        scale: Multiplier for the number of documents per workload
+        work_dir: Directory for generated files (default: a temporary directory)
+
+    Returns:
+        Results per workload plus the environment they were measured in
+    """
+    results = {
+        "version": BENCH_VERSION,
+        "created": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "environment": {
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "cpus": os.cpu_count(),
+        },
+        "scale": scale,
+        "workloads": {},
+    }
+
+    with tempfile.TemporaryDirectory(prefix="presidio-bench-") as temp_dir:
+        directory = Path(work_dir or temp_dir)
+        directory.mkdir(parents=True, exist_ok=True)
+        for name in names or list(WORKLOADS):
+            workload = WORKLOADS[name]
+            count = max(1, round(workload.count * scale))
+            results["workloads"][name] = run_workload(handler, workload, count, directory)
+    return results
+
+
+def compare(results: Dict[str, Any], baseline: Dict[str, Any], tolerance: float = BENCH_TOLERANCE) -> List[str]:
+    """
+    Compare results with a baseline.
+
+    Lower throughput, a higher p95 latency or a higher peak RSS than the
+    baseline by more than the tolerance counts as a regression. The p95 is
+    only compared when both runs had enough documents for it.
+
+    Args:
+        results: Results of run_benchmarks
+        baseline: Earlier results to compare with
+        tolerance: Allowed relative deterioration (0.10 = 10%)
+
+    Returns:
+        One message per regression
+    """
+    regressions = []
+    for name, current in results["workloads"].items():
+        before = baseline.get("workloads", {}).get(name)
+        if before is None or "skipped" in current or "skipped" in before:
+            continue
+        checks = [
+            ("doorvoer (docs/s)", current["docs_per_s"], before["docs_per_s"], False),
+            ("p95 latency (s)", current["latency"]["p95"], before["latency"]["p95"], True),
+            ("piek RSS (MB)", current["peak_rss_mb"], before["peak_rss_mb"], True),
+        ]
+        for label, value, reference, higher_is_worse in checks:
+            if not reference or value is None:
+                continue
+            change = (value - reference) / reference
+            if (change if higher_is_worse else -change) > tolerance:
+                regressions.append(f"{name}: {label} {reference:g} -> {value:g} ({change:+.1%})")
+    return regressions
+
+
+def _seconds(value: Optional[float]) -> str:
+    return f"{value:.4f}" if value is not None else "-"
+
+
+def format_report(results: Dict[str, Any]) -> str:
+    """Format results as a readable table; "-" marks a percentile with too few documents."""
+    lines = [
+        f"{'workload':<10} {'docs':>6} {'docs/s':>9} {'tekens/s':>11} "
+        f"{'p50 (s)':>9} {'p95 (s)':>9} {'p99 (s)':>9} {'piek RSS':>10}",
+        "-" * 80,
+    ]
+    for name, result in results["workloads"].items():
+        if "skipped" in result:
+            lines.append(f"{name:<10} overgeslagen: {result['skipped']}")
+            continue
+        latency = result["latency"]
+        lines.append(
+            f"{name:<10} {result['documents']:>6} {result['docs_per_s']:>9.2f} {result['chars_per_s']:>11.0f} "
+            f"{_seconds(latency['p50']):>9} {_seconds(latency['p95']):>9} {_seconds(latency['p99']):>9} "
+            f"{result['peak_rss_mb']:>7.0f} MB"
+        )
+        for path, stage in sorted(result["stages"].items(), key=lambda item: -item[1]["seconds"]):
+            share = stage["seconds"] / result["seconds"] if result["seconds"] else 0.0
+            lines.append(
+                f"  {path:<30} {stage['seconds']:>9.3f}s {share:>6.1%}  "
+                f"p50 {_seconds(stage['p50'])}s  p95 {_seconds(stage['p95'])}s  "
+                f"piek +{stage['peak_rss_mb']:.0f} MB"
+            )
+    return "\n".join(lines)
+
+
+def load_results(path: Path) -> Dict[str, Any]:
+    """Read results written by an earlier run."""
+    with open(path, encoding='utf-8') as f:
+        return json.load(f)
+
+
+def save_results(results: Dict[str, Any], path: Path) -> None:
+    """Write results as JSON."""
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump(results, f, indent=2)
@@ -1,9 +1,12 @@
 """Command line interface for text analysis and anonymization."""
 import argparse
+import json
+import signal
+import sys
 from pathlib import Path
 from typing import List, Optional
 
-from .commands import CommandHandler
+from .daemon import DEFAULT_SOCKET, CommandDaemon, check_socket, forward
 
 def create_parser() -> argparse.ArgumentParser:
     """Create the argument parser."""
@@ -25,6 +28,12 @@ def create_parser() -> argparse.ArgumentParser:
         help="Specifieke entiteiten om te detecteren (bijv. PERSON LOCATION)"
     )
     
+    parser.add_argument(
+        "--no-daemon",
+        action="store_true",
+        help="Verwerk altijd in dit proces, ook als er een daemon draait"
+    )
+    
     # Subcommands
     subparsers = parser.add_subparsers(dest="command", required=True)
     
@@ -35,13 +44,29 @@ def create_parser() -> argparse.ArgumentParser:
     )
     analyze_parser.add_argument(
         "input",
-        help="Tekst om te analyseren, of pad naar bestand/directory"
+        help="Tekst om te analyseren, pad naar bestand/directory, of '-' voor NDJSON via stdin"
     )
     analyze_parser.add_argument(
         "--ocr",
         action="store_true",
         help="Gebruik OCR voor gescande PDFs"
     )
+    analyze_parser.add_argument(
+        "-j", "--jobs",
+        type=int,
+        default=1,
+        help="Aantal bestanden dat parallel verwerkt wordt bij een directory (0 = aantal CPUs)"
+    )
+    analyze_parser.add_argument(
+        "--lines",
+        action="store_true",
+        help="Lees bij '-' elke regel als tekst in plaats van als JSON object"
+    )
+    analyze_parser.add_argument(
+        "-r", "--recursive",
+        action="store_true",
+        help="Verwerk ook bestanden in subdirectories"
+    )
     
     # Anonymize command
     anonymize_parser = subparsers.add_parser(
@@ -50,53 +75,337 @@ def create_parser() -> argparse.ArgumentParser:
     )
     anonymize_parser.add_argument(
         "input",
-        help="Tekst om te anonimiseren, of pad naar bestand/directory"
+        help="Tekst om te anonimiseren, pad naar bestand/directory, of '-' voor NDJSON via stdin"
     )
     anonymize_parser.add_argument(
         "--ocr",
         action="store_true",
         help="Gebruik OCR voor gescande PDFs"
     )
+    anonymize_parser.add_argument(
+        "-j", "--jobs",
+        type=int,
+        default=1,
+        help="Aantal bestanden dat parallel verwerkt wordt bij een directory (0 = aantal CPUs)"
+    )
+    anonymize_parser.add_argument(
+        "--lines",
+        action="store_true",
+        help="Lees bij '-' elke regel als tekst in plaats van als JSON object"
+    )
+    anonymize_parser.add_argument(
+        "-r", "--recursive",
+        action="store_true",
+        help="Verwerk ook bestanden in subdirectories"
+    )
+    anonymize_parser.add_argument(
+        "--force",
+        action="store_true",
+        help="Verwerk alle bestanden opnieuw, ook als ze volgens het manifest al verwerkt zijn"
+    )
+    
+    # Bench command
+    bench_parser = subparsers.add_parser(
+        "bench",
+        help="Meet doorvoer, latency en geheugengebruik op vaste workloads"
+    )
+    bench_parser.add_argument(
+        "--workloads",
+        nargs="+",
+        choices=["short", "long", "pdf", "scanned"],
+        help="Workloads om te draaien (standaard: alle)"
+    )
+    bench_parser.add_argument(
+        "--scale",
+        type=float,
+        default=1.0,
+        help="Factor voor het aantal documenten per workload (standaard: 1.0)"
+    )
+    bench_parser.add_argument(
+        "--output",
+        type=Path,
+        help="Schrijf de resultaten als JSON naar dit bestand"
+    )
+    bench_parser.add_argument(
+        "--baseline",
+        type=Path,
+        help="Vergelijk met eerdere resultaten; exit code 1 bij een regressie"
+    )
+    bench_parser.add_argument(
+        "--tolerance",
+        type=float,
+        default=None,
+        help="Toegestane verslechtering ten opzichte van de baseline (standaard: 0.10 = 10%%)"
+    )
+    
+    # Loadtest command
+    loadtest_parser = subparsers.add_parser(
+        "loadtest",
+        help="Belast de HTTP API en meet doorvoer, latency, 429's en geheugen"
+    )
+    loadtest_parser.add_argument(
+        "--url",
+        help="Basis-URL van een draaiende API, bijv. http://localhost:8080/api/v1 "
+             "(standaard: start de API in dit proces)"
+    )
+    loadtest_parser.add_argument(
+        "-c", "--concurrency",
+        type=int,
+        default=8,
+        help="Aantal gelijktijdige clients (standaard: 8)"
+    )
+    loadtest_parser.add_argument(
+        "-d", "--duration",
+        type=float,
+        default=30.0,
+        help="Duur in seconden (standaard: 30)"
+    )
+    loadtest_parser.add_argument(
+        "--mix",
+        default="analyze=6,anonymize_text=3,anonymize_pdf=1",
+        help="Verhouding van de endpoints (standaard: analyze=6,anonymize_text=3,anonymize_pdf=1)"
+    )
+    loadtest_parser.add_argument(
+        "--sample-interval",
+        type=float,
+        default=1.0,
+        help="Seconden tussen RSS-metingen en tijdlijnregels (standaard: 1)"
+    )
+    loadtest_parser.add_argument(
+        "--target-rps",
+        type=float,
+        help="Gewenste requests per seconde; geeft een advies voor replicas en geheugenlimiet"
+    )
+    loadtest_parser.add_argument(
+        "--seed",
+        type=int,
+        default=0,
+        help="Seed voor de payloads en de volgorde van requests (standaard: 0)"
+    )
+    loadtest_parser.add_argument(
+        "--output",
+        type=Path,
+        help="Schrijf de resultaten als JSON naar dit bestand"
+    )
+    
+    # Corpus command
+    corpus_parser = subparsers.add_parser(
+        "corpus",
+        help="Genereer synthetische documenten met bekende persoonsgegevens"
+    )
+    corpus_parser.add_argument(
+        "output",
+        type=Path,
+        help="Directory voor de documenten en ground_truth.jsonl"
+    )
+    corpus_parser.add_argument(
+        "-n", "--count",
+        type=int,
+        default=100,
+        help="Aantal documenten (standaard: 100)"
+    )
+    corpus_parser.add_argument(
+        "--kinds",
+        nargs="+",
+        choices=["letter", "email"],
+        default=["letter", "email"],
+        help="Soorten documenten, om beurten gebruikt (standaard: letter email)"
+    )
+    corpus_parser.add_argument(
+        "--file-format",
+        choices=["txt", "pdf", "scanned"],
+        default="txt",
+        help="Tekstbestand, PDF met tekstlaag of gescande PDF (standaard: txt)"
+    )
+    corpus_parser.add_argument(
+        "--size",
+        type=int,
+        help="Lengte per document in tekens (standaard: 2000 voor brieven, 600 voor emails)"
+    )
+    corpus_parser.add_argument(
+        "--seed",
+        type=int,
+        default=0,
+        help="Seed; dezelfde seed geeft dezelfde documenten (standaard: 0)"
+    )
+    
+    # Serve command
+    serve_parser = subparsers.add_parser(
+        "serve",
+        help="Start een daemon die de modellen geladen houdt voor volgende aanroepen"
+    )
+    serve_parser.add_argument(
+        "--socket",
+        default=DEFAULT_SOCKET,
+        help=f"Pad van de Unix socket (standaard: {DEFAULT_SOCKET}, of PRESIDIO_SOCKET)"
+    )
     
     return parser
 
-def main() -> None:
-    """Main entry point for the CLI."""
-    parser = create_parser()
-    args = parser.parse_args()
+def run_command(handler, args: argparse.Namespace) -> None:
+    """
+    Run a parsed analyze or anonymize command.
     
-    handler = CommandHandler()
+    Args:
+        handler: CommandHandler with the loaded models
+        args: Parsed command line arguments
+    """
+    from ..core.ocr import cpu_budget
     
     # Convert entities to list if provided
     entities: Optional[List[str]] = None
     if args.entities:
         entities = [e.upper() for e in args.entities]
     
-    try:
-        # Check if input is a path
-        input_path = Path(args.input)
-        if input_path.exists():
-            handler.process_file(
-                input_file=input_path,
-                command=args.command,
+    if args.input == "-":
+        # NDJSON van stdin naar stdout, voor gebruik in een pipeline
+        summary = handler.process_stream(
+            command=args.command,
+            entities=entities,
+            plain=args.lines
+        )
+        if summary["failed"]:
+            sys.exit(1)
+        return
+    
+    # Check if input is a path
+    input_path = Path(args.input)
+    if input_path.exists():
+        handler.process_file(
+            input_file=input_path,
+            command=args.command,
+            entities=entities,
+            output_format=args.format,
+            use_ocr=args.ocr,
+            jobs=args.jobs or cpu_budget(),
+            recursive=args.recursive,
+            force=getattr(args, "force", False)
+        )
+    else:
+        # Process text directly
+        if args.command == "analyze":
+            handler.analyze(
+                text=args.input,
                 entities=entities,
-                output_format=args.format,
-                use_ocr=args.ocr
+                output_format=args.format
+            )
+        else:  # anonymize
+            handler.anonymize(
+                text=args.input,
+                entities=entities,
+                output_format=args.format
+            )
+
+def serve(socket_path: str) -> None:
+    """Load the models and run the daemon until interrupted."""
+    from .commands import CommandHandler
+    
+    # Niet eerst minutenlang modellen laden als er al een daemon draait
+    check_socket(socket_path)
+    handler = CommandHandler()
+    handler.warm_up()
+    daemon = CommandDaemon(socket_path, handler, run_command)
+    
+    # Bij SIGTERM net als bij Ctrl+C de socket opruimen
+    signal.signal(signal.SIGTERM, lambda signum, frame: sys.exit(0))
+    print(f"Daemon actief op {daemon.socket_path} (stoppen met Ctrl+C)", file=sys.stderr)
+    try:
+        daemon.serve_forever()
+    except KeyboardInterrupt:
+        pass
+
+def bench(args: argparse.Namespace) -> None:
+    """Run the benchmark workloads, report them and check for regressions."""
+    from .bench import BENCH_TOLERANCE, compare, format_report, load_results, run_benchmarks, save_results
+    from .commands import CommandHandler
+    
+    results = run_benchmarks(CommandHandler(), args.workloads, scale=args.scale)
+    if args.output:
+        save_results(results, args.output)
+    
+    if args.format == "json":
+        print(json.dumps(results, indent=2))
+    else:
+        print(format_report(results))
+    
+    if args.baseline:
+        tolerance = BENCH_TOLERANCE if args.tolerance is None else args.tolerance
+        regressions = compare(results, load_results(args.baseline), tolerance)
+        # Bij JSON output blijft stdout parseerbaar
+        out = sys.stderr if args.format == "json" else sys.stdout
+        if regressions:
+            print(f"\nRegressies ten opzichte van {args.baseline} (tolerantie {tolerance:.0%}):", file=out)
+            for regression in regressions:
+                print(f"- {regression}", file=out)
+            sys.exit(1)
+        print(f"\nGeen regressies ten opzichte van {args.baseline}", file=out)
+
+def loadtest(args: argparse.Namespace) -> None:
+    """Run an HTTP load test against the API and report it."""
+    from .loadtest import format_report, run_load_test, sizing
+    
+    results = run_load_test(
+        url=args.url,
+        concurrency=args.concurrency,
+        duration=args.duration,
+        mix=args.mix,
+        seed=args.seed,
+        sample_interval=args.sample_interval
+    )
+    if args.target_rps:
+        results["sizing"] = sizing(results, args.target_rps)
+    if args.output:
+        args.output.write_text(json.dumps(results, indent=2), encoding='utf-8')
+    
+    if args.format == "json":
+        print(json.dumps(results, indent=2))
+    else:
+        print(format_report(results))
+
+def main() -> None:
+    """Main entry point for the CLI."""
+    parser = create_parser()
+    args = parser.parse_args()
+    
+    try:
+        if args.command == "serve":
+            serve(args.socket)
+            return
+        
+        if args.command == "corpus":
+            from ..corpus import write_corpus
+            summary = write_corpus(
+                args.output,
+                args.count,
+                kinds=args.kinds,
+                file_format=args.file_format,
+                size=args.size,
+                seed=args.seed
+            )
+            print(
+                f"{summary['documents']} documenten ({summary['chars']} tekens, "
+                f"{summary['spans']} entiteiten) geschreven naar {args.output}"
             )
-        else:
-            # Process text directly
-            if args.command == "analyze":
-                handler.analyze(
-                    text=args.input,
-                    entities=entities,
-                    output_format=args.format
-                )
-            else:  # anonymize
-                handler.anonymize(
-                    text=args.input,
-                    entities=entities,
-                    output_format=args.format
-                )
+            return
+        
+        # Meet altijd dit proces, niet de daemon
+        if args.command == "bench":
+            bench(args)
+            return
+        
+        if args.command == "loadtest":
+            loadtest(args)
+            return
+        
+        # Eerst een draaiende daemon proberen; die heeft de modellen al geladen
+        if args.input != "-" and not args.no_daemon:
+            code = forward(args, DEFAULT_SOCKET)
+            if code is not None:
+                sys.exit(code)
+        
+        # Modellen pas laden (en importeren) als er geen daemon is
+        from .commands import CommandHandler
+        run_command(CommandHandler(), args)
     
     except Exception as e:
         parser.error(str(e))
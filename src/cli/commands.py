@@ -1,9 +1,14 @@
 """CLI commands for text analysis and anonymization."""
 import sys
+import io
 import json
 import logging
+import multiprocessing
+import time
 import warnings
-from typing import List, Optional
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import redirect_stdout
+from typing import Any, Dict, Iterator, List, Optional, Tuple
 from pathlib import Path
 import os
 
@@ -14,7 +19,9 @@ warnings.filterwarnings("ignore", message="Asking to truncate")
 from ..core.analyzer import DutchTextAnalyzer
 from ..core.anonymizer import DutchTextAnonymizer
 from ..core.document import DocumentProcessor
-from ..core.ocr import OCRProcessor
+from ..core.ocr import OCRProcessor, cpu_budget
+from .manifest import MANIFEST_NAME, Manifest, config_hash, file_hash
+from .stream import STREAM_BATCH_SIZE, stream_records
 
 class CommandHandler:
     """Handler for CLI commands."""
@@ -23,14 +30,16 @@ class CommandHandler:
         """Initialize the command handler."""
         self.analyzer = DutchTextAnalyzer()
         self.anonymizer = DutchTextAnonymizer()
-        self.document_processor = DocumentProcessor()
+        self.document_processor = DocumentProcessor(self.analyzer, self.anonymizer)
         self.ocr_processor = None  # Lazy load OCR processor
+        self.ocr_workers: Optional[int] = None  # Standaard OCR_WORKERS of het CPU budget
     
-    def get_processor(self, use_ocr: bool = False) -> DocumentProcessor:
-        """Get the appropriate document processor."""
-        processor = self.document_processor
+    def get_ocr_processor(self, use_ocr: bool = False) -> Optional[OCRProcessor]:
+        """Get the OCR processor when OCR is requested, loading it on first use."""
+        if not use_ocr:
+            return None
         
-        if use_ocr and self.ocr_processor is None:
+        if self.ocr_processor is None:
             # Initialize OCR processor with system paths
             tesseract_cmd = os.environ.get('TESSERACT_CMD', r'C:\Program Files\Tesseract-OCR\tesseract.exe')
             poppler_path = os.environ.get('POPPLER_PATH', r'C:\Program Files\poppler-24.02.0\Library\bin')
@@ -38,13 +47,13 @@ class CommandHandler:
             try:
                 self.ocr_processor = OCRProcessor(
                     tesseract_cmd=tesseract_cmd,
-                    poppler_path=poppler_path
+                    poppler_path=poppler_path,
+                    max_workers=self.ocr_workers
                 )
-                processor.ocr_processor = self.ocr_processor
             except Exception as e:
                 print(f"Warning: Could not initialize OCR: {str(e)}")
         
-        return processor
+        return self.ocr_processor
     
     def analyze(
         self,
@@ -146,13 +155,79 @@ class CommandHandler:
             print(f"Error: {str(e)}", file=sys.stderr)
             sys.exit(1)
     
+    def process_stream(
+        self,
+        command: str = "anonymize",
+        entities: Optional[List[str]] = None,
+        plain: bool = False,
+        batch_size: int = STREAM_BATCH_SIZE,
+        source=None,
+        sink=None
+    ) -> Dict[str, Any]:
+        """
+        Process NDJSON records from stdin and write NDJSON results to stdout.
+        
+        Records are read and processed in batches, so the memory use does not
+        depend on the size of the input. Every output line has the same
+        fields as the batch endpoints of the API: "entities_found" for
+        analyze, plus "anonymized_text" for anonymize.
+        
+        Args:
+            command: Command to execute (analyze/anonymize)
+            entities: Optional list of entities
+            plain: Read every line as a text instead of a JSON object
+            batch_size: Number of records per model call
+            source: Binary input stream (default: stdin)
+            sink: Text output stream (default: stdout)
+            
+        Returns:
+            Number of records, failed records and the duration
+        """
+        source = source if source is not None else sys.stdin.buffer
+        sink = sink if sink is not None else sys.stdout
+        
+        def handle(texts: List[str]) -> List[Dict[str, Any]]:
+            output = []
+            for text, results in zip(texts, self.analyzer.analyze_batch(texts, entities, batch_size=batch_size)):
+                result = {}
+                if command == "anonymize":
+                    result["anonymized_text"] = self.anonymizer.anonymize_text(text, results)
+                result["entities_found"] = [
+                    {
+                        "entity_type": r.entity_type,
+                        "text": text[r.start:r.end],
+                        "start": r.start,
+                        "end": r.end,
+                        "score": r.score
+                    }
+                    for r in results
+                ]
+                output.append(result)
+            return output
+        
+        start_time = time.perf_counter()
+        summary = stream_records(source, sink, handle, batch_size=batch_size, plain=plain)
+        summary["seconds"] = time.perf_counter() - start_time
+        
+        # stdout bevat alleen de resultaten
+        seconds = max(summary["seconds"], 1e-9)
+        print(
+            f"Verwerkt: {summary['records']} records ({summary['failed']} mislukt) in "
+            f"{summary['seconds']:.1f}s - {summary['records'] / seconds:.1f} records/s",
+            file=sys.stderr
+        )
+        return summary
+    
     def process_file(
         self,
         input_file: Path,
         command: str = "anonymize",
         entities: Optional[List[str]] = None,
         output_format: str = "text",
-        use_ocr: bool = False
+        use_ocr: bool = False,
+        jobs: int = 1,
+        recursive: bool = False,
+        force: bool = False
     ) -> None:
         """
         Process a file or directory.
@@ -163,106 +238,311 @@ class CommandHandler:
             entities: Optional list of entities
             output_format: Output format (text/json)
             use_ocr: Whether to use OCR for PDFs
+            jobs: Number of files processed in parallel (directories only)
+            recursive: Also process files in subdirectories
+            force: Process all files again, ignoring the manifest
         """
         try:
             # Check if input is a directory
             if input_file.is_dir():
-                # Create verwerkt directory if it doesn't exist
-                output_dir = input_file.parent / "verwerkt"
-                output_dir.mkdir(exist_ok=True)
-                
-                print(f"\nVerwerken van directory: {input_file}")
-                
-                # Process all text and PDF files
-                for pattern in ["*.txt", "*.pdf"]:
-                    for file_path in input_file.glob(pattern):
-                        # Skip files in 'verwerkt' directory
-                        if "verwerkt" in str(file_path):
-                            continue
-                            
-                        print(f"\nVerwerken van: {file_path}")
-                        try:
-                            self.process_file(
-                                input_file=file_path,
-                                command=command,
-                                entities=entities,
-                                output_format=output_format,
-                                use_ocr=use_ocr
-                            )
-                        except Exception as e:
-                            print(f"Error bij verwerken {file_path}: {str(e)}")
-                            continue
+                summary = self.process_directory(
+                    input_dir=input_file,
+                    command=command,
+                    entities=entities,
+                    output_format=output_format,
+                    use_ocr=use_ocr,
+                    jobs=jobs,
+                    recursive=recursive,
+                    force=force
+                )
+                if summary["failed"]:
+                    sys.exit(1)
                 return
             
-            # Create output path in verwerkt directory
-            output_dir = input_file.parent / "verwerkt"
-            output_dir.mkdir(exist_ok=True)
+            self._process_single_file(input_file, command, entities, output_format, use_ocr)
+        
+        except Exception as e:
+            print(f"Error bij verwerken bestand: {str(e)}", file=sys.stderr)
+            sys.exit(1)
+    
+    def process_directory(
+        self,
+        input_dir: Path,
+        command: str = "anonymize",
+        entities: Optional[List[str]] = None,
+        output_format: str = "text",
+        use_ocr: bool = False,
+        jobs: int = 1,
+        recursive: bool = False,
+        force: bool = False
+    ) -> Dict[str, Any]:
+        """
+        Process all text and PDF files in a directory.
+        
+        With jobs > 1 the files are processed on a pool of worker processes.
+        Where the platform supports fork, the models are loaded once here
+        and the workers are forked afterwards, so they share the loaded
+        models instead of each loading their own copy. The output of every
+        file is printed in input order, followed by a summary with the
+        throughput.
+        
+        For anonymize runs a manifest in the verwerkt directory records the
+        content hash, settings hash and output of every file. A new run skips
+        files that are unchanged and were processed successfully with the
+        same settings, and retries files that failed.
+        
+        Args:
+            input_dir: Directory with input files
+            command: Command to execute (analyze/anonymize)
+            entities: Optional list of entities
+            output_format: Output format (text/json)
+            use_ocr: Whether to use OCR for PDFs
+            jobs: Number of worker processes (1 processes in this process)
+            recursive: Also process files in subdirectories
+            force: Process all files again, ignoring the manifest
             
-            # Process based on file type
-            if input_file.suffix.lower() == '.pdf':
-                # For PDFs, use document processor
-                output_file = output_dir / f"{input_file.stem}_anon.pdf"
-                processor = self.get_processor(use_ocr)
-                stats = processor.process_pdf(
-                    input_path=input_file,
-                    output_path=output_file,
-                    entities=entities,
-                    keep_layout=True
-                )
+        Returns:
+            Summary with the number of files, skipped files, failures, bytes and duration
+        """
+        print(f"\nVerwerken van directory: {input_dir}")
+        
+        # Process all text and PDF files; skip files in 'verwerkt' directories
+        # (alleen binnen de invoer directory kijken, anders valt 'onverwerkt/' ook af)
+        walk = input_dir.rglob if recursive else input_dir.glob
+        files = [
+            file_path
+            for pattern in ["*.txt", "*.pdf"]
+            for file_path in sorted(walk(pattern))
+            if "verwerkt" not in file_path.relative_to(input_dir).parts[:-1]
+        ]
+        options = (command, entities, output_format, use_ocr)
+        
+        # Alleen anonimiseren schrijft output; analyse resultaten worden altijd getoond
+        manifest = None
+        if command == "anonymize":
+            manifest = Manifest(input_dir / "verwerkt" / MANIFEST_NAME)
+            settings = config_hash(command=command, entities=sorted(entities or []), use_ocr=use_ocr)
+        
+        start_time = time.perf_counter()
+        summary = {"files": 0, "skipped": 0, "failed": 0, "bytes": 0}
+        try:
+            todo = []
+            hashes = {}
+            for file_path in files:
+                if manifest is not None:
+                    hashes[file_path] = file_hash(file_path)
+                    key = file_path.relative_to(input_dir).as_posix()
+                    if not force and manifest.is_current(key, hashes[file_path], settings):
+                        summary["skipped"] += 1
+                        continue
+                todo.append(file_path)
+            
+            if summary["skipped"]:
+                print(f"Overgeslagen (ongewijzigd en al verwerkt): {summary['skipped']} bestanden")
+            
+            outcomes = self._run_files(todo, options, jobs)
+            for number, (file_path, (output, error, size, output_file)) in enumerate(zip(todo, outcomes), start=1):
+                print(f"\n[{number}/{len(todo)}] Verwerken van: {file_path}")
+                if output:
+                    print(output, end="")
+                if error is not None:
+                    print(f"Error bij verwerken {file_path}: {error}")
+                    summary["failed"] += 1
+                summary["files"] += 1
+                summary["bytes"] += size
                 
+                if manifest is not None:
+                    key = file_path.relative_to(input_dir).as_posix()
+                    manifest.record(key, hashes[file_path], settings, output_file, error)
+        finally:
+            if manifest is not None:
+                manifest.close()
+        
+        summary["seconds"] = time.perf_counter() - start_time
+        self._print_summary(summary, output_format)
+        return summary
+    
+    def _run_files(self, files: List[Path], options: tuple, jobs: int) -> Iterator[Tuple[str, Optional[str], int, Optional[Path]]]:
+        """Process files sequentially or on a process pool, yielding outcomes in input order."""
+        if jobs <= 1 or len(files) <= 1:
+            for file_path in files:
+                yield _process_captured(self, file_path, options)
+            return
+        
+        global _worker_handler
+        try:
+            context = multiprocessing.get_context("fork")
+            # Modellen hier laden zodat de geforkte workers ze delen
+            self.warm_up()
+            _worker_handler = self
+        except ValueError:
+            # Geen fork (Windows/macOS spawn): elke worker laadt zijn eigen modellen
+            context = multiprocessing.get_context()
+        
+        threads = _worker_threads(jobs)
+        try:
+            with ProcessPoolExecutor(
+                max_workers=jobs,
+                mp_context=context,
+                initializer=_init_worker,
+                initargs=(threads,)
+            ) as executor:
+                yield from executor.map(_process_in_worker, files, [options] * len(files))
+        finally:
+            _worker_handler = None
+    
+    def warm_up(self) -> None:
+        """Load all lazily loaded models now."""
+        self.analyzer.robbert.load()
+    
+    def _print_summary(self, summary: Dict[str, Any], output_format: str) -> None:
+        """Print the number of processed files and the throughput."""
+        seconds = max(summary["seconds"], 1e-9)
+        megabytes = summary["bytes"] / (1024 * 1024)
+        line = (
+            f"Verwerkt: {summary['files']} bestanden ({summary['failed']} mislukt, "
+            f"{summary.get('skipped', 0)} overgeslagen, "
+            f"{megabytes:.1f} MB) in {summary['seconds']:.1f}s - "
+            f"{summary['files'] / seconds:.2f} bestanden/s, {megabytes / seconds:.2f} MB/s"
+        )
+        # Bij JSON output blijft stdout parseerbaar
+        print(f"\n{line}", file=sys.stderr if output_format == "json" else sys.stdout)
+    
+    def _process_single_file(
+        self,
+        input_file: Path,
+        command: str = "anonymize",
+        entities: Optional[List[str]] = None,
+        output_format: str = "text",
+        use_ocr: bool = False
+    ) -> Optional[Path]:
+        """
+        Process one text or PDF file and print the result; errors are raised.
+        
+        Returns:
+            Path of the written output file, or None if nothing was written
+        """
+        # Create output path in verwerkt directory
+        output_dir = input_file.parent / "verwerkt"
+        output_dir.mkdir(exist_ok=True)
+        
+        # Process based on file type
+        if input_file.suffix.lower() == '.pdf':
+            # For PDFs, use document processor
+            output_file = output_dir / f"{input_file.stem}_anon.pdf"
+            stats = self.document_processor.process_pdf(
+                input_path=input_file,
+                output_path=output_file,
+                entities=entities,
+                keep_layout=True,
+                ocr_processor=self.get_ocr_processor(use_ocr)
+            )
+            
+            if output_format == "json":
+                print(json.dumps(stats, indent=2))
+            else:
+                print("\nPDF Verwerking voltooid!")
+                print(f"Output bestand: {stats['output_file']}")
+                if stats['entities_by_type']:
+                    print("\nGevonden entiteiten per type:")
+                    for entity_type, entities in stats['entities_by_type'].items():
+                        print(f"\n{entity_type}:")
+                        for entity in entities:
+                            print(f"- {entity['text']} (score: {entity['score']:.2f})")
+            return output_file
+        else:
+            # Regular text file processing
+            text = input_file.read_text(encoding='utf-8')
+            
+            if command == "analyze":
+                results = self.analyzer.analyze_text(text, entities)
                 if output_format == "json":
-                    print(json.dumps(stats, indent=2))
+                    output = {
+                        "results": [
+                            {
+                                "entity_type": r.entity_type,
+                                "text": text[r.start:r.end],
+                                "score": r.score
+                            }
+                            for r in results
+                        ]
+                    }
+                    print(json.dumps(output, indent=2))
                 else:
-                    print("\nPDF Verwerking voltooid!")
-                    print(f"Output bestand: {stats['output_file']}")
-                    if stats['entities_by_type']:
-                        print("\nGevonden entiteiten per type:")
-                        for entity_type, entities in stats['entities_by_type'].items():
-                            print(f"\n{entity_type}:")
-                            for entity in entities:
-                                print(f"- {entity['text']} (score: {entity['score']:.2f})")
-            else:
-                # Regular text file processing
-                text = input_file.read_text(encoding='utf-8')
-                
-                if command == "analyze":
-                    results = self.analyzer.analyze_text(text, entities)
-                    if output_format == "json":
-                        output = {
-                            "results": [
-                                {
-                                    "entity_type": r.entity_type,
-                                    "text": text[r.start:r.end],
-                                    "score": r.score
-                                }
-                                for r in results
-                            ]
-                        }
-                        print(json.dumps(output, indent=2))
-                    else:
-                        print("\nGevonden entiteiten:")
+                    print("\nGevonden entiteiten:")
+                    print("-" * 40)
+                    for r in results:
+                        print(f"Type: {r.entity_type}")
+                        print(f"Text: {text[r.start:r.end]}")
+                        print(f"Score: {r.score:.2f}")
                         print("-" * 40)
-                        for r in results:
-                            print(f"Type: {r.entity_type}")
-                            print(f"Text: {text[r.start:r.end]}")
-                            print(f"Score: {r.score:.2f}")
-                            print("-" * 40)
-                else:  # anonymize
-                    results = self.analyzer.analyze_text(text, entities)
-                    anonymized = self.anonymizer.anonymize_text(text, results)
-                    output_file = output_dir / f"{input_file.stem}_anon{input_file.suffix}"
-                    output_file.write_text(anonymized, encoding='utf-8')
-                    
-                    print(f"\nGeanonimiseerd bestand opgeslagen als: {output_file}")
-                    if results:
-                        print("\nGevonden en vervangen entiteiten:")
+            else:  # anonymize
+                results = self.analyzer.analyze_text(text, entities)
+                anonymized = self.anonymizer.anonymize_text(text, results)
+                output_file = output_dir / f"{input_file.stem}_anon{input_file.suffix}"
+                output_file.write_text(anonymized, encoding='utf-8')
+                
+                print(f"\nGeanonimiseerd bestand opgeslagen als: {output_file}")
+                if results:
+                    print("\nGevonden en vervangen entiteiten:")
+                    print("-" * 40)
+                    for r in results:
+                        print(f"Type: {r.entity_type}")
+                        print(f"Text: {text[r.start:r.end]}")
+                        print(f"Score: {r.score:.2f}")
                         print("-" * 40)
-                        for r in results:
-                            print(f"Type: {r.entity_type}")
-                            print(f"Text: {text[r.start:r.end]}")
-                            print(f"Score: {r.score:.2f}")
-                            print("-" * 40)
-        
-        except Exception as e:
-            print(f"Error bij verwerken bestand: {str(e)}", file=sys.stderr)
-            sys.exit(1) 
\ No newline at end of file
+                return output_file
+        return None
+
+
+# Handler van een worker proces (bij fork overgenomen van het hoofdproces)
+_worker_handler: Optional[CommandHandler] = None
+
+def _worker_threads(jobs: int) -> int:
+    """Return the CPU threads per worker process when jobs files run in parallel."""
+    return max(1, cpu_budget() // jobs)
+
+def _init_worker(threads: int) -> None:
+    """Prepare a worker process of a parallel directory run."""
+    global _worker_handler
+    if _worker_handler is None:
+        _worker_handler = CommandHandler()
+    
+    # Elke worker krijgt zijn deel van het CPU budget voor de OCR pool, anders
+    # starten N workers elk een pool ter grootte van alle cores; een OCR
+    # processor van het hoofdproces (via fork overgenomen) wordt opnieuw gemaakt
+    _worker_handler.ocr_workers = threads
+    _worker_handler.ocr_processor = None
+    
+    # Workers niet onderling laten concurreren om CPU threads
+    try:
+        import torch
+        torch.set_num_threads(threads)
+    except ImportError:
+        pass
+
+def _process_captured(
+    handler: CommandHandler,
+    file_path: Path,
+    options: tuple
+) -> Tuple[str, Optional[str], int, Optional[Path]]:
+    """
+    Process one file with its printed output captured.
+    
+    Returns:
+        (printed output, error message or None, input size in bytes, output file)
+    """
+    command, entities, output_format, use_ocr = options
+    output = io.StringIO()
+    error = None
+    output_file = None
+    try:
+        with redirect_stdout(output):
+            output_file = handler._process_single_file(file_path, command, entities, output_format, use_ocr)
+    except Exception as e:
+        error = str(e)
+    return output.getvalue(), error, file_path.stat().st_size, output_file
+
+def _process_in_worker(file_path: Path, options: tuple) -> Tuple[str, Optional[str], int, Optional[Path]]:
+    """Process one file in a worker process."""
+    return _process_captured(_worker_handler, file_path, options)
@@ -0,0 +1,236 @@
+"""Daemon that keeps the models loaded, and the client that forwards CLI commands to it."""
+import argparse
+import io
+import json
+import logging
+import os
+import socket
+import socketserver
+import stat
+import sys
+import tempfile
+import threading
+from contextlib import redirect_stderr, redirect_stdout
+from pathlib import Path
+from typing import Any, Callable, Dict, Optional
+
+logger = logging.getLogger(__name__)
+
+_UID = getattr(os, 'getuid', lambda: 0)()
+
+# Socket van de daemon; per gebruiker, zodat niemand anders er commando's naartoe kan sturen.
+# Zonder XDG_RUNTIME_DIR in een eigen 0700 directory, niet direct in de gedeelde /tmp
+DEFAULT_SOCKET = os.environ.get(
+    'PRESIDIO_SOCKET',
+    os.path.join(os.environ['XDG_RUNTIME_DIR'], f"presidio-nl-{_UID}.sock")
+    if os.environ.get('XDG_RUNTIME_DIR')
+    else os.path.join(tempfile.gettempdir(), f"presidio-nl-{_UID}", "daemon.sock")
+)
+
+# Exit code van argparse bij een ongeldig commando
+USAGE_ERROR = 2
+
+
+def supported() -> bool:
+    """Check whether the platform has Unix sockets."""
+    return hasattr(socket, "AF_UNIX")
+
+
+def owned_socket(socket_path: str) -> bool:
+    """Check that a path is a socket (not a symlink) owned by the current user."""
+    try:
+        info = os.lstat(socket_path)
+    except OSError:
+        return False
+    return stat.S_ISSOCK(info.st_mode) and info.st_uid == _UID
+
+
+def _private_directory(directory: Path) -> None:
+    # Aanmaken met 0700; een bestaande directory van iemand anders niet gebruiken
+    directory.mkdir(mode=0o700, parents=True, exist_ok=True)
+    info = os.lstat(directory)
+    if not stat.S_ISDIR(info.st_mode) or info.st_uid != _UID:
+        raise RuntimeError(f"Directory {directory} is niet van de huidige gebruiker")
+    if info.st_mode & 0o002:
+        raise RuntimeError(f"Directory {directory} is schrijfbaar voor iedereen")
+
+
+def _send(wfile, message: Dict[str, Any]) -> None:
+    wfile.write(json.dumps(message, ensure_ascii=False).encode('utf-8') + b"\n")
+
+
+class _SocketStream(io.TextIOBase):
+    """Text stream that forwards everything written to it to the client."""
+
+    def __init__(self, wfile, name: str):
+        self.wfile = wfile
+        self.name = name
+
+    def writable(self) -> bool:
+        return True
+
+    def write(self, data: str) -> int:
+        if data:
+            _send(self.wfile, {"stream": self.name, "data": data})
+        return len(data)
+
+    def flush(self) -> None:
+        self.wfile.flush()
+
+
+class CommandDaemon:
+    """
+    Run CLI commands for clients on a Unix socket, with the models loaded once.
+
+    A client sends one JSON line with the parsed command line arguments;
+    the daemon runs the command and streams its stdout and stderr back as
+    {"stream", "data"} lines, followed by {"exit": code}. Commands run one
+    at a time (stdout is redirected for the whole process); a directory run
+    can still use --jobs to process files in parallel.
+    """
+
+    def __init__(self, socket_path: str, handler, run: Callable[[Any, argparse.Namespace], None]):
+        """
+        Initialize the daemon.
+
+        Args:
+            socket_path: Path of the Unix socket to listen on
+            handler: CommandHandler with the loaded models
+            run: Function that runs a parsed command with the handler
+        """
+        if not supported():
+            raise RuntimeError("Unix sockets worden niet ondersteund op dit platform")
+        self.socket_path = socket_path
+        self.handler = handler
+        self.run = run
+        self._lock = threading.Lock()
+
+        daemon = self
+
+        class RequestHandler(socketserver.StreamRequestHandler):
+            def handle(self):
+                daemon._handle(self.rfile, self.wfile)
+
+        _private_directory(Path(socket_path).parent)
+        check_socket(socket_path)
+        # Socket pas na het zetten van de rechten bruikbaar maken
+        old_umask = os.umask(0o177)
+        try:
+            self.server = socketserver.ThreadingUnixStreamServer(socket_path, RequestHandler)
+        finally:
+            os.umask(old_umask)
+        self.server.daemon_threads = True
+
+    def _handle(self, rfile, wfile) -> None:
+        line = rfile.readline()
+        if not line:
+            # Verbinding zonder verzoek, bijv. de controle of de daemon al draait
+            return
+        try:
+            request = json.loads(line)
+            args = argparse.Namespace(**request["args"])
+        except (ValueError, KeyError, TypeError) as e:
+            _send(wfile, {"stream": "stderr", "data": f"Ongeldig verzoek: {str(e)}\n"})
+            _send(wfile, {"exit": USAGE_ERROR})
+            return
+
+        stdout, stderr = _SocketStream(wfile, "stdout"), _SocketStream(wfile, "stderr")
+        code = 0
+        try:
+            with self._lock, redirect_stdout(stdout), redirect_stderr(stderr):
+                try:
+                    self.run(self.handler, args)
+                except SystemExit as e:
+                    if isinstance(e.code, int) or e.code is None:
+                        code = e.code or 0
+                    else:
+                        print(e.code, file=sys.stderr)
+                        code = 1
+                except Exception as e:
+                    print(f"error: {str(e)}", file=sys.stderr)
+                    code = USAGE_ERROR
+            _send(wfile, {"exit": code})
+        except (BrokenPipeError, ConnectionResetError):
+            logger.info("Client disconnected before the command finished")
+
+    def serve_forever(self) -> None:
+        """Handle clients until interrupted, then remove the socket."""
+        logger.info(f"Daemon listening on {self.socket_path}")
+        try:
+            self.server.serve_forever()
+        finally:
+            self.close()
+
+    def close(self) -> None:
+        """Stop listening and remove the socket."""
+        self.server.server_close()
+        try:
+            os.unlink(self.socket_path)
+        except FileNotFoundError:
+            pass
+
+
+def check_socket(socket_path: str) -> None:
+    """
+    Make sure no daemon is running on a socket, removing a socket left behind by a stopped daemon.
+
+    Raises:
+        RuntimeError: If a daemon is running on the socket
+    """
+    if not os.path.lexists(socket_path):
+        return
+    if not owned_socket(socket_path):
+        raise RuntimeError(f"{socket_path} is geen socket van de huidige gebruiker")
+    try:
+        with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as client:
+            client.connect(socket_path)
+    except (ConnectionRefusedError, FileNotFoundError):
+        os.unlink(socket_path)
+        return
+    raise RuntimeError(f"Er draait al een daemon op {socket_path}")
+
+
+def forward(args: argparse.Namespace, socket_path: str = DEFAULT_SOCKET) -> Optional[int]:
+    """
+    Run a command on the daemon, writing its output to stdout and stderr.
+
+    Args:
+        args: Parsed command line arguments
+        socket_path: Path of the daemon socket
+
+    Returns:
+        Exit code of the command, or None if no daemon is running
+    """
+    if not supported() or not os.path.exists(socket_path):
+        return None
+    # Commando en invoer bevatten persoonsgegevens: alleen naar een socket van onszelf sturen
+    if not owned_socket(socket_path):
+        logger.warning(f"Ignoring {socket_path}: not a socket owned by the current user")
+        return None
+
+    request = dict(vars(args))
+    # De daemon heeft een andere werkdirectory
+    if Path(args.input).exists():
+        request["input"] = str(Path(args.input).resolve())
+
+    client = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    try:
+        try:
+            client.connect(socket_path)
+        except (ConnectionRefusedError, FileNotFoundError):
+            return None
+
+        with client.makefile('rwb') as stream:
+            _send(stream, {"args": request})
+            stream.flush()
+            for line in stream:
+                message = json.loads(line)
+                if "exit" in message:
+                    return message["exit"]
+                target = sys.stderr if message.get("stream") == "stderr" else sys.stdout
+                target.write(message.get("data", ""))
+    finally:
+        client.close()
+
+    print("Error: verbinding met de daemon verbroken", file=sys.stderr)
+    return 1
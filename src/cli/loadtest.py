@@ -0,0 +1,372 @@
+"""HTTP load test of the API: concurrent clients, latency percentiles, rejections and server memory over time."""
+import asyncio
+import math
+import os
+import random
+import re
+import tempfile
+import threading
+import time
+from collections import Counter
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+from ..corpus.generator import EMAIL, LETTER, CorpusGenerator
+from ..corpus.writer import PDF, write_document
+from .bench import percentile
+
+# Aandeel van elk endpoint in de requests
+DEFAULT_MIX = "analyze=6,anonymize_text=3,anonymize_pdf=1"
+
+ENDPOINTS = {
+    "analyze": "/analyze",
+    "anonymize_text": "/anonymize/text",
+    "anonymize_pdf": "/anonymize/pdf",
+}
+
+# Timeout per request in seconden; een PDF kan in de bulk lane even wachten
+LOADTEST_TIMEOUT = float(os.environ.get('LOADTEST_TIMEOUT', 300))
+
+# Marge boven de gemeten piek bij het advies voor de geheugenlimiet
+MEMORY_HEADROOM = 1.3
+
+_RSS_METRIC = re.compile(r"^process_resident_memory_bytes\s+(\S+)$", re.MULTILINE)
+
+
+def parse_mix(value: str) -> Dict[str, float]:
+    """
+    Parse a request mix such as "analyze=6,anonymize_pdf=1".
+
+    Raises:
+        ValueError: For an unknown endpoint or an invalid weight
+    """
+    mix = {}
+    for part in value.split(","):
+        name, _, weight = part.strip().partition("=")
+        if name not in ENDPOINTS:
+            raise ValueError(f"Onbekend endpoint in mix: {name} (kies uit {', '.join(ENDPOINTS)})")
+        try:
+            mix[name] = float(weight or 1)
+        except ValueError:
+            raise ValueError(f"Ongeldig gewicht voor {name}: {weight}")
+        if mix[name] < 0:
+            raise ValueError(f"Ongeldig gewicht voor {name}: {weight}")
+    if not sum(mix.values()):
+        raise ValueError("Mix bevat geen requests")
+    return mix
+
+
+class Payloads:
+    """Request bodies from the synthetic corpus: short and longer texts and small PDFs."""
+
+    def __init__(self, seed: int = 0, texts: int = 50, pdfs: int = 5):
+        """
+        Generate the payloads.
+
+        Args:
+            seed: Corpus seed
+            texts: Number of different texts
+            pdfs: Number of different PDFs
+        """
+        generator = CorpusGenerator(seed)
+        self.texts = [document.text for document in generator.generate(texts, [EMAIL, LETTER])]
+        self.pdfs: List[Tuple[str, bytes]] = []
+        with tempfile.TemporaryDirectory(prefix="presidio-loadtest-") as directory:
+            for document in generator.generate(pdfs, [LETTER], size=3000, start=texts):
+                path = write_document(document, Path(directory), PDF, seed)
+                self.pdfs.append((path.name, path.read_bytes()))
+
+    def request(self, endpoint: str, rng: random.Random) -> Dict[str, Any]:
+        """Return the keyword arguments of an httpx request to an endpoint."""
+        if endpoint == "anonymize_pdf":
+            name, content = rng.choice(self.pdfs)
+            return {"files": {"file": (name, content, "application/pdf")}}
+        return {"json": {"text": rng.choice(self.texts)}}
+
+
+@contextmanager
+def run_server(app=None, host: str = "127.0.0.1") -> Iterator[str]:
+    """
+    Start the API with uvicorn in a background thread.
+
+    The models are loaded on import, before the first request is timed.
+
+    Args:
+        app: ASGI app to serve (default: the presidio-nl API)
+        host: Interface to listen on; the port is chosen free
+
+    Yields:
+        Base URL of the API
+    """
+    import uvicorn
+
+    if app is None:
+        from ..api.app import app
+    server = uvicorn.Server(uvicorn.Config(app, host=host, port=0, log_level="warning"))
+    thread = threading.Thread(target=server.run, name="loadtest-server", daemon=True)
+    thread.start()
+    while not server.started:
+        if not thread.is_alive():
+            raise RuntimeError("API server kon niet gestart worden")
+        time.sleep(0.05)
+    port = server.servers[0].sockets[0].getsockname()[1]
+    try:
+        yield f"http://{host}:{port}{getattr(app, 'root_path', '')}"
+    finally:
+        server.should_exit = True
+        thread.join()
+
+
+async def _client_loop(client, base_url: str, payloads: Payloads, mix: Dict[str, float],
+                       rng: random.Random, start: float, deadline: float, records: List[tuple]) -> None:
+    names, weights = list(mix), list(mix.values())
+    while time.perf_counter() < deadline:
+        endpoint = rng.choices(names, weights)[0]
+        sent = time.perf_counter()
+        try:
+            response = await client.post(base_url + ENDPOINTS[endpoint], **payloads.request(endpoint, rng))
+            status, error = response.status_code, None
+        except Exception as e:
+            # Verbinding of timeout; telt als fout, met het type als oorzaak
+            status, error = 0, type(e).__name__
+        records.append((endpoint, sent - start, time.perf_counter() - sent, status, error))
+
+
+async def _sample_rss(client, base_url: str, interval: float, start: float,
+                      samples: List[Tuple[float, float]], stop: asyncio.Event) -> None:
+    while not stop.is_set():
+        try:
+            response = await client.get(base_url + "/metrics")
+            match = _RSS_METRIC.search(response.text)
+            if match:
+                samples.append((time.perf_counter() - start, float(match.group(1)) / (1024 * 1024)))
+        except Exception:
+            pass
+        try:
+            await asyncio.wait_for(stop.wait(), interval)
+        except asyncio.TimeoutError:
+            pass
+
+
+async def _drive(base_url: str, concurrency: int, duration: float, mix: Dict[str, float],
+                 payloads: Payloads, seed: int, sample_interval: float) -> Tuple[List[tuple], List[tuple], float]:
+    import httpx
+
+    records: List[tuple] = []
+    samples: List[Tuple[float, float]] = []
+    limits = httpx.Limits(max_connections=concurrency + 1, max_keepalive_connections=concurrency + 1)
+    async with httpx.AsyncClient(timeout=LOADTEST_TIMEOUT, limits=limits) as client:
+        stop = asyncio.Event()
+        start = time.perf_counter()
+        sampler = asyncio.create_task(_sample_rss(client, base_url, sample_interval, start, samples, stop))
+        await asyncio.gather(*[
+            _client_loop(client, base_url, payloads, mix, random.Random(f"{seed}-{number}"),
+                         start, start + duration, records)
+            for number in range(concurrency)
+        ])
+        elapsed = time.perf_counter() - start
+        stop.set()
+        await sampler
+    return records, samples, elapsed
+
+
+def _latencies(values: List[float]) -> Dict[str, float]:
+    return {f"p{q}": round(percentile(values, q), 4) for q in (50, 95, 99)}
+
+
+def _error_kind(status: int, error: Optional[str]) -> str:
+    """Name the cause of a failed request: the exception type, or the HTTP status."""
+    return error or f"HTTP {status}"
+
+
+def summarize(records: List[tuple], samples: List[Tuple[float, float]], elapsed: float,
+              interval: float = 1.0) -> Dict[str, Any]:
+    """
+    Turn raw request records into per-endpoint statistics and a timeline.
+
+    Latency percentiles are over successful requests only; rejected (429)
+    and failed requests are counted separately. Failures are also counted
+    per cause in "errors_by_kind" (exception type, or "HTTP <status>").
+
+    Args:
+        records: (endpoint, seconds since start, latency, status, exception
+            type or None) per request
+        samples: (seconds since start, server RSS in MB) samples
+        elapsed: Duration of the test in seconds
+        interval: Width of a timeline bucket in seconds
+    """
+    def stats(selection: List[tuple]) -> Dict[str, Any]:
+        ok = [latency for _, _, latency, status, _ in selection if 200 <= status < 300]
+        rejected = sum(1 for record in selection if record[3] == 429)
+        errors = len(selection) - len(ok) - rejected
+        kinds = Counter(
+            _error_kind(status, error) for _, _, _, status, error in selection
+            if not 200 <= status < 300 and status != 429
+        )
+        return {
+            "requests": len(selection),
+            "ok": len(ok),
+            "rejected": rejected,
+            "errors": errors,
+            "rps": round(len(ok) / elapsed, 3) if elapsed else 0.0,
+            "error_rate": round(errors / len(selection), 4) if selection else 0.0,
+            "reject_rate": round(rejected / len(selection), 4) if selection else 0.0,
+            "latency": _latencies(ok),
+            "errors_by_kind": dict(kinds.most_common()),
+        }
+
+    timeline = []
+    for bucket in range(max(1, math.ceil(elapsed / interval))):
+        low, high = bucket * interval, (bucket + 1) * interval
+        done = [record for record in records if low <= record[1] + record[2] < high]
+        rss = [value for at, value in samples if low <= at < high]
+        timeline.append({
+            "t": round(high, 3),
+            "completed": len(done),
+            "rejected": sum(1 for record in done if record[3] == 429),
+            "errors": sum(1 for record in done if not 200 <= record[3] < 300 and record[3] != 429),
+            "p95": round(percentile([record[2] for record in done if 200 <= record[3] < 300], 95), 4),
+            "rss_mb": round(max(rss), 1) if rss else None,
+        })
+
+    return {
+        "seconds": round(elapsed, 3),
+        "total": stats(records),
+        "endpoints": {
+            endpoint: stats([record for record in records if record[0] == endpoint])
+            for endpoint in dict.fromkeys(record[0] for record in records)
+        },
+        "rss_mb": {
+            "start": samples[0][1] if samples else None,
+            "peak": max(value for _, value in samples) if samples else None,
+            "end": samples[-1][1] if samples else None,
+        },
+        "timeline": timeline,
+    }
+
+
+def sizing(results: Dict[str, Any], target_rps: float) -> Dict[str, Any]:
+    """
+    Estimate the replicas and memory limit needed for a target request rate.
+
+    Assumes throughput scales linearly with replicas at the tested concurrency
+    per pod, which is optimistic once a shared resource saturates.
+    """
+    per_pod = results["total"]["rps"]
+    peak = results["rss_mb"]["peak"]
+    return {
+        "target_rps": target_rps,
+        "rps_per_pod": per_pod,
+        "replicas": math.ceil(target_rps / per_pod) if per_pod else None,
+        "memory_limit_mb": int(math.ceil(peak * MEMORY_HEADROOM / 256) * 256) if peak else None,
+    }
+
+
+def run_load_test(
+    url: Optional[str] = None,
+    concurrency: int = 8,
+    duration: float = 30.0,
+    mix: str = DEFAULT_MIX,
+    seed: int = 0,
+    sample_interval: float = 1.0,
+    warmup: int = 3
+) -> Dict[str, Any]:
+    """
+    Run a closed-loop load test: `concurrency` clients each send requests back to back.
+
+    Args:
+        url: Base URL of a running API (e.g. http://localhost:8080/api/v1);
+            without one the API is started in this process
+        concurrency: Number of concurrent clients
+        duration: Seconds to generate load
+        mix: Share of each endpoint, e.g. "analyze=6,anonymize_text=3,anonymize_pdf=1"
+        seed: Seed for the payloads and the request order
+        sample_interval: Seconds between server RSS samples and timeline buckets
+        warmup: Requests per endpoint sent before measuring
+
+    Returns:
+        Settings, per-endpoint statistics, RSS and a timeline
+    """
+    weights = parse_mix(mix)
+    payloads = Payloads(seed)
+
+    @contextmanager
+    def target() -> Iterator[str]:
+        if url:
+            yield url.rstrip("/")
+        else:
+            with run_server() as base_url:
+                yield base_url
+
+    with target() as base_url:
+        if warmup:
+            import httpx
+            rng = random.Random(seed)
+            with httpx.Client(timeout=LOADTEST_TIMEOUT) as client:
+                for endpoint in (name for name, weight in weights.items() if weight):
+                    for _ in range(warmup):
+                        client.post(base_url + ENDPOINTS[endpoint], **payloads.request(endpoint, rng))
+
+        records, samples, elapsed = asyncio.run(
+            _drive(base_url, concurrency, duration, weights, payloads, seed, sample_interval)
+        )
+
+    results = summarize(records, samples, elapsed, sample_interval)
+    results["settings"] = {
+        "url": url or "in-process",
+        "concurrency": concurrency,
+        "duration": duration,
+        "mix": weights,
+        "seed": seed,
+    }
+    return results
+
+
+def format_report(results: Dict[str, Any]) -> str:
+    """Format load test results as a readable report."""
+    settings = results["settings"]
+    lines = [
+        f"Load test: {settings['concurrency']} clients, {results['seconds']:.0f}s, doel {settings['url']}",
+        "",
+        f"{'endpoint':<16} {'requests':>9} {'req/s':>8} {'p50 (s)':>9} {'p95 (s)':>9} {'p99 (s)':>9} "
+        f"{'429':>7} {'fouten':>7}",
+        "-" * 80,
+    ]
+    for name, stats in list(results["endpoints"].items()) + [("totaal", results["total"])]:
+        latency = stats["latency"]
+        lines.append(
+            f"{name:<16} {stats['requests']:>9} {stats['rps']:>8.2f} {latency['p50']:>9.3f} "
+            f"{latency['p95']:>9.3f} {latency['p99']:>9.3f} {stats['reject_rate']:>7.1%} {stats['error_rate']:>7.1%}"
+        )
+
+    # Oorzaken van fouten per endpoint, zodat een hoog foutpercentage te verklaren is
+    failing = [
+        (name, stats["errors_by_kind"]) for name, stats in results["endpoints"].items() if stats["errors_by_kind"]
+    ]
+    if failing:
+        lines += ["", "Fouten per oorzaak:"]
+        for name, kinds in failing:
+            lines.append(f"  {name:<16} " + ", ".join(f"{kind} {count}" for kind, count in kinds.items()))
+
+    rss = results["rss_mb"]
+    if rss["peak"] is not None:
+        lines += ["", f"Server RSS: start {rss['start']:.0f} MB, piek {rss['peak']:.0f} MB, eind {rss['end']:.0f} MB"]
+
+    lines += ["", f"{'t (s)':>7} {'klaar':>7} {'429':>5} {'fouten':>7} {'p95 (s)':>9} {'RSS (MB)':>9}"]
+    for bucket in results["timeline"]:
+        rss_mb = f"{bucket['rss_mb']:.0f}" if bucket["rss_mb"] is not None else "-"
+        lines.append(
+            f"{bucket['t']:>7.0f} {bucket['completed']:>7} {bucket['rejected']:>5} {bucket['errors']:>7} "
+            f"{bucket['p95']:>9.3f} {rss_mb:>9}"
+        )
+
+    if "sizing" in results:
+        advice = results["sizing"]
+        lines += [
+            "",
+            f"Voor {advice['target_rps']:g} req/s bij {advice['rps_per_pod']:.2f} req/s per pod: "
+            f"replicaCount/maxReplicas >= {advice['replicas']}"
+            + (f", geheugenlimiet ~{advice['memory_limit_mb']} MB" if advice["memory_limit_mb"] else ""),
+        ]
+    return "\n".join(lines)
@@ -0,0 +1,129 @@
+"""Manifest of processed files, so interrupted batch runs can be resumed."""
+import hashlib
+import json
+import logging
+import os
+import time
+from pathlib import Path
+from typing import Any, Dict, Optional
+
+logger = logging.getLogger(__name__)
+
+MANIFEST_NAME = "manifest.jsonl"
+
+# Verhogen als de output van dezelfde invoer en instellingen verandert
+MANIFEST_VERSION = 1
+
+DONE = "done"
+FAILED = "failed"
+
+
+def file_hash(path: Path, chunk_size: int = 1024 * 1024) -> str:
+    """Return the SHA-256 of a file's content."""
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(chunk_size), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def config_hash(**settings: Any) -> str:
+    """Return a hash of the settings that determine the output of a file."""
+    data = json.dumps(dict(settings, version=MANIFEST_VERSION), sort_keys=True, default=str)
+    return hashlib.sha256(data.encode('utf-8')).hexdigest()
+
+
+class Manifest:
+    """
+    Append-only record of the files a batch run has processed.
+
+    Every processed file adds one JSON line with its input hash, the hash of
+    the settings, the output path and the status; the last line of a file
+    wins. Lines are written as soon as a file is done, so after a crash the
+    next run knows exactly which files are finished. A line cut off by a
+    crash is ignored.
+    """
+
+    def __init__(self, path: Path):
+        """
+        Open (or create) a manifest.
+
+        Args:
+            path: Path of the manifest file
+        """
+        self.path = Path(path)
+        self.records: Dict[str, Dict[str, Any]] = {}
+        self._lines = 0
+
+        if self.path.exists():
+            with open(self.path, encoding='utf-8') as f:
+                for line in f:
+                    try:
+                        record = json.loads(line)
+                        self.records[record["input"]] = record
+                        self._lines += 1
+                    except (ValueError, KeyError, TypeError):
+                        logger.warning(f"Skipping invalid manifest line in {self.path}")
+
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._file = open(self.path, 'a', encoding='utf-8')
+
+    def is_current(self, key: str, input_hash: str, settings_hash: str) -> bool:
+        """
+        Check whether a file was processed successfully with the same content and settings.
+
+        Args:
+            key: Path of the input file relative to the input directory
+            input_hash: Hash of the current content
+            settings_hash: Hash of the current settings
+        """
+        record = self.records.get(key)
+        return (
+            record is not None
+            and record["status"] == DONE
+            and record["input_hash"] == input_hash
+            and record["config_hash"] == settings_hash
+            and (record.get("output") is None or Path(record["output"]).exists())
+        )
+
+    def record(
+        self,
+        key: str,
+        input_hash: str,
+        settings_hash: str,
+        output: Optional[Path] = None,
+        error: Optional[str] = None
+    ) -> None:
+        """
+        Record the outcome of a file.
+
+        Args:
+            key: Path of the input file relative to the input directory
+            input_hash: Hash of the processed content
+            settings_hash: Hash of the settings used
+            output: Path of the output file, if any
+            error: Error message if processing failed
+        """
+        record = {
+            "input": key,
+            "input_hash": input_hash,
+            "config_hash": settings_hash,
+            "output": str(output) if output is not None else None,
+            "status": FAILED if error is not None else DONE,
+            "error": error,
+            "processed_at": time.time()
+        }
+        self.records[key] = record
+        self._file.write(json.dumps(record, ensure_ascii=False) + "\n")
+        self._file.flush()
+        self._lines += 1
+
+    def close(self) -> None:
+        """Close the manifest, rewriting it without superseded lines when worthwhile."""
+        self._file.close()
+        if self._lines > 2 * len(self.records):
+            temp_path = self.path.with_suffix(".tmp")
+            with open(temp_path, 'w', encoding='utf-8') as f:
+                for record in self.records.values():
+                    f.write(json.dumps(record, ensure_ascii=False) + "\n")
+            os.replace(temp_path, self.path)
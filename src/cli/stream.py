@@ -0,0 +1,105 @@
+"""Streaming NDJSON processing of stdin, for use in Unix pipelines."""
+import json
+import os
+from typing import Any, BinaryIO, Callable, Dict, Iterator, List, TextIO
+
+from ..core.batching import Batcher, Record, payloads, result_lines
+
+# Aantal records dat samen door de analyzer gaat
+STREAM_BATCH_SIZE = int(os.environ.get('STREAM_BATCH_SIZE', 32))
+
+
+def parse_record(index: int, line: bytes, plain: bool = False) -> Record:
+    """
+    Parse one input line.
+
+    Args:
+        index: Zero-based line number
+        line: Raw line without the trailing newline
+        plain: Treat the line as text instead of a JSON object
+
+    Returns:
+        (index, id, text, error); text is None for an invalid line
+    """
+    try:
+        if plain:
+            return index, None, line.decode('utf-8').rstrip("\r"), None
+        data = json.loads(line)
+    except UnicodeDecodeError as e:
+        return index, None, None, f"Ongeldige UTF-8: {str(e)}"
+    except json.JSONDecodeError as e:
+        return index, None, None, f"Ongeldige JSON: {str(e)}"
+
+    if not isinstance(data, dict):
+        return index, None, None, "Regel moet een JSON object zijn"
+    record_id = str(data["id"]) if data.get("id") is not None else None
+    if not isinstance(data.get("text"), str):
+        return index, record_id, None, "Veld 'text' ontbreekt of is geen string"
+    return index, record_id, data["text"], None
+
+
+def read_records(source: BinaryIO, plain: bool = False) -> Iterator[Record]:
+    """
+    Yield the records of a stream one line at a time.
+
+    Empty lines are skipped but still count for the index, so the index of
+    an output line always matches the line number of its input.
+    """
+    for index, line in enumerate(source):
+        line = line.rstrip(b"\n")
+        if line.strip():
+            yield parse_record(index, line, plain)
+
+
+def stream_records(
+    source: BinaryIO,
+    sink: TextIO,
+    handler: Callable[[List[str]], List[Dict[str, Any]]],
+    batch_size: int = STREAM_BATCH_SIZE,
+    plain: bool = False
+) -> Dict[str, int]:
+    """
+    Process a stream of records in batches and write one NDJSON line per record.
+
+    Only one batch is held in memory at a time and its results are written
+    and flushed before the next batch is read, so arbitrarily large inputs
+    can be piped through with constant memory. Output lines are in input
+    order and carry the "index" of their input line (and the "id" if one was
+    given). Invalid lines and failed batches produce lines with an "error"
+    field; the stream goes on.
+
+    Args:
+        source: Binary input stream with one {"text": ..., "id": ...} object
+            per line, or one text per line with plain=True
+        sink: Text stream the NDJSON results are written to
+        handler: Function that processes a list of texts and returns one
+            result dict per text
+        batch_size: Number of records per handler call
+        plain: Read every line as a text instead of a JSON object
+
+    Returns:
+        Number of records written and the number of those with an error
+    """
+    summary = {"records": 0, "failed": 0}
+
+    def flush(batch: List[Record]) -> None:
+        texts = payloads(batch)
+        try:
+            results = handler(texts) if texts else []
+            batch_error = None
+        except Exception as e:
+            results, batch_error = [], str(e)
+
+        for line in result_lines(batch, results, batch_error):
+            summary["records"] += 1
+            summary["failed"] += "error" in line
+            sink.write(json.dumps(line, ensure_ascii=False) + "\n")
+        sink.flush()
+
+    batcher = Batcher(batch_size)
+    for record in read_records(source, plain):
+        batch = batcher.add(record)
+        if batch is not None:
+            flush(batch)
+    flush(batcher.take())
+    return summary
@@ -1,5 +1,6 @@
 """Main analyzer module."""
-from typing import List, Optional
+from itertools import islice
+from typing import Iterable, Iterator, List, Optional
 
 from presidio_analyzer import (
     AnalyzerEngine,
@@ -7,8 +8,20 @@ from presidio_analyzer import (
 )
 from presidio_analyzer.nlp_engine import NlpEngineProvider
 
+from .instrumentation import DOCUMENT_CHARS, model_load, stage
+from .recognizers.patterns import DutchEmailRecognizer, DutchIBANRecognizer, DutchPhoneNumberRecognizer
 from .recognizers.robbert import RobBERTRecognizer
 
+DEFAULT_ENTITIES = [
+    "PERSON",
+    "LOCATION",
+    "PHONE_NUMBER",
+    "EMAIL",
+    "ORGANIZATION",
+    "IBAN",
+    "ADDRESS"
+]
+
 class DutchTextAnalyzer:
     """Main analyzer class for Dutch text analysis."""
 
@@ -24,16 +37,22 @@ class DutchTextAnalyzer:
         
         # Create NLP engine
         provider = NlpEngineProvider(nlp_configuration=configuration)
-        nlp_engine = provider.create_engine()
+        with model_load("spacy"):
+            nlp_engine = provider.create_engine()
 
         # Create registry and initialize analyzer
         registry = RecognizerRegistry()
         registry.supported_languages = ["nl"]
         
         # Add RobBERT recognizer for enhanced NER
-        robbert_recognizer = RobBERTRecognizer()
-        robbert_recognizer.load()  # Explicitly load the model
-        registry.add_recognizer(robbert_recognizer)
+        self.robbert = RobBERTRecognizer()
+        self.robbert.load()  # Explicitly load the model
+        registry.add_recognizer(self.robbert)
+        
+        # Patronen voor telefoonnummers, IBANs en e-mail; getimed als stap "patterns"
+        registry.add_recognizer(DutchPhoneNumberRecognizer())
+        registry.add_recognizer(DutchIBANRecognizer())
+        registry.add_recognizer(DutchEmailRecognizer())
 
         # Initialize analyzer with Dutch support
         self.analyzer = AnalyzerEngine(
@@ -59,23 +78,83 @@ class DutchTextAnalyzer:
             List of detected entities
         """
         if entities is None:
-            entities = [
-                "PERSON",
-                "LOCATION",
-                "PHONE_NUMBER",
-                "EMAIL",
-                "ORGANIZATION",
-                "IBAN",
-                "ADDRESS"
-            ]
+            entities = DEFAULT_ENTITIES
         
-        # Analyze text with Presidio (using SpaCy and RoBERTa)
-        results = self.analyzer.analyze(
-            text=text,
-            entities=entities,
-            language="nl"
-        )
+        DOCUMENT_CHARS.observe(len(text))
+        
+        # SpaCy apart aanroepen zodat de tijd per stap te meten is
+        with stage("spacy"):
+            nlp_artifacts = self.analyzer.nlp_engine.process_text(text, "nl")
+        
+        # Analyze text with Presidio; RobBERT ("robbert", "robbert_spacy") en de
+        # patronen ("patterns") hebben elk een eigen stap binnen "recognizers"
+        with stage("recognizers"):
+            results = self.analyzer.analyze(
+                text=text,
+                entities=entities,
+                language="nl",
+                nlp_artifacts=nlp_artifacts
+            )
+        
+        with stage("filter"):
+            return self._filter_results(text, results)
+
+    def analyze_batch(
+        self,
+        texts: Iterable[str],
+        entities: Optional[List[str]] = None,
+        batch_size: int = 32
+    ) -> Iterator[List]:
+        """
+        Analyze many texts, running the models on batches instead of single texts.
+        
+        SpaCy processes each batch with nlp.pipe and RobBERT gets the whole
+        batch in one pipeline call; the recognizers then reuse those results.
         
+        Args:
+            texts: Texts to analyze
+            entities: Optional list of entities to detect
+            batch_size: Number of texts per model call
+            
+        Yields:
+            Detected entities per text, in input order (same as analyze_text)
+        """
+        if entities is None:
+            entities = DEFAULT_ENTITIES
+        
+        texts = iter(texts)
+        while True:
+            batch = list(islice(texts, batch_size))
+            if not batch:
+                break
+            
+            for text in batch:
+                DOCUMENT_CHARS.observe(len(text))
+            
+            self.robbert.prefetch(batch, batch_size=batch_size)
+            try:
+                with stage("spacy"):
+                    artifacts = list(self.analyzer.nlp_engine.process_batch(
+                        batch,
+                        language="nl",
+                        batch_size=batch_size
+                    ))
+                for text, nlp_artifacts in artifacts:
+                    with stage("recognizers"):
+                        results = self.analyzer.analyze(
+                            text=text,
+                            entities=entities,
+                            language="nl",
+                            nlp_artifacts=nlp_artifacts
+                        )
+                    with stage("filter"):
+                        results = self._filter_results(text, results)
+                    yield results
+            finally:
+                self.robbert.clear_prefetched()
+
+    def _filter_results(self, text: str, results: List) -> List:
+        """Remove false positives and overlaps, and normalise entity types."""
         # Filter out false positives and fix entity types
         filtered_results = []
         used_ranges = []
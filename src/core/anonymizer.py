@@ -4,6 +4,8 @@ from presidio_analyzer import RecognizerResult
 from presidio_anonymizer import AnonymizerEngine
 from presidio_anonymizer.entities import OperatorConfig
 
+from .instrumentation import stage
+
 class DutchTextAnonymizer:
     """Anonymizer for Dutch text using Presidio."""
     
@@ -70,11 +72,12 @@ class DutchTextAnonymizer:
                 used_ranges.append((result.start, result.end))
         
         # Anonymize text
-        anonymized_result = self.anonymizer.anonymize(
-            text=text,
-            analyzer_results=filtered_results,
-            operators=operators
-        )
+        with stage("anonymize"):
+            anonymized_result = self.anonymizer.anonymize(
+                text=text,
+                analyzer_results=filtered_results,
+                operators=operators
+            )
         
         return anonymized_result.text 
         return anonymized_result.text 
\ No newline at end of file
@@ -0,0 +1,77 @@
+"""Batching of streamed records, shared by the NDJSON batch endpoints and the CLI."""
+from typing import Any, Dict, Iterator, List, Optional, Sequence, Tuple
+
+# (index, id, payload, fout); payload is None bij een ongeldige regel. De index is
+# het nulgebaseerde regelnummer in de invoer: lege regels krijgen geen output maar
+# tellen wel mee, in de API en in de CLI
+Record = Tuple[int, Optional[str], Optional[Any], Optional[str]]
+
+
+class Batcher:
+    """
+    Collect records into batches of a fixed number of valid payloads.
+
+    Invalid records (payload None) travel along in the batch so their error
+    line keeps its place in the output, but they do not count towards the
+    batch size.
+    """
+
+    def __init__(self, batch_size: int):
+        """
+        Initialize the batcher.
+
+        Args:
+            batch_size: Number of valid payloads per batch
+        """
+        self.batch_size = batch_size
+        self._batch: List[Record] = []
+        self._pending = 0
+
+    def add(self, record: Record) -> Optional[List[Record]]:
+        """Add a record; return the batch once it holds batch_size valid payloads."""
+        self._batch.append(record)
+        self._pending += record[2] is not None
+        if self._pending >= self.batch_size:
+            return self.take()
+        return None
+
+    def take(self) -> List[Record]:
+        """Return the records collected so far and start a new batch."""
+        batch, self._batch, self._pending = self._batch, [], 0
+        return batch
+
+
+def payloads(batch: List[Record]) -> List[Any]:
+    """Return the valid payloads of a batch, in order."""
+    return [payload for _, _, payload, _ in batch if payload is not None]
+
+
+def result_lines(
+    batch: List[Record],
+    results: Sequence[Dict[str, Any]],
+    batch_error: Optional[str] = None
+) -> Iterator[Dict[str, Any]]:
+    """
+    Yield one output line per record of a batch, in input order.
+
+    Args:
+        batch: Records of the batch
+        results: One result dict per valid payload, as returned by the handler
+        batch_error: Error message if the handler failed for the whole batch
+
+    Yields:
+        Dicts with the "index", the "id" if given, and either the result
+        fields or an "error"
+    """
+    results = iter(results)
+    for index, record_id, payload, error in batch:
+        line: Dict[str, Any] = {"index": index}
+        if record_id is not None:
+            line["id"] = record_id
+        if payload is None:
+            line["error"] = error
+        elif batch_error is not None:
+            line["error"] = batch_error
+        else:
+            line.update(next(results))
+        yield line
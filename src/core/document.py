@@ -1,29 +1,63 @@
 """Document processing module."""
 import os
 import logging
+import mmap
+from contextlib import contextmanager
 from pathlib import Path
-from typing import List, Optional, Dict
+from typing import Callable, Iterator, List, Optional, Dict, Union
 from io import BytesIO
 from PyPDF2 import PdfReader, PdfWriter
 from reportlab.pdfgen import canvas
 from reportlab.lib.pagesizes import letter
+import tempfile
 import time
 import re
 
 from .analyzer import DutchTextAnalyzer
 from .anonymizer import DutchTextAnonymizer
+from .instrumentation import DOCUMENT_PAGES, stage
 from .ocr import OCRProcessor
+from .redaction import find_redaction_boxes, render_redacted_pdf
 
 # Set up logging
 logger = logging.getLogger(__name__)
 
-def extract_text_from_pdf(pdf_path: str, ocr_processor: Optional[OCRProcessor] = None) -> str:
+@contextmanager
+def open_pdf(pdf_path: Union[str, Path]) -> Iterator[PdfReader]:
+    """
+    Open a PDF for reading through a read-only memory map.
+    
+    PdfReader copies a file it opens by path into memory; with a memory map
+    the pages are read straight from the page cache, so large scans are not
+    duplicated in the Python heap. The reader can only be used inside the
+    with block.
+    
+    Args:
+        pdf_path: Path to the PDF file
+        
+    Yields:
+        PdfReader on the mapped file
+    """
+    with open(pdf_path, 'rb') as f:
+        if os.fstat(f.fileno()).st_size == 0:
+            # Een leeg bestand kan niet gemapt worden; PdfReader geeft de juiste fout
+            yield PdfReader(f)
+            return
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+            yield PdfReader(mapped)
+
+def extract_text_from_pdf(
+    pdf_path: str,
+    ocr_processor: Optional[OCRProcessor] = None,
+    dpi: Optional[int] = None
+) -> str:
     """
     Extract text from a PDF file, with optional OCR support for scanned documents.
     
     Args:
         pdf_path: Path to the PDF file
         ocr_processor: Optional OCRProcessor instance for handling scanned PDFs
+        dpi: Optional rasterisation resolution for OCR
         
     Returns:
         Extracted text from the PDF
@@ -31,12 +65,12 @@ def extract_text_from_pdf(pdf_path: str, ocr_processor: Optional[OCRProcessor] =
     logger.debug(f"Extracting text from PDF: {pdf_path}")
     
     # First try normal text extraction
-    reader = PdfReader(pdf_path)
     text = ""
-    for page_num, page in enumerate(reader.pages):
-        page_text = page.extract_text() or ""
-        text += page_text
-        logger.debug(f"Page {page_num + 1} extracted text: {page_text[:100]}...")
+    with open_pdf(pdf_path) as reader:
+        for page_num, page in enumerate(reader.pages):
+            page_text = page.extract_text() or ""
+            text += page_text
+            logger.debug(f"Page {page_num + 1} extracted text: {page_text[:100]}...")
     
     logger.debug(f"Extracted {len(text.split())} words using normal extraction")
     logger.debug(f"Full extracted text: {text[:500]}...")
@@ -45,7 +79,7 @@ def extract_text_from_pdf(pdf_path: str, ocr_processor: Optional[OCRProcessor] =
     if not text.strip() and ocr_processor is not None:
         try:
             logger.debug("No text found, attempting OCR...")
-            text = ocr_processor.process_pdf(pdf_path)
+            text = ocr_processor.process_pdf(pdf_path, dpi=dpi)
             logger.debug(f"OCR extracted {len(text.split())} words")
             logger.debug(f"OCR extracted text: {text[:500]}...")
         except Exception as e:
@@ -55,35 +89,74 @@ def extract_text_from_pdf(pdf_path: str, ocr_processor: Optional[OCRProcessor] =
     
     return text
 
+# Output van process_pdf: "auto" behoudt de pagina's van scans en zwart alleen
+# de entiteiten; "text" schrijft altijd een nieuwe PDF met geanonimiseerde tekst
+OUTPUT_AUTO = "auto"
+OUTPUT_TEXT = "text"
+OUTPUT_MODES = (OUTPUT_AUTO, OUTPUT_TEXT)
+
 class DocumentProcessor:
-    """Process documents for anonymization."""
+    """
+    Process documents for anonymization.
+    
+    The instance only holds the shared analyzer and anonymizer models; all
+    per-document options are arguments of process_pdf, so one processor can
+    be used by many threads at the same time.
+    """
     
-    def __init__(self):
-        """Initialize the document processor."""
-        self.analyzer = DutchTextAnalyzer()
-        self.anonymizer = DutchTextAnonymizer()
-        self.ocr_processor = None
+    def __init__(
+        self,
+        analyzer: Optional[DutchTextAnalyzer] = None,
+        anonymizer: Optional[DutchTextAnonymizer] = None
+    ):
+        """
+        Initialize the document processor.
+        
+        Args:
+            analyzer: Optional analyzer to share (created when omitted)
+            anonymizer: Optional anonymizer to share (created when omitted)
+        """
+        self.analyzer = analyzer or DutchTextAnalyzer()
+        self.anonymizer = anonymizer or DutchTextAnonymizer()
     
     def process_pdf(
         self,
         input_path: Path,
         output_path: Optional[Path] = None,
         entities: Optional[List[str]] = None,
-        keep_layout: bool = True
+        keep_layout: bool = True,
+        progress_callback: Optional[Callable[[int, int], None]] = None,
+        ocr_processor: Optional[OCRProcessor] = None,
+        dpi: Optional[int] = None,
+        output_mode: str = OUTPUT_AUTO,
+        detect_orientation: Optional[bool] = None
     ) -> Dict:
         """
         Process a PDF file, analyze and anonymize its content.
-        Simple version: just creates a new PDF with anonymized text.
+        For PDFs with a text layer a new PDF with anonymized text is created;
+        scanned PDFs (OCR) keep their page images with entities blacked out.
         
         Args:
             input_path: Path to input PDF
             output_path: Optional path for output PDF
             entities: Optional list of entities to detect
             keep_layout: Ignored in this simple version
+            progress_callback: Optional function called with (pages done,
+                pages total) while pages are extracted or OCR'd
+            ocr_processor: Optional OCRProcessor used for PDFs without a text
+                layer; without it scanned PDFs yield no text
+            dpi: Optional OCR rasterisation resolution for this document
+            output_mode: "auto" (redact scanned pages in place) or "text"
+                (always write a new PDF with the anonymized text)
+            detect_orientation: Optional override of the OCR orientation
+                detection, e.g. False for documents known to be upright
             
         Returns:
             Dict with statistics about found entities
         """
+        if output_mode not in OUTPUT_MODES:
+            raise ValueError(f"Onbekende output modus: {output_mode}")
+        
         logger.debug(f"Starting PDF processing: {input_path}")
         
         if not input_path.exists():
@@ -97,73 +170,107 @@ class DocumentProcessor:
         
         logger.debug(f"Output will be written to: {output_path}")
         
-        # Extract text from PDF
-        reader = PdfReader(str(input_path))
-        text = ""
-        for page in reader.pages:
-            text += (page.extract_text() or "") + "\n\n"
-        
-        if not text.strip():
-            logger.warning("No text found in document")
-            return {
-                "total_entities": 0,
-                "entities_by_type": {},
-                "input_file": str(input_path),
-                "output_file": str(output_path),
-                "error": "Geen tekst gevonden"
-            }
-        
-        # Analyze and anonymize text
-        results = self.analyzer.analyze_text(text, entities)
-        anonymized_text = self.anonymizer.anonymize_text(text, results) if results else text
-        
-        try:
-            # Create a new PDF with anonymized content
-            packet = BytesIO()
-            can = canvas.Canvas(packet, pagesize=letter)
-            can.setFont("Helvetica", 11)
-            
-            # Write text
-            y = 750  # Start near top
-            for line in anonymized_text.split('\n'):
-                if line.strip():
-                    can.drawString(50, y, line.strip())
-                    y -= 12
-                    if y < 50:  # Start new page when near bottom
-                        can.showPage()
-                        y = 750
+        # Pagina-afbeeldingen van gescande PDFs blijven bewaard tot de redactie klaar is
+        with tempfile.TemporaryDirectory(prefix="ocr_pages_") as page_dir:
+            # Extract text from PDF
+            text = ""
+            with stage("pdf_extract"), open_pdf(input_path) as reader:
+                DOCUMENT_PAGES.observe(len(reader.pages))
+                for page_num, page in enumerate(reader.pages, start=1):
+                    text += (page.extract_text() or "") + "\n\n"
+                    if progress_callback:
+                        progress_callback(page_num, len(reader.pages))
             
-            can.save()
-            packet.seek(0)
+            # Gescande PDF: geen tekstlaag, val terug op OCR indien beschikbaar
+            ocr_result = None
+            if not text.strip() and ocr_processor is not None:
+                logger.debug("No text found, attempting OCR...")
+                ocr_result = ocr_processor.ocr_pdf(
+                    str(input_path),
+                    dpi=dpi,
+                    page_folder=page_dir,
+                    detect_orientation=detect_orientation,
+                    progress_callback=progress_callback
+                )
+                text = ocr_result["text"]
+                logger.debug(f"OCR stats: {ocr_result['stats']}")
+            ocr_stats = ocr_result["stats"] if ocr_result else None
             
-            # Save to output file
-            output_path.parent.mkdir(parents=True, exist_ok=True)
-            with open(output_path, 'wb') as output_file:
-                output_file.write(packet.getvalue())
+            if not text.strip():
+                logger.warning("No text found in document")
+                return {
+                    "total_entities": 0,
+                    "entities_by_type": {},
+                    "input_file": str(input_path),
+                    "output_file": str(output_path),
+                    "ocr": ocr_stats,
+                    "error": "Geen tekst gevonden"
+                }
             
-            # Return statistics
-            stats = {
-                "total_entities": len(results) if results else 0,
-                "entities_by_type": {},
-                "input_file": str(input_path),
-                "output_file": str(output_path)
-            }
+            # Analyze text
+            results = self.analyzer.analyze_text(text, entities)
             
-            if results:
-                for result in results:
-                    entity_type = result.entity_type
-                    if entity_type not in stats["entities_by_type"]:
-                        stats["entities_by_type"][entity_type] = []
-                    stats["entities_by_type"][entity_type].append({
-                        "text": text[result.start:result.end],
-                        "score": float(result.score)
-                    })
-            
-            return stats
-            
-        except Exception as e:
-            logger.error(f"Error creating PDF: {str(e)}", exc_info=True)
-            raise Exception(f"Error creating PDF: {str(e)}")
+            try:
+                if ocr_result is not None and output_mode == OUTPUT_AUTO:
+                    # Originele pagina's behouden en alleen de woorden van entiteiten zwart maken
+                    boxes = find_redaction_boxes(ocr_result["pages"], results)
+                    with stage("pdf_render"):
+                        ocr_stats["redacted_boxes"] = render_redacted_pdf(
+                            ocr_result["pages"], boxes, output_path
+                        )
+                else:
+                    anonymized_text = self.anonymizer.anonymize_text(text, results) if results else text
+                    with stage("pdf_render"):
+                        self._write_text_pdf(anonymized_text, output_path)
+                
+                # Return statistics
+                stats = {
+                    "total_entities": len(results) if results else 0,
+                    "entities_by_type": {},
+                    "input_file": str(input_path),
+                    "output_file": str(output_path),
+                    "ocr": ocr_stats
+                }
+                
+                if results:
+                    for result in results:
+                        entity_type = result.entity_type
+                        if entity_type not in stats["entities_by_type"]:
+                            stats["entities_by_type"][entity_type] = []
+                        stats["entities_by_type"][entity_type].append({
+                            "text": text[result.start:result.end],
+                            "score": float(result.score)
+                        })
+                
+                return stats
+                
+            except Exception as e:
+                logger.error(f"Error creating PDF: {str(e)}", exc_info=True)
+                raise Exception(f"Error creating PDF: {str(e)}")
+    
+    def _write_text_pdf(self, anonymized_text: str, output_path: Path) -> None:
+        """Write anonymized text to a new, plain PDF."""
+        packet = BytesIO()
+        can = canvas.Canvas(packet, pagesize=letter)
+        can.setFont("Helvetica", 11)
+        
+        # Write text
+        y = 750  # Start near top
+        for line in anonymized_text.split('\n'):
+            if line.strip():
+                can.drawString(50, y, line.strip())
+                y -= 12
+                if y < 50:  # Start new page when near bottom
+                    can.showPage()
+                    y = 750
+        
+        can.save()
+        packet.seek(0)
+        
+        # Save to output file
+        output_path.parent.mkdir(parents=True, exist_ok=True)
+        with open(output_path, 'wb') as output_file:
+            output_file.write(packet.getvalue())
     
     def _extract_text_segments(self, page):
         """Extract text segments and their positions from a PDF page."""
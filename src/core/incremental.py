@@ -0,0 +1,142 @@
+"""Incremental re-analysis of a document that is being edited."""
+import re
+from dataclasses import dataclass
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+from presidio_analyzer import RecognizerResult
+
+from .instrumentation import stage
+
+# Alinea's worden gescheiden door een of meer lege regels
+_PARAGRAPH_BREAK = re.compile(r"\n[ \t]*\n\s*")
+
+
+@dataclass
+class Paragraph:
+    """A paragraph of the document with its analysis results (offsets relative to the paragraph)."""
+    start: int
+    text: str
+    results: Optional[List[RecognizerResult]] = None
+
+
+def split_paragraphs(text: str) -> List[Tuple[int, str]]:
+    """
+    Split text into paragraphs at blank lines.
+
+    Args:
+        text: Document text
+
+    Returns:
+        (start offset, paragraph text) pairs; the separators are not part of a paragraph
+    """
+    paragraphs = []
+    start = 0
+    for match in _PARAGRAPH_BREAK.finditer(text):
+        if match.start() > start:
+            paragraphs.append((start, text[start:match.start()]))
+        start = match.end()
+    if start < len(text):
+        paragraphs.append((start, text[start:]))
+    return paragraphs
+
+
+class IncrementalDocument:
+    """
+    Document state for an editing session, analyzed per paragraph.
+
+    After an edit only paragraphs whose text changed are analyzed again;
+    the results of unchanged paragraphs are reused with their offsets
+    shifted to the new position in the document. Entities are detected per
+    paragraph, so an entity spanning a blank line is not found.
+    """
+
+    def __init__(self, analyzer, entities: Optional[List[str]] = None, batch_size: int = 32):
+        """
+        Initialize an empty document.
+
+        Args:
+            analyzer: DutchTextAnalyzer (or anything with analyze_batch)
+            entities: Optional list of entities to detect
+            batch_size: Number of changed paragraphs per model call
+        """
+        self.analyzer = analyzer
+        self.entities = entities
+        self.batch_size = batch_size
+        self.text = ""
+        self.version = 0
+        self.paragraphs: List[Paragraph] = []
+
+    def set_text(self, text: str) -> int:
+        """
+        Replace the whole document.
+
+        Returns:
+            Number of paragraphs that were analyzed
+        """
+        return self._commit(text)
+
+    def apply_edits(self, edits: Iterable[Dict[str, Any]]) -> int:
+        """
+        Apply edits and re-analyze the paragraphs they changed.
+
+        Every edit replaces text[start:end] with its "text"; edits are
+        applied in order, each in the coordinates of the document after the
+        previous edit.
+
+        Args:
+            edits: Dicts with "start", "end" and "text"
+
+        Returns:
+            Number of paragraphs that were analyzed
+
+        Raises:
+            ValueError: If an edit lies outside the document
+
+        If an edit is invalid or the analysis fails, the document (text,
+        paragraphs and version) is left unchanged, so the edits can be sent again.
+        """
+        text = self.text
+        for edit in edits:
+            start, end, replacement = edit.get("start"), edit.get("end"), edit.get("text", "")
+            if not (isinstance(start, int) and isinstance(end, int) and 0 <= start <= end <= len(text)):
+                raise ValueError(f"Ongeldige wijziging: {start}-{end} valt buiten het document")
+            if not isinstance(replacement, str):
+                raise ValueError("Tekst van een wijziging moet een string zijn")
+            text = text[:start] + replacement + text[end:]
+        return self._commit(text)
+
+    def _commit(self, text: str) -> int:
+        # Eerst analyseren; tekst, alinea's en versie pas samen aanpassen als dat gelukt is
+        paragraphs, analyzed = self._reanalyze(text)
+        self.text = text
+        self.paragraphs = paragraphs
+        self.version += 1
+        return analyzed
+
+    def _reanalyze(self, text: str) -> Tuple[List[Paragraph], int]:
+        # Resultaten van ongewijzigde alinea's hergebruiken, ongeacht hun nieuwe positie
+        known = {paragraph.text: paragraph.results for paragraph in self.paragraphs}
+
+        with stage("incremental_split"):
+            paragraphs = [Paragraph(start, part, known.get(part)) for start, part in split_paragraphs(text)]
+        changed = [paragraph for paragraph in paragraphs if paragraph.results is None]
+
+        # Dezelfde nieuwe tekst hoeft maar één keer geanalyseerd te worden
+        unique = list(dict.fromkeys(paragraph.text for paragraph in changed))
+        analyzed = dict(zip(unique, self.analyzer.analyze_batch(unique, self.entities, batch_size=self.batch_size)))
+        for paragraph in changed:
+            paragraph.results = analyzed[paragraph.text]
+        return paragraphs, len(unique)
+
+    def results(self) -> List[RecognizerResult]:
+        """Return the entities of the whole document with absolute offsets."""
+        return [
+            RecognizerResult(
+                entity_type=result.entity_type,
+                start=paragraph.start + result.start,
+                end=paragraph.start + result.end,
+                score=result.score
+            )
+            for paragraph in self.paragraphs
+            for result in paragraph.results
+        ]
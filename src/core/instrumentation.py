@@ -0,0 +1,257 @@
+"""Prometheus metrics and opt-in per-request profiling of the processing stages."""
+import base64
+import cProfile
+import io
+import marshal
+import pstats
+import threading
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Any, Dict, Iterator, List, Optional
+
+from prometheus_client import Gauge, Histogram
+
+from .memory import RSSSampler, current_rss, record_model_memory
+
+# Seconden; van een korte regex stap tot OCR van een groot document
+STAGE_BUCKETS = (0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0)
+
+STAGE_SECONDS = Histogram(
+    "presidio_stage_seconds",
+    "Time spent per processing stage",
+    ["stage"],
+    buckets=STAGE_BUCKETS
+)
+
+MODEL_LOAD_SECONDS = Gauge(
+    "presidio_model_load_seconds",
+    "Time it took to load a model",
+    ["model"]
+)
+
+MODEL_MEMORY_BYTES = Gauge(
+    "presidio_model_memory_bytes",
+    "Growth of resident memory while loading a model, summed over repeated loads",
+    ["model"]
+)
+
+PDF_PEAK_MEMORY_BYTES = Histogram(
+    "presidio_pdf_peak_memory_bytes",
+    "Peak memory growth while processing a PDF, as resident memory or traced Python allocations",
+    ["measure"],
+    buckets=(1e6, 4e6, 16e6, 64e6, 128e6, 256e6, 512e6, 1e9, 2e9, 4e9)
+)
+
+DOCUMENT_CHARS = Histogram(
+    "presidio_document_chars",
+    "Size of analyzed texts in characters",
+    buckets=(100, 1_000, 10_000, 100_000, 1_000_000, 10_000_000)
+)
+
+DOCUMENT_PAGES = Histogram(
+    "presidio_document_pages",
+    "Number of pages of processed PDFs",
+    buckets=(1, 2, 5, 10, 25, 50, 100, 250, 500)
+)
+
+
+class StageProfile:
+    """
+    Timing tree of the stages run while profiling is active.
+
+    Stages nest as they are entered; repeated stages under the same parent
+    (e.g. one "recognizers" stage per document of a batch) are merged into a
+    single node with a call count.
+
+    With a running RSSSampler every stage also gets "peak_rss_bytes": the
+    highest growth of the resident memory above its value when the stage
+    was entered (the maximum over its calls). A nested stage's peak counts
+    for its parents too.
+    """
+
+    def __init__(self, sampler: Optional[RSSSampler] = None):
+        """
+        Start a new, empty profile.
+
+        Args:
+            sampler: Optional running RSSSampler to record the peak memory per stage
+        """
+        self._start = time.perf_counter()
+        self.root: Dict[str, Any] = {"stage": "total", "seconds": 0.0, "calls": 1, "stages": []}
+        self._stack: List[Dict[str, Any]] = [self.root]
+        self._sampler = sampler
+        # [RSS bij binnenkomst, piek RSS] per open stage
+        self._rss: List[List[int]] = []
+
+    def _child(self, name: str) -> Dict[str, Any]:
+        parent = self._stack[-1]
+        for node in parent["stages"]:
+            if node["stage"] == name:
+                return node
+        node = {"stage": name, "seconds": 0.0, "calls": 0, "stages": []}
+        parent["stages"].append(node)
+        return node
+
+    def enter(self, name: str) -> Dict[str, Any]:
+        """Open a stage below the current one and return its node."""
+        node = self._child(name)
+        self._stack.append(node)
+        if self._sampler is not None:
+            rss = self._fold_window()
+            self._rss.append([rss, rss])
+        return node
+
+    def exit(self, node: Dict[str, Any], seconds: float) -> None:
+        """Close a stage opened with enter."""
+        node["seconds"] += seconds
+        node["calls"] += 1
+        if self._stack[-1] is node:
+            self._stack.pop()
+            if self._sampler is not None:
+                self._fold_window()
+                start, peak = self._rss.pop()
+                node["peak_rss_bytes"] = max(node.get("peak_rss_bytes", 0), peak - start)
+
+    def _fold_window(self) -> int:
+        """Credit the peak since the last stage boundary to all open stages; return the current RSS."""
+        peak, rss = self._sampler.take_window()
+        for frame in self._rss:
+            frame[1] = max(frame[1], peak)
+        return rss
+
+    def add(self, name: str, seconds: float) -> None:
+        """Add a stage that was timed elsewhere below the current stage."""
+        node = self._child(name)
+        node["seconds"] += seconds
+        node["calls"] += 1
+
+    def tree(self) -> Dict[str, Any]:
+        """Return the timing tree, with durations rounded to microseconds."""
+        self.root["seconds"] = time.perf_counter() - self._start
+
+        def rounded(node):
+            return dict(
+                node,
+                seconds=round(node["seconds"], 6),
+                stages=[rounded(child) for child in node["stages"]]
+            )
+
+        return rounded(self.root)
+
+
+# Actief profiel van de huidige request; None (de normale situatie) kost alleen een lookup
+_active_profile: ContextVar[Optional[StageProfile]] = ContextVar("presidio_stage_profile", default=None)
+
+
+def observe(name: str, seconds: float) -> None:
+    """Record the duration of a stage that was timed elsewhere (e.g. in an OCR worker)."""
+    STAGE_SECONDS.labels(name).observe(seconds)
+    profile = _active_profile.get()
+    if profile is not None:
+        profile.add(name, seconds)
+
+
+@contextmanager
+def stage(name: str) -> Iterator[None]:
+    """
+    Time a block as a processing stage.
+
+    Args:
+        name: Stage name, used as the "stage" label
+    """
+    profile = _active_profile.get()
+    node = profile.enter(name) if profile is not None else None
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        seconds = time.perf_counter() - start
+        STAGE_SECONDS.labels(name).observe(seconds)
+        if node is not None:
+            profile.exit(node, seconds)
+
+
+@contextmanager
+def profile_stages(sampler: Optional[RSSSampler] = None) -> Iterator[StageProfile]:
+    """
+    Collect a timing tree of all stages run in the block.
+
+    Only stages run in the current context are included; work in OCR worker
+    processes shows up through the durations they report back.
+
+    Args:
+        sampler: Optional running RSSSampler to record the peak memory per stage
+    """
+    profile = StageProfile(sampler)
+    token = _active_profile.set(profile)
+    try:
+        yield profile
+    finally:
+        _active_profile.reset(token)
+
+
+# cProfile kan per proces maar één sessie tegelijk draaien
+_cprofile_lock = threading.Lock()
+
+
+class ProfilerBusy(Exception):
+    """Another cProfile session is already running."""
+
+
+class CallProfile:
+    """Result of a cProfile session: a readable summary and the raw pstats data."""
+
+    def __init__(self):
+        """Create a profiler that has not been enabled yet."""
+        self.profiler = cProfile.Profile()
+
+    def summary(self, limit: int = 40) -> str:
+        """Return the top functions by cumulative time as text."""
+        output = io.StringIO()
+        stats = pstats.Stats(self.profiler, stream=output)
+        stats.sort_stats(pstats.SortKey.CUMULATIVE).print_stats(limit)
+        return output.getvalue()
+
+    def dump(self) -> str:
+        """
+        Return the raw statistics, base64 encoded.
+
+        Decoded and written to a file, the data loads with pstats.Stats or
+        tools such as snakeviz, just like the output of cProfile.Profile.dump_stats.
+        """
+        self.profiler.create_stats()
+        return base64.b64encode(marshal.dumps(self.profiler.stats)).decode('ascii')
+
+
+@contextmanager
+def profile_calls() -> Iterator[CallProfile]:
+    """
+    Run the block under cProfile.
+
+    Raises:
+        ProfilerBusy: If another session is running
+    """
+    if not _cprofile_lock.acquire(blocking=False):
+        raise ProfilerBusy()
+    profile = CallProfile()
+    try:
+        profile.profiler.enable()
+        try:
+            yield profile
+        finally:
+            profile.profiler.disable()
+    finally:
+        _cprofile_lock.release()
+
+
+@contextmanager
+def model_load(name: str) -> Iterator[None]:
+    """Time loading a model and record its time and memory under the "model" label."""
+    rss = current_rss()
+    start = time.perf_counter()
+    yield
+    MODEL_LOAD_SECONDS.labels(name).set(time.perf_counter() - start)
+    size = max(0, current_rss() - rss)
+    MODEL_MEMORY_BYTES.labels(name).inc(size)
+    record_model_memory(name, size)
@@ -0,0 +1,264 @@
+"""Memory accounting: resident memory, memory per loaded model and tracemalloc snapshot diffs."""
+import os
+import threading
+import tracemalloc
+from typing import Any, Dict, List, Optional, Tuple
+
+try:
+    import psutil
+except ImportError:  # Valt terug op /proc/self/statm
+    psutil = None
+
+try:
+    import resource
+except ImportError:  # Niet beschikbaar op Windows
+    resource = None
+
+# Seconden tussen RSS-metingen tijdens het verwerken van een PDF
+MEMORY_SAMPLE_INTERVAL = float(os.environ.get('MEMORY_SAMPLE_INTERVAL', 0.05))
+
+# Aantal stack frames per allocatie wanneer tracemalloc via de API gestart wordt
+TRACEMALLOC_FRAMES = int(os.environ.get('TRACEMALLOC_FRAMES', 1))
+
+MB = 1024 * 1024
+
+
+def current_rss() -> int:
+    """Return the resident memory of this process in bytes (0 if unknown)."""
+    if psutil is not None:
+        return psutil.Process().memory_info().rss
+    try:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError, AttributeError):
+        return 0
+
+
+def peak_rss() -> int:
+    """Return the highest resident memory of this process so far in bytes (0 if unknown)."""
+    if resource is None:
+        return 0
+    # ru_maxrss is in kilobytes op Linux
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * 1024
+
+
+class RSSSampler:
+    """Track the peak resident memory of this process while a block runs."""
+
+    def __init__(self, interval: float = 0.01):
+        """
+        Initialize the sampler.
+
+        Args:
+            interval: Seconds between samples
+        """
+        self.interval = interval
+        self.start = 0
+        self.peak = 0
+        # Piek sinds de laatste aanroep van take_window
+        self._window = 0
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._sample, name="rss-sampler", daemon=True)
+
+    def __enter__(self) -> "RSSSampler":
+        self.start = self.peak = self._window = current_rss()
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self._stop.set()
+        self._thread.join()
+        self.peak = max(self.peak, current_rss())
+
+    def take_window(self) -> Tuple[int, int]:
+        """
+        Close the current sampling window and start a new one.
+
+        Returns:
+            The peak resident memory since the previous call (or the start)
+            and the current resident memory, at which the new window starts
+        """
+        rss = current_rss()
+        peak, self._window = max(self._window, rss), rss
+        self.peak = max(self.peak, rss)
+        return peak, rss
+
+    def _sample(self) -> None:
+        while not self._stop.wait(self.interval):
+            rss = current_rss()
+            self.peak = max(self.peak, rss)
+            self._window = max(self._window, rss)
+
+
+class PeakMemory:
+    """
+    Peak memory used while a block runs, relative to its start.
+
+    The resident memory is sampled in a background thread, so short spikes
+    between samples are missed. When tracemalloc is tracing, the peak of
+    Python allocations is recorded as well; its peak is reset on entry, so
+    with overlapping blocks (other lanes, jobs) both figures are an upper
+    bound for a single block.
+    """
+
+    def __init__(self, interval: float = MEMORY_SAMPLE_INTERVAL):
+        """
+        Initialize the measurement.
+
+        Args:
+            interval: Seconds between RSS samples
+        """
+        self._sampler = RSSSampler(interval)
+        self._traced_start: Optional[int] = None
+        self.rss_bytes = 0
+        self.traced_bytes: Optional[int] = None
+
+    def __enter__(self) -> "PeakMemory":
+        if tracemalloc.is_tracing():
+            tracemalloc.reset_peak()
+            self._traced_start = tracemalloc.get_traced_memory()[0]
+        self._sampler.__enter__()
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self._sampler.__exit__(*exc_info)
+        self.rss_bytes = max(0, self._sampler.peak - self._sampler.start)
+        if self._traced_start is not None and tracemalloc.is_tracing():
+            self.traced_bytes = max(0, tracemalloc.get_traced_memory()[1] - self._traced_start)
+
+    def to_dict(self) -> Dict[str, Optional[int]]:
+        """Return the peaks in bytes; peak_traced_bytes is None without tracemalloc."""
+        return {"peak_rss_bytes": self.rss_bytes, "peak_traced_bytes": self.traced_bytes}
+
+
+# Groei van het RSS per model, in bytes, opgeteld over alle keren dat het geladen is
+_model_memory: Dict[str, int] = {}
+_model_loads: Dict[str, int] = {}
+
+
+def record_model_memory(name: str, size: int) -> None:
+    """Record the memory a model added while it was loaded; repeated loads add up."""
+    _model_memory[name] = _model_memory.get(name, 0) + size
+    _model_loads[name] = _model_loads.get(name, 0) + 1
+
+
+def memory_report() -> Dict[str, Any]:
+    """
+    Return the current and peak resident memory and the memory per loaded model.
+
+    The memory of a model is the growth of the resident memory while it was
+    loaded. Shared libraries and allocator arenas are counted for the first
+    model that needs them, so the figures are indicative per model but add
+    up to the memory the models take together. A model that is loaded more
+    than once is counted for every copy; "model_loads" shows how often.
+    """
+    return {
+        "rss_bytes": current_rss(),
+        "peak_rss_bytes": peak_rss(),
+        "models": dict(_model_memory),
+        "model_loads": dict(_model_loads),
+        "tracemalloc": tracemalloc.is_tracing(),
+    }
+
+
+def format_memory_report(report: Dict[str, Any]) -> str:
+    """Format a memory report as a single log line."""
+    loads = report.get("model_loads", {})
+    models = ", ".join(
+        f"{name} {size / MB:.0f} MB" + (f" ({loads[name]}x loaded)" if loads.get(name, 1) > 1 else "")
+        for name, size in report["models"].items()
+    )
+    return (
+        f"Memory: RSS {report['rss_bytes'] / MB:.0f} MB (peak {report['peak_rss_bytes'] / MB:.0f} MB); "
+        f"models: {models or 'none'}"
+    )
+
+
+class AllocationTracker:
+    """
+    Compare tracemalloc snapshots to find where memory grows.
+
+    Every call of snapshot() takes a new snapshot and returns the top
+    allocation sites by growth since the previous one. Tracing is started
+    by the first call unless it already runs (PYTHONTRACEMALLOC); it slows
+    down allocations, so stop it when done.
+    """
+
+    # Allocaties van tracemalloc zelf en van imports vertekenen de vergelijking
+    _EXCLUDE = (
+        tracemalloc.Filter(False, tracemalloc.__file__),
+        tracemalloc.Filter(False, "<frozen importlib._bootstrap>"),
+        tracemalloc.Filter(False, "<frozen importlib._bootstrap_external>"),
+        tracemalloc.Filter(False, "<unknown>"),
+    )
+
+    def __init__(self, frames: int = TRACEMALLOC_FRAMES):
+        """
+        Initialize the tracker.
+
+        Args:
+            frames: Stack frames stored per allocation when tracing is started here
+        """
+        self.frames = frames
+        self._lock = threading.Lock()
+        self._previous: Optional[tracemalloc.Snapshot] = None
+
+    def snapshot(self, limit: int = 20, group_by: str = "lineno") -> Dict[str, Any]:
+        """
+        Take a snapshot and compare it with the previous one.
+
+        Args:
+            limit: Number of allocation sites to return
+            group_by: "lineno", "filename" or "traceback"
+
+        Returns:
+            Status, traced memory, total growth and the top allocation sites by growth
+        """
+        with self._lock:
+            started = not tracemalloc.is_tracing()
+            if started:
+                tracemalloc.start(self.frames)
+                self._previous = None
+
+            current = tracemalloc.take_snapshot().filter_traces(self._EXCLUDE)
+            previous, self._previous = self._previous, current
+            traced, peak = tracemalloc.get_traced_memory()
+
+            result: Dict[str, Any] = {
+                "status": "started" if started else ("baseline" if previous is None else "diff"),
+                "traced_bytes": traced,
+                "peak_traced_bytes": peak,
+                "size_diff": 0,
+                "top": [],
+            }
+            if previous is None:
+                return result
+
+            stats = current.compare_to(previous, group_by)
+            result["size_diff"] = sum(stat.size_diff for stat in stats)
+            result["top"] = [self._stat(stat) for stat in stats[:limit]]
+            return result
+
+    def stop(self) -> bool:
+        """Stop tracing and forget the previous snapshot; return whether tracing was active."""
+        with self._lock:
+            self._previous = None
+            if not tracemalloc.is_tracing():
+                return False
+            tracemalloc.stop()
+            return True
+
+    @staticmethod
+    def _stat(stat: tracemalloc.StatisticDiff) -> Dict[str, Any]:
+        frames: List[str] = [f"{frame.filename}:{frame.lineno}" for frame in stat.traceback]
+        return {
+            "location": frames[-1] if frames else "?",
+            "traceback": frames,
+            "size_diff": stat.size_diff,
+            "size": stat.size,
+            "count_diff": stat.count_diff,
+            "count": stat.count,
+        }
+
+
+allocation_tracker = AllocationTracker()
@@ -1,60 +1,640 @@
 """OCR module for processing scanned PDFs."""
+import json
 import os
-from typing import Optional
+import tempfile
+import threading
+import time
+from collections import deque
+from contextlib import nullcontext
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, Tuple, Union
+import numpy as np
 import pytesseract
-from pdf2image import convert_from_path
+from pdf2image import convert_from_path, pdfinfo_from_path
 from PIL import Image
 
+from .instrumentation import observe
+from .ocr_backends import BACKENDS, OCR_LANG, get_backend
+from .ocr_cache import OCRCache
+
+OCR_DPI = int(os.environ.get('OCR_DPI', 200))
+OCR_BACKEND = os.environ.get('OCR_BACKEND', 'pytesseract')
+OCR_PREPROCESS = os.environ.get('OCR_PREPROCESS', 'true').lower() == 'true'
+OCR_TARGET_DPI = int(os.environ.get('OCR_TARGET_DPI', 200))
+OCR_DETECT_ORIENTATION = os.environ.get('OCR_DETECT_ORIENTATION', 'true').lower() == 'true'
+
+# Page segmentation: automatisch met oriëntatiedetectie (OSD), of zonder als de oriëntatie bekend is
+PSM_AUTO_OSD = 1
+PSM_AUTO = 3
+
+# Zoekbereik voor scheve scans (graden)
+MAX_SKEW_ANGLE = 5.0
+SKEW_ANGLE_STEP = 0.25
+
+
+def cpu_budget() -> int:
+    """
+    Determine how many CPUs this process is allowed to use.
+
+    Takes the CPU affinity mask and, inside a container, the cgroup CPU
+    quota into account, so a pod with a 1500m limit does not start a
+    worker per core of the node.
+
+    Returns:
+        Number of usable CPUs (at least 1)
+    """
+    try:
+        cpus = len(os.sched_getaffinity(0))
+    except AttributeError:
+        cpus = os.cpu_count() or 1
+
+    # cgroup v2 quota, e.g. "150000 100000" for a 1500m limit
+    try:
+        with open('/sys/fs/cgroup/cpu.max') as f:
+            quota, period = f.read().split()[:2]
+        if quota != 'max':
+            cpus = min(cpus, int(quota) // int(period))
+    except (OSError, ValueError):
+        pass
+
+    return max(1, cpus)
+
+
+def _init_worker(backend: str, tesseract_cmd: Optional[str]) -> None:
+    """Start the OCR engine once in a freshly started worker process."""
+    get_backend(backend, tesseract_cmd)
+
+
+def _ocr_image(image: Union[Image.Image, str], backend: str = OCR_BACKEND) -> str:
+    """
+    Run Tesseract on a single page (executed in a worker process).
+
+    Args:
+        image: PIL Image, or path to a page image rendered to disk
+        backend: Name of the OCR backend to use
+
+    Returns:
+        Extracted text of the page
+    """
+    if isinstance(image, str):
+        with Image.open(image) as page:
+            return _ocr_image(page, backend)
+
+    return get_backend(backend).image_to_string(image, psm=PSM_AUTO_OSD)
+
+
+def _normalise_resolution(image: Image.Image, source_dpi: int, target_dpi: int) -> Tuple[Image.Image, float]:
+    """
+    Downscale a page to the target resolution; pages are never upscaled.
+
+    Returns:
+        Tuple of the (possibly) resized image and the applied scale factor
+    """
+    if not source_dpi or source_dpi <= target_dpi:
+        return image, 1.0
+
+    scale = target_dpi / source_dpi
+    size = (max(1, round(image.width * scale)), max(1, round(image.height * scale)))
+    return image.resize(size, Image.BILINEAR), scale
+
+
+def _otsu_threshold(pixels: np.ndarray) -> int:
+    """Compute Otsu's threshold for a grayscale pixel array."""
+    histogram = np.bincount(pixels.ravel(), minlength=256).astype(np.float64)
+    levels = np.arange(256)
+
+    weight_background = np.cumsum(histogram)
+    weight_foreground = weight_background[-1] - weight_background
+    sum_background = np.cumsum(histogram * levels)
+    mean_background = sum_background / np.maximum(weight_background, 1)
+    mean_foreground = (sum_background[-1] - sum_background) / np.maximum(weight_foreground, 1)
+
+    between_class_variance = weight_background * weight_foreground * (mean_background - mean_foreground) ** 2
+    return int(np.argmax(between_class_variance))
+
+
+def _binarise(image: Image.Image) -> Image.Image:
+    """Binarise a grayscale page with Otsu's threshold (text black on white)."""
+    pixels = np.asarray(image, dtype=np.uint8)
+    threshold = _otsu_threshold(pixels)
+    return Image.fromarray(np.where(pixels > threshold, 255, 0).astype(np.uint8), mode='L')
+
+
+def _estimate_skew(image: Image.Image) -> float:
+    """
+    Estimate the skew angle of the text lines in degrees.
+
+    Uses the projection profile of the dark pixels: when the rows are
+    sheared by the right angle, text lines fall into few rows and the row
+    histogram has maximal variance. Searched on a downscaled copy.
+
+    Returns:
+        Angle (counter clockwise) that straightens the text lines
+    """
+    small = image.copy()
+    small.thumbnail((800, 800))
+    pixels = np.asarray(small, dtype=np.uint8)
+    ys, xs = np.nonzero(pixels < _otsu_threshold(pixels))
+    if len(ys) < 100:
+        return 0.0
+
+    best_angle, best_score = 0.0, -1.0
+    for angle in np.arange(-MAX_SKEW_ANGLE, MAX_SKEW_ANGLE + SKEW_ANGLE_STEP, SKEW_ANGLE_STEP):
+        rows = np.round(ys - xs * np.tan(np.radians(angle))).astype(np.int64)
+        profile = np.bincount(rows - rows.min())
+        score = float(np.var(profile))
+        if score > best_score:
+            best_angle, best_score = float(angle), score
+    return best_angle
+
+
+def preprocess_image(
+    image: Image.Image,
+    source_dpi: int,
+    target_dpi: int = OCR_TARGET_DPI,
+    deskew: bool = True,
+    binarise: bool = True
+) -> Tuple[Image.Image, Dict[str, Any], Dict[str, float]]:
+    """
+    Prepare a rasterised page for Tesseract: normalise resolution, deskew, binarise.
+
+    Smaller, straight, black-and-white pages are faster for Tesseract and
+    usually recognised better.
+
+    Args:
+        image: Rasterised page
+        source_dpi: Resolution at which the page was rasterised
+        target_dpi: Resolution the page is scaled down to
+        deskew: Straighten skewed scans
+        binarise: Convert the page to pure black and white
+
+    Returns:
+        Tuple of the processed image, the transform needed to map boxes back
+        to the original page (see _map_box) and timings per stage in seconds
+    """
+    timings = {}
+
+    start = time.time()
+    processed = image.convert('L')
+    processed, scale = _normalise_resolution(processed, source_dpi, target_dpi)
+    timings['resize'] = time.time() - start
+
+    angle = 0.0
+    size = processed.size
+    if deskew:
+        start = time.time()
+        angle = _estimate_skew(processed)
+        if abs(angle) >= SKEW_ANGLE_STEP:
+            processed = processed.rotate(angle, resample=Image.BILINEAR, expand=True, fillcolor=255)
+        else:
+            angle = 0.0
+        timings['deskew'] = time.time() - start
+
+    if binarise:
+        start = time.time()
+        processed = _binarise(processed)
+        timings['binarise'] = time.time() - start
+
+    transform = {'scale': scale, 'angle': angle, 'size': list(size), 'rotated_size': list(processed.size)}
+    return processed, transform, timings
+
+
+def _map_box(box: List[int], transform: Dict[str, Any]) -> List[int]:
+    """
+    Map a box on a preprocessed page back to the original page image.
+
+    Undoes the deskew rotation around the page centre and the downscaling,
+    and returns the axis-aligned box that covers the rotated corners.
+    """
+    left, top, width, height = box
+    angle = np.radians(transform['angle'])
+    cos, sin = np.cos(angle), np.sin(angle)
+    rotated_cx, rotated_cy = transform['rotated_size'][0] / 2, transform['rotated_size'][1] / 2
+    cx, cy = transform['size'][0] / 2, transform['size'][1] / 2
+
+    xs, ys = [], []
+    for x, y in ((left, top), (left + width, top), (left, top + height), (left + width, top + height)):
+        dx, dy = x - rotated_cx, y - rotated_cy
+        xs.append((dx * cos - dy * sin + cx) / transform['scale'])
+        ys.append((dx * sin + dy * cos + cy) / transform['scale'])
+
+    x0, y0 = int(np.floor(min(xs))), int(np.floor(min(ys)))
+    x1, y1 = int(np.ceil(max(xs))), int(np.ceil(max(ys)))
+    return [x0, y0, x1 - x0, y1 - y0]
+
+
+def _layout_words(words: List[Dict[str, Any]]) -> Dict[str, Any]:
+    """
+    Build the page text from OCR words, remembering where each word ended up.
+
+    Words on the same line are joined by a space, lines by a newline and
+    paragraphs by a blank line.
+
+    Args:
+        words: Words in reading order as returned by a backend's image_to_words
+
+    Returns:
+        Dict with the page "text" and "words", each word with its "start" and
+        "end" offset in the page text and its pixel "box"
+    """
+    parts = []
+    page_words = []
+    position = 0
+    previous = None
+
+    for word in words:
+        line = (word['block'], word['par'], word['line'])
+        if previous is not None:
+            if line == previous:
+                separator = ' '
+            elif line[:2] == previous[:2]:
+                separator = '\n'
+            else:
+                separator = '\n\n'
+            parts.append(separator)
+            position += len(separator)
+
+        parts.append(word['text'])
+        page_words.append({
+            'text': word['text'],
+            'start': position,
+            'end': position + len(word['text']),
+            'box': list(word['box'])
+        })
+        position += len(word['text'])
+        previous = line
+
+    return {'text': ''.join(parts), 'words': page_words}
+
+
+def _ocr_page(
+    page: Union[Image.Image, str],
+    options: Dict[str, Any],
+    cache: Optional[OCRCache] = None
+) -> Tuple[Dict[str, Any], bool, Dict[str, float]]:
+    """
+    OCR a single page, consulting the OCR cache first (executed in a worker process).
+
+    Text and word boxes come from one Tesseract pass, so the geometry needed
+    for redaction does not require a second OCR round. Boxes always refer to
+    the page as it was rasterised, also when the page was preprocessed.
+
+    Args:
+        page: PIL Image, or path to a page image rendered to disk
+        options: OCR options as built by OCRProcessor._options
+        cache: Optional OCR cache shared by all workers
+
+    Returns:
+        Tuple of the page layout (see _layout_words), whether it came from
+        the cache and the time spent per stage in seconds
+    """
+    if isinstance(page, str):
+        with Image.open(page) as image:
+            return _ocr_page(image, options, cache)
+
+    key = cache.key(page, options['settings']) if cache is not None else None
+    if key is not None:
+        cached = cache.get(key)
+        if cached is not None:
+            return json.loads(cached), True, {}
+
+    image, transform, timings = page, None, {}
+    if options['preprocess']:
+        image, transform, timings = preprocess_image(page, options['dpi'], options['target_dpi'])
+
+    start = time.time()
+    words = get_backend(options['backend']).image_to_words(image, psm=options['psm'])
+    timings['ocr'] = time.time() - start
+
+    if transform is not None:
+        for word in words:
+            word['box'] = _map_box(word['box'], transform)
+
+    result = _layout_words(words)
+    if key is not None:
+        cache.put(key, json.dumps(result))
+    return result, False, timings
+
+
+def _discard_page(page: Union[Image.Image, str]) -> None:
+    """Release a page once it has been OCR'd."""
+    if isinstance(page, str):
+        os.remove(page)
+    else:
+        page.close()
+
+
 class OCRProcessor:
     """Handles OCR processing for scanned PDFs."""
-    
-    def __init__(self, tesseract_cmd: Optional[str] = None, poppler_path: Optional[str] = None):
-        """Initialize OCR processor with optional paths to Tesseract and Poppler."""
+
+    def __init__(
+        self,
+        tesseract_cmd: Optional[str] = None,
+        poppler_path: Optional[str] = None,
+        max_workers: Optional[int] = None,
+        dpi: int = OCR_DPI,
+        batch_size: Optional[int] = None,
+        spool_to_disk: bool = False,
+        cache_dir: Optional[Union[str, Path]] = None,
+        backend: Optional[str] = None,
+        preprocess: bool = OCR_PREPROCESS,
+        target_dpi: int = OCR_TARGET_DPI,
+        detect_orientation: bool = OCR_DETECT_ORIENTATION
+    ):
+        """
+        Initialize OCR processor with optional paths to Tesseract and Poppler.
+
+        Args:
+            tesseract_cmd: Optional path to the tesseract executable
+            poppler_path: Optional path to the Poppler binaries
+            max_workers: Number of pages OCR'd in parallel. Defaults to the
+                OCR_WORKERS environment variable or the CPU budget.
+            dpi: Default rasterisation resolution
+            batch_size: Pages rasterised per Poppler call (default: max_workers)
+            spool_to_disk: Render pages to temporary files instead of memory
+            cache_dir: Optional directory for the OCR result cache. Defaults to
+                the OCR_CACHE_DIR environment variable; no caching when unset.
+            backend: OCR backend, "pytesseract" (a tesseract process per page)
+                or "tesserocr" (engines kept alive per worker). Defaults to the
+                OCR_BACKEND environment variable.
+            preprocess: Downscale, deskew and binarise pages before OCR
+            target_dpi: Resolution pages are downscaled to when preprocessing
+            detect_orientation: Let Tesseract detect the page orientation
+                (OSD). Disable when pages are known to be upright.
+        """
         if tesseract_cmd:
             pytesseract.pytesseract.tesseract_cmd = tesseract_cmd
-            
+
+        self.backend = backend or OCR_BACKEND
+        if self.backend not in BACKENDS:
+            raise ValueError(f"Onbekende OCR backend: {self.backend}")
+        if not BACKENDS[self.backend].is_available():
+            raise ImportError(f"OCR backend '{self.backend}' is niet geïnstalleerd")
+
+        self.tesseract_cmd = tesseract_cmd
         self.poppler_path = poppler_path
-        
-    def process_pdf(self, pdf_path: str) -> str:
+        self.max_workers = max_workers or int(os.environ.get('OCR_WORKERS', 0)) or cpu_budget()
+        self.dpi = dpi
+        self.batch_size = batch_size or self.max_workers
+        self.spool_to_disk = spool_to_disk
+        self.preprocess = preprocess
+        self.target_dpi = target_dpi
+        self.detect_orientation = detect_orientation
+
+        cache_dir = cache_dir or os.environ.get('OCR_CACHE_DIR')
+        self.cache = OCRCache(cache_dir) if cache_dir else None
+
+        # Worker pool wordt pas gestart bij het eerste document met meerdere pagina's
+        self._pool = None
+        self._pool_lock = threading.Lock()
+
+    def _get_pool(self) -> ProcessPoolExecutor:
+        """Return the shared OCR worker pool, starting it on first use."""
+        with self._pool_lock:
+            if self._pool is None:
+                self._pool = ProcessPoolExecutor(
+                    max_workers=self.max_workers,
+                    initializer=_init_worker,
+                    initargs=(self.backend, self.tesseract_cmd)
+                )
+            return self._pool
+
+    def close(self) -> None:
+        """Shut down the OCR worker pool."""
+        with self._pool_lock:
+            if self._pool is not None:
+                self._pool.shutdown()
+                self._pool = None
+
+    def page_count(self, pdf_path: str) -> int:
+        """Return the number of pages of a PDF file."""
+        return pdfinfo_from_path(pdf_path, poppler_path=self.poppler_path)["Pages"]
+
+    def iter_pages(
+        self,
+        pdf_path: str,
+        dpi: Optional[int] = None,
+        output_folder: Optional[str] = None
+    ) -> Iterator[Union[Image.Image, str]]:
         """
-        Process a PDF file using OCR.
-        
+        Rasterise a PDF lazily, one batch of pages at a time.
+
+        Only ``batch_size`` pages exist at any moment, so memory use does not
+        grow with the number of pages in the document.
+
         Args:
             pdf_path: Path to the PDF file
-            
-        Returns:
-            Extracted text from the PDF
+            dpi: Rasterisation resolution (default: self.dpi)
+            output_folder: Render pages to files in this folder and yield
+                their paths instead of PIL images
+
+        Yields:
+            Page images (or paths to page images) in document order
         """
-        try:
-            # Convert PDF to images
-            images = convert_from_path(
+        page_count = self.page_count(pdf_path)
+
+        for first_page in range(1, page_count + 1, self.batch_size):
+            last_page = min(first_page + self.batch_size - 1, page_count)
+            yield from convert_from_path(
                 pdf_path,
-                poppler_path=self.poppler_path
+                dpi=dpi or self.dpi,
+                poppler_path=self.poppler_path,
+                first_page=first_page,
+                last_page=last_page,
+                thread_count=min(self.max_workers, last_page - first_page + 1),
+                output_folder=output_folder,
+                paths_only=output_folder is not None
             )
-            
-            # Extract text from each image
-            text_parts = []
-            for image in images:
-                # Perform OCR with Dutch language support
-                text = pytesseract.image_to_string(
-                    image,
-                    lang='nld',
-                    config='--psm 1'  # Automatic page segmentation with OSD
-                )
-                text_parts.append(text)
-            
-            return '\n\n'.join(text_parts)
-            
+
+    def _options(self, dpi: int, detect_orientation: Optional[bool] = None) -> Dict[str, Any]:
+        """
+        Collect the options that determine the OCR output for a page.
+
+        Args:
+            dpi: Resolution at which the pages are rasterised
+            detect_orientation: Optional override of self.detect_orientation
+
+        Returns:
+            Dict of options passed to the workers, including the "settings"
+            string that is part of the cache key
+        """
+        if detect_orientation is None:
+            detect_orientation = self.detect_orientation
+
+        options = {
+            'backend': self.backend,
+            'psm': PSM_AUTO_OSD if detect_orientation else PSM_AUTO,
+            'dpi': dpi,
+            'preprocess': self.preprocess,
+            'target_dpi': self.target_dpi
+        }
+        options['settings'] = (
+            f"backend={self.backend}|lang={OCR_LANG}|psm={options['psm']}|dpi={dpi}"
+            f"|preprocess={self.preprocess}:{self.target_dpi}|words"
+        )
+        return options
+
+    def _ocr_pages(
+        self,
+        pages: Iterable[Union[Image.Image, str]],
+        options: Dict[str, Any],
+        keep_pages: bool = False
+    ) -> Iterator[Tuple[Dict[str, Any], bool, Dict[str, float], Union[Image.Image, str]]]:
+        """
+        OCR pages as they are produced, in parallel when possible.
+
+        At most two pages per worker are in flight, so a lazy page source is
+        only consumed as fast as the workers can keep up. Pages are released
+        (and page files removed) as soon as they have been OCR'd, unless
+        keep_pages is set.
+
+        Args:
+            pages: Page images (or paths) in document order
+            options: OCR options as built by _options
+            keep_pages: Keep page files on disk, e.g. for redaction
+
+        Yields:
+            Tuple of page layout, cache hit flag, stage timings and the page
+            itself, in the same order as the pages
+        """
+        def finish(page, result):
+            if not keep_pages:
+                _discard_page(page)
+            return result + (page,)
+
+        if self.max_workers <= 1:
+            for page in pages:
+                yield finish(page, _ocr_page(page, options, self.cache))
+            return
+
+        pool = self._get_pool()
+        pending = deque()
+        for page in pages:
+            pending.append((page, pool.submit(_ocr_page, page, options, self.cache)))
+            if len(pending) >= self.max_workers * 2:
+                done, future = pending.popleft()
+                yield finish(done, future.result())
+
+        while pending:
+            done, future = pending.popleft()
+            yield finish(done, future.result())
+
+    def ocr_pdf(
+        self,
+        pdf_path: str,
+        dpi: Optional[int] = None,
+        page_folder: Optional[str] = None,
+        detect_orientation: Optional[bool] = None,
+        progress_callback: Optional[Callable[[int, int], None]] = None
+    ) -> Dict[str, Any]:
+        """
+        OCR a PDF file and report processing statistics.
+
+        Pages are rasterised lazily in small batches and OCR'd in parallel on
+        the worker pool; page order is preserved. Pages found in the OCR
+        cache skip Tesseract entirely.
+
+        Args:
+            pdf_path: Path to the PDF file
+            dpi: Optional rasterisation resolution for this document
+            page_folder: Render pages into this folder and keep them there,
+                so they can be redacted afterwards without rasterising again
+            detect_orientation: Optional override of self.detect_orientation,
+                e.g. False to skip OSD for documents known to be upright
+            progress_callback: Optional function called with (pages done,
+                pages total) after every OCR'd page
+
+        Returns:
+            Dict with the extracted "text", per page layout in "pages" (page
+            number, "offset" of the page in the text, "words" with boxes, "dpi"
+            and "image_path" when page_folder is given) and "stats" (pages,
+            cache hits/misses, cache hit rate, duration and time per stage)
+        """
+        start_time = time.time()
+        dpi = dpi or self.dpi
+        options = self._options(dpi, detect_orientation)
+
+        pages = []
+        offset = 0
+        cache_hits = 0
+        stage_seconds = {}
+        try:
+            pages_total = self.page_count(pdf_path) if progress_callback else None
+
+            if page_folder is not None:
+                spool = nullcontext(page_folder)
+            elif self.spool_to_disk:
+                spool = tempfile.TemporaryDirectory(prefix="ocr_")
+            else:
+                spool = nullcontext()
+
+            with spool as output_folder:
+                page_images = self.iter_pages(pdf_path, dpi, output_folder=output_folder)
+                results = self._ocr_pages(page_images, options, keep_pages=page_folder is not None)
+                for number, (page, cache_hit, timings, page_image) in enumerate(results, start=1):
+                    if pages:
+                        offset += 2  # Pagina's worden gescheiden door een lege regel
+                    page.update(page=number, offset=offset, dpi=dpi)
+                    if page_folder is not None:
+                        page["image_path"] = page_image
+                    pages.append(page)
+                    offset += len(page["text"])
+                    cache_hits += cache_hit
+                    for stage, seconds in timings.items():
+                        stage_seconds[stage] = stage_seconds.get(stage, 0.0) + seconds
+                        observe(f"ocr_{stage}", seconds)
+                    if not cache_hit:
+                        observe("ocr_page", sum(timings.values()))
+                    if progress_callback:
+                        progress_callback(number, pages_total)
+
         except Exception as e:
             raise Exception(f"Error processing PDF with OCR: {str(e)}")
-            
+
+        if self.cache is not None:
+            self.cache.evict()
+
+        pages_processed = len(pages)
+        elapsed = time.time() - start_time
+        return {
+            "text": '\n\n'.join(page["text"] for page in pages),
+            "pages": pages,
+            "stats": {
+                "pages": pages_processed,
+                "backend": self.backend,
+                "dpi": dpi,
+                "preprocess": self.preprocess,
+                "orientation_detection": options['psm'] == PSM_AUTO_OSD,
+                "cache_hits": cache_hits,
+                "cache_misses": pages_processed - cache_hits,
+                "cache_hit_rate": cache_hits / pages_processed if pages_processed else 0.0,
+                "seconds": round(elapsed, 3),
+                "seconds_per_page": round(elapsed / pages_processed, 3) if pages_processed else 0.0,
+                "stage_seconds": {stage: round(seconds, 3) for stage, seconds in stage_seconds.items()}
+            }
+        }
+
+    def process_pdf(self, pdf_path: str, dpi: Optional[int] = None) -> str:
+        """
+        Process a PDF file using OCR.
+
+        Args:
+            pdf_path: Path to the PDF file
+            dpi: Optional rasterisation resolution for this document
+
+        Returns:
+            Extracted text from the PDF
+        """
+        return self.ocr_pdf(pdf_path, dpi)["text"]
+
     def is_scanned_pdf(self, pdf_path: str) -> bool:
         """
         Check if a PDF appears to be scanned (i.e., contains no extractable text).
-        
+
         Args:
             pdf_path: Path to the PDF file
-            
+
         Returns:
             True if the PDF appears to be scanned, False otherwise
         """
@@ -66,42 +646,35 @@ class OCRProcessor:
                 first_page=1,
                 last_page=1
             )
-            
+
             if not images:
                 return False
-                
+
             # Try to extract text from first page
-            text = pytesseract.image_to_string(
-                images[0],
-                lang='nld',
-                config='--psm 1'
-            )
-            
+            text = _ocr_image(images[0], self.backend)
+
             # If we get text from OCR but not from normal extraction,
             # it's likely a scanned document
             return bool(text.strip())
-            
+
         except Exception:
-            return False 
+            return False
 
-    def process_image(self, image: Image) -> str:
+    def process_image(self, image: Image.Image) -> str:
         """
         Process a single image using OCR.
-        
+
         Args:
             image: PIL Image object to process
-            
+
         Returns:
             Extracted text from the image
         """
         try:
             # Perform OCR with Dutch language support
-            text = pytesseract.image_to_string(
-                image,
-                lang='nld',
-                config='--psm 1'  # Automatic page segmentation with OSD
-            )
-            return text
-            
+            dpi = image.info.get('dpi', (self.dpi,))[0]
+            page, _, _ = _ocr_page(image, self._options(int(round(dpi))), self.cache)
+            return page["text"]
+
         except Exception as e:
-            raise Exception(f"Error processing image with OCR: {str(e)}") 
\ No newline at end of file
+            raise Exception(f"Error processing image with OCR: {str(e)}")
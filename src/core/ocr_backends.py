@@ -0,0 +1,203 @@
+"""Tesseract backends used by the OCR processor."""
+import importlib.util
+import os
+import threading
+from typing import Any, Dict, List, Optional, Type
+
+import pytesseract
+from PIL import Image
+
+# Tesseract instellingen voor Nederlandse tekst
+OCR_LANG = 'nld'
+OCR_PSM = 1  # Automatic page segmentation with OSD
+
+
+class PytesseractBackend:
+    """
+    Runs the ``tesseract`` executable through pytesseract.
+
+    Every page starts a new tesseract process that writes the image to a
+    temporary file and loads the language data again.
+    """
+
+    name = 'pytesseract'
+
+    def __init__(self, tesseract_cmd: Optional[str] = None):
+        """Initialize the backend with an optional path to the tesseract executable."""
+        if tesseract_cmd:
+            pytesseract.pytesseract.tesseract_cmd = tesseract_cmd
+
+    @staticmethod
+    def is_available() -> bool:
+        """pytesseract is a required dependency."""
+        return True
+
+    def image_to_string(self, image: Image.Image, psm: int = OCR_PSM) -> str:
+        """
+        Extract text from a page image.
+
+        Args:
+            image: Page image
+            psm: Tesseract page segmentation mode
+
+        Returns:
+            Extracted text
+        """
+        return pytesseract.image_to_string(
+            image,
+            lang=OCR_LANG,
+            config=f'--psm {psm}'
+        )
+
+    def image_to_words(self, image: Image.Image, psm: int = OCR_PSM) -> List[Dict[str, Any]]:
+        """
+        Extract words with their bounding boxes from a page image.
+
+        Args:
+            image: Page image
+            psm: Tesseract page segmentation mode
+
+        Returns:
+            Words in reading order with "text", "block", "par", "line" and
+            "box" (left, top, width, height in pixels)
+        """
+        data = pytesseract.image_to_data(
+            image,
+            lang=OCR_LANG,
+            config=f'--psm {psm}',
+            output_type=pytesseract.Output.DICT
+        )
+
+        words = []
+        for i, text in enumerate(data['text']):
+            if not text.strip():
+                continue
+            words.append({
+                'text': text.strip(),
+                'block': data['block_num'][i],
+                'par': data['par_num'][i],
+                'line': data['line_num'][i],
+                'box': (data['left'][i], data['top'][i], data['width'][i], data['height'][i])
+            })
+        return words
+
+    def close(self) -> None:
+        """Nothing to release; every call uses its own process."""
+
+
+class TesserocrBackend:
+    """
+    Keeps an initialised Tesseract engine in memory via the C API (tesserocr).
+
+    The language data is loaded once per engine and page images are handed
+    over as in-memory buffers, so there is no process start or temporary
+    file per page.
+    """
+
+    name = 'tesserocr'
+
+    def __init__(self, tesseract_cmd: Optional[str] = None):
+        """Initialize the engine; tesseract_cmd is not used by the C API."""
+        import tesserocr
+
+        kwargs = {'lang': OCR_LANG, 'psm': OCR_PSM}
+        if os.environ.get('TESSDATA_PREFIX'):
+            kwargs['path'] = os.environ['TESSDATA_PREFIX']
+        self.api = tesserocr.PyTessBaseAPI(**kwargs)
+
+    @staticmethod
+    def is_available() -> bool:
+        """Check whether the optional tesserocr binding is installed."""
+        return importlib.util.find_spec('tesserocr') is not None
+
+    def image_to_string(self, image: Image.Image, psm: int = OCR_PSM) -> str:
+        """
+        Extract text from a page image.
+
+        Args:
+            image: Page image
+            psm: Tesseract page segmentation mode
+
+        Returns:
+            Extracted text
+        """
+        self.api.SetPageSegMode(psm)
+        self.api.SetImage(image)
+        return self.api.GetUTF8Text()
+
+    def image_to_words(self, image: Image.Image, psm: int = OCR_PSM) -> List[Dict[str, Any]]:
+        """
+        Extract words with their bounding boxes from a page image.
+
+        Args:
+            image: Page image
+            psm: Tesseract page segmentation mode
+
+        Returns:
+            Words in reading order with "text", "block", "par", "line" and
+            "box" (left, top, width, height in pixels)
+        """
+        from tesserocr import RIL, iterate_level
+
+        self.api.SetPageSegMode(psm)
+        self.api.SetImage(image)
+        self.api.Recognize()
+
+        words = []
+        block = par = line = 0
+        for word in iterate_level(self.api.GetIterator(), RIL.WORD):
+            if word.IsAtBeginningOf(RIL.BLOCK):
+                block += 1
+            if word.IsAtBeginningOf(RIL.PARA):
+                par += 1
+            if word.IsAtBeginningOf(RIL.TEXTLINE):
+                line += 1
+
+            text = (word.GetUTF8Text(RIL.WORD) or '').strip()
+            box = word.BoundingBox(RIL.WORD)
+            if not text or box is None:
+                continue
+            left, top, right, bottom = box
+            words.append({
+                'text': text,
+                'block': block,
+                'par': par,
+                'line': line,
+                'box': (left, top, right - left, bottom - top)
+            })
+        return words
+
+    def close(self) -> None:
+        """Release the Tesseract engine."""
+        self.api.End()
+
+
+BACKENDS: Dict[str, Type] = {
+    PytesseractBackend.name: PytesseractBackend,
+    TesserocrBackend.name: TesserocrBackend,
+}
+
+# Tesseract engines zijn niet thread-safe: één engine per thread (en dus per worker)
+_local = threading.local()
+
+
+def get_backend(name: str, tesseract_cmd: Optional[str] = None):
+    """
+    Return the OCR backend for the current thread, creating it on first use.
+
+    Args:
+        name: Backend name, one of BACKENDS
+        tesseract_cmd: Optional path to the tesseract executable
+
+    Returns:
+        Backend instance that stays alive for the lifetime of the thread
+    """
+    backends = getattr(_local, 'backends', None)
+    if backends is None:
+        backends = _local.backends = {}
+
+    if name not in backends:
+        if name not in BACKENDS:
+            raise ValueError(f"Onbekende OCR backend: {name}")
+        backends[name] = BACKENDS[name](tesseract_cmd)
+    return backends[name]
@@ -0,0 +1,109 @@
+"""On-disk cache for OCR output of rasterised pages."""
+import hashlib
+import logging
+import os
+import tempfile
+from pathlib import Path
+from typing import Optional, Union
+
+from PIL import Image
+
+logger = logging.getLogger(__name__)
+
+OCR_CACHE_MAX_MB = int(os.environ.get('OCR_CACHE_MAX_MB', 512))
+
+
+class OCRCache:
+    """
+    Size-bounded cache of OCR text, keyed by page image content and settings.
+
+    Every entry is a small text file named after the key, so the cache can be
+    shared by all OCR worker processes without locking: writes are atomic
+    renames and reads refresh the modification time, which is used as the
+    LRU order on eviction. Entries hold the recognised text of the pages,
+    so the directory is created readable by the owner only.
+    """
+
+    def __init__(self, cache_dir: Union[str, Path], max_bytes: Optional[int] = None):
+        """
+        Initialize the cache.
+
+        Args:
+            cache_dir: Directory in which cache entries are stored
+            max_bytes: Maximum total size of the cache (default: OCR_CACHE_MAX_MB)
+        """
+        self.cache_dir = Path(cache_dir)
+        self.cache_dir.mkdir(mode=0o700, parents=True, exist_ok=True)
+        self.max_bytes = max_bytes if max_bytes is not None else OCR_CACHE_MAX_MB * 1024 * 1024
+
+    @staticmethod
+    def key(image: Image.Image, settings: str) -> str:
+        """
+        Compute the cache key for a page.
+
+        Args:
+            image: Rasterised page image
+            settings: OCR settings that influence the output (language, psm, DPI)
+
+        Returns:
+            Hex digest identifying the page and settings
+        """
+        digest = hashlib.sha256()
+        digest.update(f"{settings}|{image.mode}|{image.size}".encode('utf-8'))
+        digest.update(image.tobytes())
+        return digest.hexdigest()
+
+    def _path(self, key: str) -> Path:
+        return self.cache_dir / f"{key}.txt"
+
+    def get(self, key: str) -> Optional[str]:
+        """Return the cached text for a key, or None on a miss."""
+        path = self._path(key)
+        try:
+            text = path.read_text(encoding='utf-8')
+            os.utime(path)  # Markeer als recent gebruikt voor LRU
+            return text
+        except FileNotFoundError:
+            return None
+
+    def put(self, key: str, text: str) -> None:
+        """Store the text for a key."""
+        fd, tmp_path = tempfile.mkstemp(dir=self.cache_dir, suffix='.tmp')
+        try:
+            with os.fdopen(fd, 'w', encoding='utf-8') as f:
+                f.write(text)
+            os.replace(tmp_path, self._path(key))
+        except OSError as e:
+            logger.warning(f"Could not write OCR cache entry: {str(e)}")
+            if os.path.exists(tmp_path):
+                os.unlink(tmp_path)
+
+    def evict(self) -> int:
+        """
+        Remove least recently used entries until the cache fits in max_bytes.
+
+        Returns:
+            Number of removed entries
+        """
+        entries = []
+        total = 0
+        for entry in os.scandir(self.cache_dir):
+            if entry.name.endswith('.txt'):
+                stat = entry.stat()
+                entries.append((stat.st_mtime, stat.st_size, entry.path))
+                total += stat.st_size
+
+        removed = 0
+        for _, size, path in sorted(entries):
+            if total <= self.max_bytes:
+                break
+            try:
+                os.unlink(path)
+                total -= size
+                removed += 1
+            except FileNotFoundError:
+                pass
+
+        if removed:
+            logger.debug(f"Evicted {removed} OCR cache entries")
+        return removed
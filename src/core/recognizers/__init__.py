@@ -1,5 +1,6 @@
 """Dutch text recognizers package."""
 
+from .patterns import DutchEmailRecognizer, DutchIBANRecognizer, DutchPhoneNumberRecognizer
 from .robbert import RobBERTRecognizer
 
-__all__ = ["RobBERTRecognizer"] 
\ No newline at end of file
+__all__ = ["RobBERTRecognizer", "DutchPhoneNumberRecognizer", "DutchIBANRecognizer", "DutchEmailRecognizer"] 
\ No newline at end of file
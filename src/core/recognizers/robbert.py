@@ -1,9 +1,12 @@
 """RobBERT NER recognizer voor Nederlandse tekst."""
+import threading
 from typing import List, Optional
 from presidio_analyzer import EntityRecognizer, RecognizerResult
 from transformers import pipeline
 import spacy
 
+from ..instrumentation import model_load, stage
+
 class RobBERTRecognizer(EntityRecognizer):
     """
     Recognizer die RobBERT gebruikt voor Nederlandse NER.
@@ -37,22 +40,60 @@ class RobBERTRecognizer(EntityRecognizer):
         self.is_loaded = False
         self.model = None
         self.nlp = None
+
+        # Vooraf berekende resultaten van prefetch(), per thread
+        self._prefetched = threading.local()
+        
+        # Voorkomt dat gelijktijdige eerste requests de modellen dubbel laden
+        self._load_lock = threading.Lock()
         
     def load(self) -> None:
         """Laad het RobBERT model en SpaCy."""
-        if not self.is_loaded:
+        with self._load_lock:
+            if self.is_loaded:
+                return
+            
             # Laad RobBERT voor algemene NER
-            self.model = pipeline(
-                "ner",
-                model="pdelobelle/robbert-v2-dutch-ner",
-                aggregation_strategy="simple"
-            )
+            with model_load("robbert"):
+                self.model = pipeline(
+                    "ner",
+                    model="pdelobelle/robbert-v2-dutch-ner",
+                    aggregation_strategy="simple"
+                )
             
             # Laad SpaCy voor aanvullende entiteiten
-            self.nlp = spacy.load("nl_core_news_md")
+            with model_load("robbert_spacy"):
+                self.nlp = spacy.load("nl_core_news_md")
             
             self.is_loaded = True
 
+    def prefetch(self, texts: List[str], batch_size: int = 32) -> None:
+        """
+        Run RobBERT and SpaCy on a batch of texts ahead of analyze().
+        
+        One batched pipeline call is much cheaper than a call per text.
+        The results are kept for the current thread until clear_prefetched().
+        
+        Args:
+            texts: Texts that will be analyzed next
+            batch_size: Batch size for the RobBERT pipeline and nlp.pipe
+        """
+        if not self.is_loaded:
+            self.load()
+
+        texts = list(dict.fromkeys(text for text in texts if text))
+        with stage("robbert"):
+            robbert_results = self.model(texts, batch_size=batch_size) if texts else []
+        with stage("robbert_spacy"):
+            docs = list(self.nlp.pipe(texts, batch_size=batch_size))
+        self._prefetched.results = {
+            text: (ents, doc) for text, ents, doc in zip(texts, robbert_results, docs)
+        }
+
+    def clear_prefetched(self) -> None:
+        """Drop the results of prefetch() for the current thread."""
+        self._prefetched.results = {}
+
     def analyze(self, text: str, entities: List[str], nlp_artifacts=None) -> List[RecognizerResult]:
         """
         Analyze text using RobBERT NER and SpaCy.
@@ -73,9 +114,12 @@ class RobBERTRecognizer(EntityRecognizer):
             self.load()
 
         results = []
+        robbert_results, doc = getattr(self._prefetched, 'results', {}).get(text, (None, None))
         
         # RobBERT NER analyse voor namen, locaties en organisaties
-        robbert_results = self.model(text)
+        if robbert_results is None:
+            with stage("robbert"):
+                robbert_results = self.model(text)
         for ent in robbert_results:
             # Converteer RobBERT labels naar Presidio formaat
             entity_type = self._convert_robbert_label(ent["entity_group"])
@@ -91,7 +135,9 @@ class RobBERTRecognizer(EntityRecognizer):
                 results.append(result)
         
         # SpaCy analyse voor aanvullende entiteiten
-        doc = self.nlp(text)
+        if doc is None:
+            with stage("robbert_spacy"):
+                doc = self.nlp(text)
         for ent in doc.ents:
             # Converteer SpaCy labels naar Presidio formaat
             entity_type = self._convert_spacy_label(ent.label_)
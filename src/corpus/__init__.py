@@ -0,0 +1,17 @@
+"""Synthetic Dutch documents with known personal data, for benchmarks and accuracy checks."""
+
+from .generator import CorpusGenerator, Span, SyntheticDocument
+from .identifiers import is_valid_bsn, is_valid_iban
+from .scoring import count_matches, scores
+from .writer import write_corpus
+
+__all__ = [
+    "CorpusGenerator",
+    "Span",
+    "SyntheticDocument",
+    "count_matches",
+    "is_valid_bsn",
+    "is_valid_iban",
+    "scores",
+    "write_corpus",
+]
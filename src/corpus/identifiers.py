@@ -0,0 +1,91 @@
+"""Generation and validation of Dutch identifiers: BSN, IBAN, postcodes and phone numbers."""
+import random
+import string
+
+# Bankcodes van Nederlandse IBANs; INGB rekeningnummers volgen de elfproef niet
+BANK_CODES = ["ABNA", "RABO", "INGB", "SNSB", "TRIO", "ASNB", "KNAB", "BUNQ", "RBRB"]
+
+# Netnummers voor vaste nummers
+AREA_CODES = ["010", "020", "023", "030", "035", "040", "043", "050", "053", "070", "071", "073", "076", "079"]
+
+# Lettercombinaties die niet in postcodes voorkomen
+_EXCLUDED_POSTCODE_LETTERS = {"SA", "SD", "SS"}
+
+
+def is_valid_bsn(bsn: str) -> bool:
+    """Check a BSN with the elfproef (9·d1 + 8·d2 + ... + 2·d8 − d9 divisible by 11)."""
+    if len(bsn) != 9 or not bsn.isdigit():
+        return False
+    digits = [int(c) for c in bsn]
+    total = sum(weight * digit for weight, digit in zip(range(9, 1, -1), digits)) - digits[8]
+    return total % 11 == 0 and bsn != "000000000"
+
+
+def make_bsn(rng: random.Random) -> str:
+    """Generate a BSN that passes the elfproef."""
+    while True:
+        digits = [rng.randint(1, 6)] + [rng.randint(0, 9) for _ in range(7)]
+        check = sum(weight * digit for weight, digit in zip(range(9, 1, -1), digits)) % 11
+        if check < 10:
+            return "".join(map(str, digits + [check]))
+
+
+def _iban_checksum(country: str, bban: str) -> int:
+    rearranged = bban + country + "00"
+    number = "".join(str(int(c, 36)) for c in rearranged)
+    return 98 - int(number) % 97
+
+
+def is_valid_iban(iban: str) -> bool:
+    """Check the mod-97 check digits of an IBAN (spaces are ignored)."""
+    iban = iban.replace(" ", "").upper()
+    if len(iban) < 15 or not iban[:2].isalpha() or not iban[2:4].isdigit() or not iban.isalnum():
+        return False
+    return int(iban[2:4]) == _iban_checksum(iban[:2], iban[4:])
+
+
+def make_iban(rng: random.Random, spaced: bool = False) -> str:
+    """
+    Generate a Dutch IBAN with valid check digits.
+
+    Except for INGB, the account number also passes the elfproef, as real
+    Dutch account numbers do.
+
+    Args:
+        rng: Random generator
+        spaced: Group the IBAN in blocks of four (NL91 ABNA 0417 1643 00)
+    """
+    bank = rng.choice(BANK_CODES)
+    while True:
+        account = [rng.randint(0, 9) for _ in range(10)]
+        account[0] = 0
+        if bank == "INGB" or sum(weight * digit for weight, digit in zip(range(10, 0, -1), account)) % 11 == 0:
+            break
+    bban = bank + "".join(map(str, account))
+    iban = f"NL{_iban_checksum('NL', bban):02d}{bban}"
+    if spaced:
+        return " ".join(iban[i:i + 4] for i in range(0, len(iban), 4))
+    return iban
+
+
+def make_postcode(rng: random.Random) -> str:
+    """Generate a postcode in the form 1234 AB."""
+    while True:
+        letters = "".join(rng.choice(string.ascii_uppercase) for _ in range(2))
+        if letters not in _EXCLUDED_POSTCODE_LETTERS:
+            return f"{rng.randint(1000, 9999)} {letters}"
+
+
+def make_phone_number(rng: random.Random) -> str:
+    """Generate a mobile or landline number in one of the common notations."""
+    if rng.random() < 0.6:
+        number = "".join(str(rng.randint(0, 9)) for _ in range(8))
+        return rng.choice([
+            f"06-{number}",
+            f"06 {number[:4]} {number[4:]}",
+            f"+31 6 {number}",
+            f"06{number}",
+        ])
+    area = rng.choice(AREA_CODES)
+    number = "".join(str(rng.randint(0, 9)) for _ in range(7))
+    return rng.choice([f"{area}-{number}", f"{area} {number[:3]} {number[3:]}", f"+31 {area[1:]} {number}"])
@@ -0,0 +1,91 @@
+"""Rendering of generated texts as multi-page PDFs, with a text layer or as scanned page images."""
+import random
+from pathlib import Path
+from typing import List, Optional
+
+
+def wrap_lines(text: str, width: int) -> List[str]:
+    """Wrap text to lines of at most `width` characters, keeping blank lines between paragraphs."""
+    lines = []
+    for paragraph in text.split("\n"):
+        line = ""
+        for word in paragraph.split():
+            if line and len(line) + 1 + len(word) > width:
+                lines.append(line)
+                line = word
+            else:
+                line = f"{line} {word}".strip()
+        lines.append(line)
+    return lines
+
+
+def write_text_pdf(path: Path, text: str, lines_per_page: int = 45) -> Path:
+    """
+    Write text to a PDF with a text layer.
+
+    Args:
+        path: Output path
+        text: Text to write
+        lines_per_page: Lines per page; longer texts get more pages
+
+    Returns:
+        The output path
+    """
+    from reportlab.pdfgen import canvas
+
+    pdf = canvas.Canvas(str(path))
+    lines = wrap_lines(text, 90)
+    for start in range(0, len(lines), lines_per_page):
+        for i, line in enumerate(lines[start:start + lines_per_page]):
+            pdf.drawString(60, 780 - i * 16, line)
+        pdf.showPage()
+    pdf.save()
+    return path
+
+
+def write_scanned_pdf(
+    path: Path,
+    text: str,
+    rng: Optional[random.Random] = None,
+    lines_per_page: int = 40
+) -> Path:
+    """
+    Write text as page images without a text layer, like a scanned document.
+
+    With a random generator every page is rotated slightly and gets some
+    specks, as a real scan would; the same generator state gives the same
+    pages.
+
+    Args:
+        path: Output path
+        text: Text to render
+        rng: Optional random generator for scan artefacts (none without)
+        lines_per_page: Lines per page; longer texts get more pages
+
+    Returns:
+        The output path
+    """
+    from PIL import Image, ImageDraw, ImageFont
+
+    try:
+        font = ImageFont.load_default(size=30)
+    except TypeError:
+        font = ImageFont.load_default()
+
+    lines = wrap_lines(text, 80)
+    images = []
+    for start in range(0, len(lines), lines_per_page):
+        image = Image.new("L", (1654, 2339), color=255)  # A4 op 200 DPI
+        draw = ImageDraw.Draw(image)
+        for i, line in enumerate(lines[start:start + lines_per_page]):
+            draw.text((150, 150 + i * 50), line, fill=0, font=font)
+
+        if rng is not None:
+            for _ in range(rng.randint(50, 300)):
+                x, y = rng.randrange(image.width), rng.randrange(image.height)
+                draw.point((x, y), fill=rng.randint(0, 120))
+            image = image.rotate(rng.uniform(-1.5, 1.5), fillcolor=255, resample=Image.BILINEAR)
+        images.append(image)
+
+    images[0].save(path, save_all=True, append_images=images[1:], resolution=200)
+    return path
@@ -0,0 +1,73 @@
+"""Precision and recall of analyzer results against the ground truth of a synthetic corpus."""
+from typing import Dict, Iterable, Optional, Sequence
+
+from .generator import Span
+
+
+def count_matches(
+    expected: Sequence[Span],
+    predicted: Iterable,
+    aliases: Optional[Dict[str, str]] = None,
+    counts: Optional[Dict[str, Dict[str, int]]] = None
+) -> Dict[str, Dict[str, int]]:
+    """
+    Count true positives, false positives and false negatives per entity type.
+
+    A prediction is correct when it overlaps an expected span of the same
+    type that was not matched yet; partial overlaps count, so "Jan de Vries"
+    found as "de Vries" is still a hit.
+
+    Args:
+        expected: Ground-truth spans of one document
+        predicted: Analyzer results (anything with entity_type, start and end)
+        aliases: Optional mapping of predicted types to ground-truth types
+            (e.g. {"IBAN_CODE": "IBAN"})
+        counts: Counts to add to, to accumulate over a corpus
+
+    Returns:
+        {entity_type: {"tp": ..., "fp": ..., "fn": ...}}
+    """
+    aliases = aliases or {}
+    counts = {} if counts is None else counts
+    unmatched = list(expected)
+
+    for result in predicted:
+        entity_type = aliases.get(result.entity_type, result.entity_type)
+        match = next(
+            (
+                span for span in unmatched
+                if span.entity_type == entity_type and span.start < result.end and result.start < span.end
+            ),
+            None
+        )
+        if match is not None:
+            unmatched.remove(match)
+        key = "tp" if match is not None else "fp"
+        counts.setdefault(entity_type, {"tp": 0, "fp": 0, "fn": 0})[key] += 1
+
+    for span in unmatched:
+        counts.setdefault(span.entity_type, {"tp": 0, "fp": 0, "fn": 0})["fn"] += 1
+    return counts
+
+
+def scores(counts: Dict[str, Dict[str, int]]) -> Dict[str, Dict[str, float]]:
+    """
+    Compute precision, recall and F1 per entity type from count_matches output.
+
+    Returns:
+        {entity_type: {"precision", "recall", "f1", "support"}}, where support
+        is the number of expected spans
+    """
+    result = {}
+    for entity_type, count in sorted(counts.items()):
+        tp, fp, fn = count["tp"], count["fp"], count["fn"]
+        precision = tp / (tp + fp) if tp + fp else 0.0
+        recall = tp / (tp + fn) if tp + fn else 0.0
+        f1 = 2 * precision * recall / (precision + recall) if precision + recall else 0.0
+        result[entity_type] = {
+            "precision": round(precision, 4),
+            "recall": round(recall, 4),
+            "f1": round(f1, 4),
+            "support": tp + fn,
+        }
+    return result
@@ -0,0 +1,76 @@
+"""Word lists for the synthetic corpus: names, streets, places and filler text."""
+
+FIRST_NAMES = [
+    "Jan", "Pieter", "Klaas", "Henk", "Willem", "Daan", "Sem", "Lucas", "Bram", "Thijs",
+    "Mohammed", "Ahmed", "Youssef", "Mehmet", "Kevin", "Ruud", "Gerrit", "Joost", "Sander", "Niels",
+    "Maria", "Anna", "Marieke", "Sanne", "Emma", "Julia", "Sophie", "Lotte", "Fleur", "Anouk",
+    "Fatima", "Aisha", "Elif", "Priya", "Ingrid", "Petra", "Wilma", "Ilse", "Femke", "Noor",
+]
+
+# Tussenvoegsel (of leeg) en achternaam
+SURNAMES = [
+    ("", "Jansen"), ("de", "Vries"), ("van den", "Berg"), ("", "Bakker"), ("van", "Dijk"),
+    ("", "Visser"), ("", "Smit"), ("", "Meijer"), ("de", "Boer"), ("", "Mulder"),
+    ("de", "Groot"), ("", "Bos"), ("", "Vos"), ("", "Peters"), ("", "Hendriks"),
+    ("van", "Leeuwen"), ("", "Dekker"), ("", "Brouwer"), ("de", "Wit"), ("", "Dijkstra"),
+    ("", "Smits"), ("de", "Graaf"), ("van der", "Meer"), ("van der", "Linden"), ("", "Kok"),
+    ("", "Jacobs"), ("de", "Haan"), ("", "Vermeulen"), ("van den", "Heuvel"), ("van der", "Veen"),
+    ("", "El Amrani"), ("", "Yilmaz"), ("", "Bouzid"), ("", "Kaya"), ("", "Ramdin"),
+]
+
+STREETS = [
+    "Kerkstraat", "Schoolstraat", "Molenweg", "Dorpsstraat", "Stationsweg", "Julianastraat",
+    "Wilhelminalaan", "Beatrixstraat", "Prinses Irenelaan", "Hoofdstraat", "Kastanjelaan",
+    "Eikenlaan", "Parallelweg", "Industrieweg", "Nieuwe Gracht", "Oude Haven", "Sportlaan",
+    "Van Goghstraat", "Rembrandtplein", "Burgemeester de Withstraat",
+]
+
+CITIES = [
+    "Amsterdam", "Rotterdam", "Den Haag", "Utrecht", "Eindhoven", "Groningen", "Tilburg",
+    "Almere", "Breda", "Nijmegen", "Apeldoorn", "Haarlem", "Arnhem", "Enschede", "Amersfoort",
+    "Zaanstad", "Zwolle", "Leiden", "Maastricht", "Dordrecht", "Ede", "Alkmaar", "Delft",
+]
+
+ORGANIZATIONS = [
+    "Gemeente {city}", "Belastingdienst", "UWV", "Woningcorporatie De Sleutel",
+    "Zorgverzekeraar Zuid", "Huisartsenpraktijk De Linde", "Advocatenkantoor Van Dam & Partners",
+]
+
+MAIL_DOMAINS = ["voorbeeld.nl", "mail.voorbeeld.nl", "post.voorbeeld.nl", "webmail.voorbeeld.nl"]
+
+SUBJECTS = [
+    "Uw aanvraag", "Bezwaar tegen beschikking", "Wijziging adresgegevens", "Afspraak volgende week",
+    "Betalingsherinnering", "Verzoek om informatie", "Bevestiging inschrijving",
+]
+
+# Zinnen zonder persoonsgegevens
+FILLER = [
+    "Wij hebben uw brief in goede orde ontvangen.",
+    "Naar aanleiding van uw verzoek informeren wij u als volgt.",
+    "Uw aanvraag wordt binnen acht weken in behandeling genomen.",
+    "Bent u het niet eens met dit besluit, dan kunt u binnen zes weken bezwaar maken.",
+    "Wij verzoeken u de gevraagde stukken zo spoedig mogelijk toe te sturen.",
+    "Deze brief is automatisch aangemaakt en daarom niet ondertekend.",
+    "Het dossier is op dit moment nog niet volledig.",
+    "Tijdens het gesprek is afgesproken dat wij u schriftelijk zouden informeren.",
+    "De kosten worden in twee termijnen in rekening gebracht.",
+    "Wij danken u voor uw geduld.",
+    "Houd bij contact met ons altijd uw dossiernummer bij de hand.",
+    "De beslissing is genomen op basis van de informatie die bij ons bekend is.",
+]
+
+# Zinnen met persoonsgegevens; {ENTITEIT} wordt ingevuld en als span vastgelegd
+SENTENCES = [
+    "Uw burgerservicenummer is {BSN}.",
+    "Het teveel betaalde bedrag wordt teruggestort op rekening {IBAN}.",
+    "Wilt u het bedrag overmaken naar {IBAN} onder vermelding van uw dossiernummer?",
+    "U kunt ons bereiken op {PHONE_NUMBER}.",
+    "Voor vragen kunt u contact opnemen met {PERSON} via {PHONE_NUMBER}.",
+    "{PERSON} heeft namens u een machtiging afgegeven.",
+    "Uw nieuwe adres is {ADDRESS}, {POSTCODE} {LOCATION}.",
+    "De afspraak vindt plaats op {ADDRESS} in {LOCATION}.",
+    "Stuur uw reactie naar {EMAIL}.",
+    "Een kopie van deze brief is verstuurd aan {PERSON} ({EMAIL}).",
+    "De eigenaar van het pand, {PERSON}, woont in {LOCATION}.",
+    "Bij de controle is het BSN {BSN} van uw partner gebruikt.",
+]
@@ -0,0 +1,85 @@
+"""Writing a synthetic corpus to disk with a ground-truth file."""
+import json
+import random
+from pathlib import Path
+from typing import Dict, Optional, Sequence
+
+from .generator import KINDS, CorpusGenerator, SyntheticDocument
+from .pdf import write_scanned_pdf, write_text_pdf
+
+GROUND_TRUTH_NAME = "ground_truth.jsonl"
+
+# Bestandsformaten: platte tekst, PDF met tekstlaag of gescande PDF
+TXT = "txt"
+PDF = "pdf"
+SCANNED = "scanned"
+FORMATS = (TXT, PDF, SCANNED)
+
+
+def write_document(document: SyntheticDocument, directory: Path, file_format: str = TXT, seed: int = 0) -> Path:
+    """
+    Write one document as a text file or PDF.
+
+    Args:
+        document: Generated document
+        directory: Output directory
+        file_format: txt, pdf or scanned
+        seed: Seed of the corpus, for the scan artefacts
+
+    Returns:
+        Path of the written file
+    """
+    if file_format == TXT:
+        path = directory / f"{document.id}.txt"
+        path.write_text(document.text, encoding='utf-8')
+        return path
+    if file_format == PDF:
+        return write_text_pdf(directory / f"{document.id}.pdf", document.text)
+    if file_format == SCANNED:
+        rng = random.Random(f"{seed}-{document.id}-scan")
+        return write_scanned_pdf(directory / f"{document.id}_scan.pdf", document.text, rng)
+    raise ValueError(f"Onbekend formaat: {file_format}")
+
+
+def write_corpus(
+    directory: Path,
+    count: int,
+    kinds: Sequence[str] = KINDS,
+    file_format: str = TXT,
+    size: Optional[int] = None,
+    seed: int = 0
+) -> Dict[str, int]:
+    """
+    Generate a corpus into a directory, one file per document.
+
+    Next to the files a ground_truth.jsonl is written with per document its
+    id, file name, source text and entity spans. For PDFs the spans refer
+    to the source text, not to the text extracted from the PDF. Documents
+    are generated and written one at a time, so large corpora do not need
+    to fit in memory.
+
+    Args:
+        directory: Output directory (created if needed)
+        count: Number of documents
+        kinds: Kinds of documents (letter/email), used in turn
+        file_format: txt, pdf or scanned
+        size: Approximate length in characters per document (default: per kind)
+        seed: Seed of the corpus
+
+    Returns:
+        Number of documents, spans and characters written
+    """
+    if file_format not in FORMATS:
+        raise ValueError(f"Onbekend formaat: {file_format}")
+    directory = Path(directory)
+    directory.mkdir(parents=True, exist_ok=True)
+
+    summary = {"documents": 0, "spans": 0, "chars": 0}
+    with open(directory / GROUND_TRUTH_NAME, 'w', encoding='utf-8') as ground_truth:
+        for document in CorpusGenerator(seed).generate(count, kinds, size):
+            path = write_document(document, directory, file_format, seed)
+            ground_truth.write(json.dumps(dict(document.to_dict(), file=path.name), ensure_ascii=False) + "\n")
+            summary["documents"] += 1
+            summary["spans"] += len(document.spans)
+            summary["chars"] += len(document.text)
+    return summary
@@ -282,5 +282,40 @@ def test_pdf_text_extraction(tmp_path):
     if not direct_text.strip():
         assert text.strip(), "OCR extractie gefaald voor gescande PDF"
 
+def test_analyze_batch_matches_analyze_text(analyzer):
+    """Test that batched analysis finds the same entities as single texts."""
+    texts = [
+        "Jan de Vries woont in Amsterdam.",
+        "",
+        "Mijn rekeningnummer is NL91ABNA0417164300",
+        "Jan de Vries woont in Amsterdam.",
+    ]
+    batched = list(analyzer.analyze_batch(texts, batch_size=3))
+
+    assert len(batched) == len(texts)
+    for text, results in zip(texts, batched):
+        expected = analyzer.analyze_text(text)
+        assert [(r.entity_type, r.start, r.end) for r in results] == \
+            [(r.entity_type, r.start, r.end) for r in expected]
+
+def test_open_pdf_reads_via_memory_map(tmp_path):
+    """Test that PDFs are read from a memory map instead of a copy in memory."""
+    import mmap
+    from reportlab.pdfgen import canvas
+    from src.core.document import open_pdf
+
+    pdf_path = tmp_path / "brief.pdf"
+    pdf = canvas.Canvas(str(pdf_path))
+    for page in range(3):
+        pdf.drawString(50, 700, f"Jan de Vries, pagina {page + 1}")
+        pdf.showPage()
+    pdf.save()
+
+    with open_pdf(pdf_path) as reader:
+        assert isinstance(reader.stream, mmap.mmap)
+        texts = [page.extract_text() for page in reader.pages]
+
+    assert "pagina 3" in texts[2]
+
 if __name__ == "__main__":
-    pytest.main([__file__, "-v"])
\ No newline at end of file
+    pytest.main([__file__, "-v"])
@@ -1,6 +1,10 @@
 """Tests for the FastAPI application."""
+import io
+import shutil
 import pytest
 from fastapi.testclient import TestClient
+from PIL import Image, ImageDraw, ImageFont
+from PyPDF2 import PdfReader
 from src.api.app import app
 import time
 import concurrent.futures
@@ -16,6 +20,75 @@ def test_health_check(client):
     assert response.status_code == 200
     assert response.json() == {"status": "healthy"}
 
+def test_memory_report(client):
+    """Test that the memory report lists the loaded models."""
+    report = client.get("/health/memory").json()
+    assert report["rss_bytes"] > 0
+    assert {"spacy", "robbert"} <= set(report["models"])
+    # Alle routes delen één analyzer: elk model is één keer geladen
+    assert report["model_loads"]["spacy"] == report["model_loads"]["robbert"] == 1
+
+def test_memory_snapshot_requires_admin_token(client):
+    """Test that tracemalloc snapshots are refused without the admin token."""
+    assert client.post("/admin/memory/snapshot").status_code == 403
+
+def test_pdf_dpi_out_of_range_is_rejected(client):
+    """Test that the OCR resolution per request is validated before the upload is processed."""
+    for path in ("/api/v1/anonymize/pdf", "/api/v1/jobs/pdf"):
+        response = client.post(
+            f"{path}?use_ocr=true&dpi=10",
+            files={"file": ("scan.pdf", b"%PDF-1.4", "application/pdf")}
+        )
+        assert response.status_code == 422
+
+def scanned_pdf_bytes():
+    """Create a one-page scanned-style PDF: the page is only an image of text."""
+    try:
+        font = ImageFont.load_default(size=36)
+    except TypeError:
+        font = ImageFont.load_default()
+    image = Image.new("L", (1654, 2339), color=255)  # A4 op 200 DPI
+    ImageDraw.Draw(image).text((150, 200), "Jan de Vries woont in Amsterdam.", fill=0, font=font)
+    buffer = io.BytesIO()
+    image.save(buffer, format="PDF", resolution=200)
+    return buffer.getvalue()
+
+@pytest.mark.skipif(
+    shutil.which("tesseract") is None or shutil.which("pdftoppm") is None,
+    reason="Tesseract en Poppler zijn niet geïnstalleerd"
+)
+def test_scanned_pdf_output_mode(client):
+    """Test that a scanned upload is redacted on the page image by default and re-rendered as text on request."""
+    outputs = {}
+    for mode in ("auto", "text"):
+        response = client.post(
+            f"/api/v1/anonymize/pdf?use_ocr=true&output_mode={mode}",
+            files={"file": ("scan.pdf", scanned_pdf_bytes(), "application/pdf")}
+        )
+        assert response.status_code == 200
+        data = response.json()
+        download = client.get(f"/api/v1{data['download_link']}")
+        assert download.status_code == 200
+        outputs[mode] = (data, PdfReader(io.BytesIO(download.content)).pages[0])
+
+    # auto: de pagina-afbeelding blijft, met de entiteiten zwart gemaakt; geen tekstlaag
+    data, page = outputs["auto"]
+    assert data["ocr"]["redacted_boxes"] > 0
+    assert page.images and not (page.extract_text() or "").strip()
+
+    # text: een nieuwe PDF met de geanonimiseerde tekst
+    data, page = outputs["text"]
+    assert "redacted_boxes" not in data["ocr"]
+    assert page.extract_text().strip() and not page.images
+
+def test_pdf_output_mode_is_validated(client):
+    """Test that an unknown output mode is refused."""
+    response = client.post(
+        "/api/v1/anonymize/pdf?output_mode=layout",
+        files={"file": ("scan.pdf", b"%PDF-1.4", "application/pdf")}
+    )
+    assert response.status_code == 422
+
 def test_analyze_text(client):
     """Test text analysis endpoint."""
     response = client.post(
@@ -0,0 +1,28 @@
+"""Tests for the batching shared by the NDJSON endpoints and the CLI."""
+from src.core.batching import Batcher, payloads, result_lines
+
+
+def test_invalid_records_do_not_count_towards_the_batch_size():
+    """Test that a batch is complete after batch_size valid payloads, with invalid records kept in place."""
+    batcher = Batcher(2)
+    assert batcher.add((0, "a", "jan", None)) is None
+    assert batcher.add((1, None, None, "Ongeldige JSON")) is None
+    batch = batcher.add((2, None, "piet", None))
+
+    assert [record[0] for record in batch] == [0, 1, 2]
+    assert payloads(batch) == ["jan", "piet"]
+    assert batcher.take() == []
+
+
+def test_result_lines():
+    """Test that results and errors are matched to their records in input order."""
+    batch = [(0, "a", "jan", None), (1, None, None, "Ongeldige JSON"), (2, None, "piet", None)]
+
+    assert list(result_lines(batch, [{"text": "JAN"}, {"text": "PIET"}])) == [
+        {"index": 0, "id": "a", "text": "JAN"},
+        {"index": 1, "error": "Ongeldige JSON"},
+        {"index": 2, "text": "PIET"},
+    ]
+    assert [line["error"] for line in result_lines(batch, [], "model kapot")] == [
+        "model kapot", "Ongeldige JSON", "model kapot"
+    ]
@@ -0,0 +1,80 @@
+"""Tests for the benchmark runner."""
+from types import SimpleNamespace
+
+from src.cli.bench import BENCH_SEED, WORKLOADS, compare, format_report, percentile, run_benchmarks
+from src.core.instrumentation import stage
+
+
+class StubAnalyzer:
+    """Analyzer stand-in that only records a stage."""
+
+    def analyze_text(self, text, entities=None):
+        with stage("spacy"):
+            return []
+
+
+class StubAnonymizer:
+    def anonymize_text(self, text, results):
+        with stage("anonymize"):
+            return text
+
+
+def stub_handler():
+    return SimpleNamespace(
+        analyzer=StubAnalyzer(),
+        anonymizer=StubAnonymizer(),
+        get_ocr_processor=lambda use_ocr: None
+    )
+
+
+def test_percentile():
+    """Test that percentiles interpolate between ranks."""
+    values = [float(value) for value in range(1, 101)]
+    assert percentile(values, 50) == 50.5
+    assert percentile(values, 99) == 99.01
+    assert percentile([3.0], 95) == 3.0
+    assert percentile([], 50) == 0.0
+
+
+def test_workloads_are_deterministic(tmp_path):
+    """Test that a workload always generates the same documents."""
+    first = WORKLOADS["short"].prepare(tmp_path, 3, BENCH_SEED)
+    assert first == WORKLOADS["short"].prepare(tmp_path, 3, BENCH_SEED)
+    assert len(set(first)) == 3
+
+
+def test_run_benchmarks_reports_throughput_latency_and_stages(tmp_path):
+    """Test that results have throughput, latency percentiles, stages and a skip reason."""
+    results = run_benchmarks(stub_handler(), ["short", "scanned"], scale=0.1, work_dir=tmp_path)
+
+    short = results["workloads"]["short"]
+    assert short["documents"] == round(WORKLOADS["short"].count * 0.1)
+    assert short["chars"] > 0 and short["docs_per_s"] > 0 and short["chars_per_s"] > 0
+    # 20 documenten: genoeg voor p95, te weinig voor p99
+    assert short["documents"] == 20
+    assert short["latency"]["p50"] is not None and short["latency"]["p95"] is not None
+    assert short["latency"]["p99"] is None
+    assert set(short["stages"]) == {"spacy", "anonymize"}
+    assert all(stage["peak_rss_mb"] >= 0 for stage in short["stages"].values())
+    assert short["peak_rss_mb"] > 0
+
+    assert results["workloads"]["scanned"] == {"skipped": "OCR niet beschikbaar"}
+    assert "overgeslagen" in format_report(results)
+
+
+def test_compare_flags_regressions():
+    """Test that only deteriorations beyond the tolerance are reported."""
+    def result(docs_per_s, p95, rss):
+        return {"workloads": {"short": {
+            "docs_per_s": docs_per_s, "latency": {"p95": p95}, "peak_rss_mb": rss
+        }}}
+
+    baseline = result(100.0, 0.010, 500.0)
+    assert compare(result(95.0, 0.0105, 520.0), baseline, tolerance=0.10) == []
+
+    regressions = compare(result(80.0, 0.020, 500.0), baseline, tolerance=0.10)
+    assert len(regressions) == 2
+    assert regressions[0].startswith("short: doorvoer")
+
+    # Een p95 die bij te weinig documenten is weggelaten wordt niet vergeleken
+    assert compare(result(100.0, None, 500.0), baseline, tolerance=0.10) == []
@@ -0,0 +1,38 @@
+"""pytest-benchmark suite with the workloads of the bench command.
+
+Run with: pytest tests/test_benchmarks.py --benchmark-only
+Compare with a saved run: --benchmark-autosave, later --benchmark-compare --benchmark-compare-fail=mean:10%
+"""
+import pytest
+
+pytest.importorskip("pytest_benchmark")
+
+from src.cli.bench import BENCH_SEED, WORKLOADS
+
+pytestmark = pytest.mark.slow
+
+
+@pytest.fixture(scope="module")
+def handler():
+    from src.cli.commands import CommandHandler
+    handler = CommandHandler()
+    handler.warm_up()
+    return handler
+
+
+@pytest.mark.parametrize("name", list(WORKLOADS))
+def test_workload(benchmark, handler, tmp_path, name):
+    """Benchmark one document of a workload at a time."""
+    workload = WORKLOADS[name]
+    reason = workload.unavailable(handler)
+    if reason is not None:
+        pytest.skip(reason)
+
+    documents = workload.prepare(tmp_path, min(workload.count, 20), BENCH_SEED)
+    documents = iter(documents * 1000)
+
+    def run():
+        return workload.run(handler, next(documents), tmp_path)
+
+    chars = benchmark(run)
+    benchmark.extra_info["chars"] = chars
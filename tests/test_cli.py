@@ -1,4 +1,6 @@
+import sys
 import pytest
+from types import SimpleNamespace
 from src.cli.main import CLI
 
 @pytest.fixture
@@ -28,4 +30,79 @@ def test_cli_anonymize_text(cli):
     assert "[NAAM]" in anonymized
     assert "[LOCATIE]" in anonymized
     assert "Jan de Vries" not in anonymized
-    assert "Amsterdam" not in anonymized 
\ No newline at end of file
+    assert "Amsterdam" not in anonymized 
+
+
+@pytest.fixture(scope="module")
+def handler():
+    from src.cli.commands import CommandHandler
+    return CommandHandler()
+
+
+@pytest.fixture
+def text_dir(tmp_path):
+    """Create a directory with a few text files and one unreadable file."""
+    input_dir = tmp_path / "onverwerkt"
+    input_dir.mkdir()
+    names = ["Jan de Vries", "Piet Bakker", "Marieke Jansen", "Klaas de Boer"]
+    for number, name in enumerate(names):
+        (input_dir / f"brief_{number}.txt").write_text(f"{name} woont in Amsterdam.", encoding="utf-8")
+    (input_dir / "kapot.txt").write_bytes(b"\xff\xfe\x00ongeldig")
+    return input_dir
+
+
+def test_process_directory_in_parallel(handler, text_dir, capsys):
+    """Test that --jobs processes all files, prints them in order and reports throughput."""
+    summary = handler.process_directory(text_dir, command="anonymize", jobs=2)
+    output = capsys.readouterr().out
+
+    assert summary["files"] == 5
+    assert summary["failed"] == 1
+    assert summary["bytes"] > 0
+
+    # Voortgang in invoervolgorde, ongeacht welke worker eerst klaar was
+    headers = [line for line in output.splitlines() if line.startswith("[")]
+    assert [header.split("]")[0] for header in headers] == ["[1/5", "[2/5", "[3/5", "[4/5", "[5/5"]
+    assert "bestanden/s" in output and "MB/s" in output
+
+    output_dir = text_dir / "verwerkt"
+    for number in range(4):
+        anonymized = (output_dir / f"brief_{number}_anon.txt").read_text(encoding="utf-8")
+        assert "Amsterdam" not in anonymized
+
+
+def test_parallel_output_matches_sequential(handler, text_dir, capsys):
+    """Test that a parallel run writes the same files as a sequential run."""
+    handler.process_directory(text_dir, command="anonymize", jobs=1)
+    output_dir = text_dir / "verwerkt"
+    sequential = {path.name: path.read_text(encoding="utf-8") for path in output_dir.glob("*_anon.txt")}
+    assert len(sequential) == 4
+
+    # Output van de sequentiële run weghalen, zodat alleen de parallelle run telt
+    for path in output_dir.glob("*_anon.txt"):
+        path.unlink()
+
+    # Zonder force zou het manifest de al verwerkte bestanden overslaan
+    handler.process_directory(text_dir, command="anonymize", jobs=3, force=True)
+    parallel = {path.name: path.read_text(encoding="utf-8") for path in output_dir.glob("*_anon.txt")}
+
+    assert parallel == sequential
+
+
+def test_workers_share_the_ocr_budget(monkeypatch):
+    """Test that every worker of a parallel run gets its share of the CPU budget for OCR."""
+    from src.cli import commands
+    monkeypatch.setattr(commands, "cpu_budget", lambda: 8)
+    assert commands._worker_threads(3) == 2
+    assert commands._worker_threads(16) == 1
+
+    worker = SimpleNamespace(ocr_workers=None, ocr_processor=object())
+    monkeypatch.setattr(commands, "_worker_handler", worker)
+    # Torch threads van het testproces niet aanpassen
+    monkeypatch.setitem(sys.modules, "torch", None)
+    commands._init_worker(commands._worker_threads(3))
+    assert worker.ocr_workers == 2 and worker.ocr_processor is None
+
+    # De OCR processor van de worker wordt met die limiet gemaakt
+    monkeypatch.setattr(commands, "OCRProcessor", lambda **kwargs: kwargs)
+    assert commands.CommandHandler.get_ocr_processor(worker, use_ocr=True)["max_workers"] == 2
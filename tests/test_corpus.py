@@ -0,0 +1,90 @@
+"""Tests for the synthetic corpus generator."""
+import json
+import random
+from types import SimpleNamespace
+
+import pytest
+from PyPDF2 import PdfReader
+
+from src.corpus import CorpusGenerator, Span, count_matches, is_valid_bsn, is_valid_iban, scores, write_corpus
+from src.corpus.identifiers import make_bsn, make_iban, make_postcode
+
+
+def test_identifiers_are_valid():
+    """Test that generated BSNs pass the elfproef and IBANs the mod-97 check."""
+    rng = random.Random(1)
+    for _ in range(500):
+        assert is_valid_bsn(make_bsn(rng))
+        assert is_valid_iban(make_iban(rng, spaced=rng.random() < 0.5))
+        assert make_postcode(rng)[5:] not in {"SA", "SD", "SS"}
+
+
+def test_validators_reject_invalid_numbers():
+    """Test the validators against known valid and invalid numbers."""
+    assert is_valid_bsn("111222333")
+    assert not is_valid_bsn("111222334")
+    assert not is_valid_bsn("12345678")
+    assert is_valid_iban("NL91ABNA0417164300")
+    assert is_valid_iban("NL91 ABNA 0417 1643 00")
+    assert not is_valid_iban("NL92ABNA0417164300")
+
+
+def test_spans_match_the_text():
+    """Test that every ground-truth span points at its text in the document."""
+    documents = list(CorpusGenerator(seed=5).generate(50))
+    types = set()
+    for document in documents:
+        for span in document.spans:
+            assert document.text[span.start:span.end] == span.text
+            types.add(span.entity_type)
+    assert types >= {"PERSON", "ADDRESS", "POSTCODE", "LOCATION", "PHONE_NUMBER", "IBAN", "BSN", "EMAIL"}
+
+
+def test_generation_is_deterministic():
+    """Test that a seed gives the same corpus and a document does not depend on the corpus size."""
+    first = [document.to_dict() for document in CorpusGenerator(seed=9).generate(10)]
+    again = [document.to_dict() for document in CorpusGenerator(seed=9).generate(10)]
+    assert first == again
+    assert CorpusGenerator(seed=9).document(7, "email").to_dict() == first[7]
+    assert CorpusGenerator(seed=10).document(7, "email").text != first[7]["text"]
+
+
+@pytest.mark.parametrize("size", [500, 5000, 20000])
+def test_document_size(size):
+    """Test that documents have about the requested length."""
+    document = CorpusGenerator().letter(0, size=size)
+    assert size * 0.9 <= len(document.text) < size * 1.2 + 300
+
+
+def test_write_corpus(tmp_path):
+    """Test that files and a ground-truth line are written per document."""
+    summary = write_corpus(tmp_path, 4, file_format="pdf", size=6000, seed=2)
+    lines = [json.loads(line) for line in (tmp_path / "ground_truth.jsonl").read_text(encoding="utf-8").splitlines()]
+
+    assert summary["documents"] == len(lines) == 4
+    assert summary["spans"] == sum(len(line["spans"]) for line in lines)
+    assert len(PdfReader(str(tmp_path / lines[0]["file"])).pages) >= 3
+
+
+def test_scanned_pdf_has_no_text_layer(tmp_path):
+    """Test that scanned-style PDFs only contain page images."""
+    write_corpus(tmp_path, 1, kinds=["letter"], file_format="scanned", seed=2)
+    reader = PdfReader(str(tmp_path / "letter-0_scan.pdf"))
+    assert not (reader.pages[0].extract_text() or "").strip()
+
+
+def test_scores():
+    """Test precision and recall with overlapping, mistyped and missed entities."""
+    expected = [Span("PERSON", 0, 12, "Jan de Vries"), Span("IBAN", 20, 38, "NL91ABNA0417164300"),
+                Span("BSN", 50, 59, "111222333")]
+    predicted = [
+        SimpleNamespace(entity_type="PERSON", start=4, end=12),
+        SimpleNamespace(entity_type="IBAN_CODE", start=20, end=38),
+        SimpleNamespace(entity_type="LOCATION", start=40, end=45),
+    ]
+    result = scores(count_matches(expected, predicted, aliases={"IBAN_CODE": "IBAN"}))
+
+    assert result["PERSON"] == {"precision": 1.0, "recall": 1.0, "f1": 1.0, "support": 1}
+    assert result["IBAN"]["recall"] == 1.0
+    assert result["BSN"]["recall"] == 0.0 and result["BSN"]["support"] == 1
+    assert result["LOCATION"]["precision"] == 0.0
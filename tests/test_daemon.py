@@ -0,0 +1,112 @@
+"""Tests for the CLI daemon and its client."""
+import argparse
+import os
+import socket
+import sys
+import threading
+
+import pytest
+
+from src.cli.daemon import CommandDaemon, forward
+
+
+def echo(handler, args):
+    """Stand-in for run_command: prints the input and fails on request."""
+    handler.append(args.input)
+    print(f"verwerkt: {args.input}")
+    if args.input == "fout":
+        print("mislukt", file=sys.stderr)
+        sys.exit(1)
+    if args.input == "crash":
+        raise ValueError("kapot")
+
+
+@pytest.fixture
+def daemon(tmp_path):
+    seen = []
+    daemon = CommandDaemon(str(tmp_path / "d.sock"), seen, echo)
+    thread = threading.Thread(target=daemon.serve_forever, daemon=True)
+    thread.start()
+    yield daemon, seen
+    daemon.server.shutdown()
+    thread.join(timeout=5)
+
+
+def command(text):
+    return argparse.Namespace(command="analyze", input=text, entities=None, format="text")
+
+
+def test_forward_runs_command_on_daemon(daemon, capsys):
+    """Test that output and exit codes of a command come back from the daemon."""
+    daemon, seen = daemon
+
+    assert forward(command("Jan de Vries"), daemon.socket_path) == 0
+    assert capsys.readouterr().out == "verwerkt: Jan de Vries\n"
+
+    assert forward(command("fout"), daemon.socket_path) == 1
+    captured = capsys.readouterr()
+    assert captured.out == "verwerkt: fout\n"
+    assert captured.err == "mislukt\n"
+
+    assert forward(command("crash"), daemon.socket_path) == 2
+    assert "kapot" in capsys.readouterr().err
+
+    assert seen == ["Jan de Vries", "fout", "crash"]
+
+
+def test_forward_sends_absolute_paths(daemon, tmp_path, monkeypatch):
+    """Test that relative input paths are resolved before they go to the daemon."""
+    daemon, seen = daemon
+    (tmp_path / "brief.txt").write_text("Jan", encoding="utf-8")
+    monkeypatch.chdir(tmp_path)
+
+    forward(command("brief.txt"), daemon.socket_path)
+    assert seen == [str(tmp_path / "brief.txt")]
+
+
+def test_socket_only_accessible_to_owner(daemon):
+    """Test that the socket is created without permissions for other users."""
+    daemon, _ = daemon
+    assert os.stat(daemon.socket_path).st_mode & 0o077 == 0
+
+
+def test_forward_without_daemon(tmp_path):
+    """Test that the client falls back when no daemon is running."""
+    assert forward(command("Jan"), str(tmp_path / "geen.sock")) is None
+
+    # Achtergelaten socket van een gestopte daemon
+    stale = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    stale.bind(str(tmp_path / "oud.sock"))
+    stale.close()
+    assert forward(command("Jan"), str(tmp_path / "oud.sock")) is None
+
+
+def test_stale_socket_replaced_but_running_daemon_kept(daemon, tmp_path):
+    """Test that a new daemon replaces a stale socket but not a running daemon."""
+    running, _ = daemon
+    with pytest.raises(RuntimeError):
+        CommandDaemon(running.socket_path, [], echo)
+
+    stale = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    stale.bind(str(tmp_path / "oud.sock"))
+    stale.close()
+    replacement = CommandDaemon(str(tmp_path / "oud.sock"), [], echo)
+    replacement.close()
+    assert not os.path.exists(tmp_path / "oud.sock")
+
+
+def test_forward_ignores_socket_of_another_user(daemon, monkeypatch):
+    """Test that commands are only sent to a socket owned by the current user."""
+    daemon, seen = daemon
+    monkeypatch.setattr("src.cli.daemon._UID", os.getuid() + 1)
+    assert forward(command("Jan"), daemon.socket_path) is None
+    assert seen == []
+
+
+def test_daemon_refuses_world_writable_directory(tmp_path):
+    """Test that the daemon does not listen in a directory anyone can write to."""
+    shared = tmp_path / "gedeeld"
+    shared.mkdir()
+    shared.chmod(0o777)
+    with pytest.raises(RuntimeError):
+        CommandDaemon(str(shared / "d.sock"), [], echo)
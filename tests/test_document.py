@@ -0,0 +1,91 @@
+"""Tests for the document processor, including concurrent use."""
+import itertools
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+from PyPDF2 import PdfReader
+from reportlab.pdfgen import canvas
+
+from src.core.document import OUTPUT_TEXT, DocumentProcessor
+
+DOCUMENTS = {
+    "brief": ["Jan de Vries woont in Amsterdam.", "Hij werkt bij Philips in Eindhoven."],
+    "factuur": ["Betaling door Pieter Bakker uit Utrecht.", "Rekeningnummer NL91ABNA0417164300."],
+    "notitie": ["Overleg met Marieke Jansen in Rotterdam."],
+}
+
+ENTITY_FILTERS = [None, ["PERSON"], ["LOCATION", "IBAN"]]
+
+@pytest.fixture(scope="module")
+def processor():
+    """One processor shared by all requests, as in the API."""
+    return DocumentProcessor()
+
+@pytest.fixture
+def pdfs(tmp_path):
+    """Create small text PDFs and one PDF without text layer."""
+    paths = {}
+    for name, lines in DOCUMENTS.items():
+        path = tmp_path / f"{name}.pdf"
+        pdf = canvas.Canvas(str(path))
+        for number, line in enumerate(lines):
+            pdf.drawString(50, 750 - 20 * number, line)
+        pdf.save()
+        paths[name] = path
+
+    empty = tmp_path / "leeg.pdf"
+    pdf = canvas.Canvas(str(empty))
+    pdf.showPage()
+    pdf.save()
+    paths["leeg"] = empty
+    return paths
+
+def _summary(stats, output_path):
+    output_text = None
+    if output_path.exists():
+        output_text = "".join(page.extract_text() for page in PdfReader(str(output_path)).pages)
+    return (
+        stats["total_entities"],
+        {t: sorted(e["text"] for e in found) for t, found in stats["entities_by_type"].items()},
+        stats.get("error"),
+        output_text,
+    )
+
+def test_process_pdf_rejects_unknown_output_mode(processor, pdfs, tmp_path):
+    """Test that an unknown output mode is refused before any work is done."""
+    with pytest.raises(ValueError):
+        processor.process_pdf(pdfs["brief"], tmp_path / "uit.pdf", output_mode="layout")
+
+def test_process_pdf_has_no_per_request_state(processor):
+    """Test that the processor only holds the shared models."""
+    assert set(vars(processor)) == {"analyzer", "anonymizer"}
+
+@pytest.mark.slow
+def test_concurrent_mixed_requests(processor, pdfs, tmp_path):
+    """Test that many mixed requests in parallel give the same output as sequential runs."""
+    requests = [
+        {"name": name, "entities": entities, "output_mode": mode}
+        for name, entities, mode in itertools.product(pdfs, ENTITY_FILTERS, ["auto", OUTPUT_TEXT])
+    ]
+
+    def run(index, request):
+        output_path = tmp_path / f"uit_{index}.pdf"
+        stats = processor.process_pdf(
+            pdfs[request["name"]],
+            output_path,
+            entities=request["entities"],
+            output_mode=request["output_mode"]
+        )
+        return stats, output_path
+
+    # Verwachte uitkomst per request, sequentieel berekend
+    expected = [_summary(*run(f"seq_{i}", request)) for i, request in enumerate(requests)]
+
+    # Elke request meerdere keren, door elkaar en parallel
+    jobs = list(enumerate(requests * 4))
+    with ThreadPoolExecutor(max_workers=8) as executor:
+        outcomes = list(executor.map(lambda job: run(*job), jobs))
+
+    for (index, _), (stats, output_path) in zip(jobs, outcomes):
+        assert stats["output_file"] == str(output_path)
+        assert _summary(stats, output_path) == expected[index % len(requests)]
@@ -0,0 +1,103 @@
+import io
+import os
+import zipfile
+import pytest
+from fastapi import FastAPI, Request
+from fastapi.testclient import TestClient
+from src.api.downloads import RangeNotSatisfiable, etag_cache, file_response, iter_zip, parse_range
+
+@pytest.fixture
+def pdf_file(tmp_path):
+    """Create a file with random content, larger than one chunk."""
+    path = tmp_path / "1700000000_brief_geanonimiseerd.pdf"
+    path.write_bytes(os.urandom(200_000))
+    return path
+
+@pytest.fixture
+def client(pdf_file):
+    """Create a test app that serves the file."""
+    app = FastAPI()
+
+    @app.get("/download")
+    async def download(request: Request):
+        return file_response(request, pdf_file, "application/pdf", pdf_file.name)
+
+    return TestClient(app)
+
+def test_parse_range():
+    """Test parsing of single byte ranges."""
+    assert parse_range("bytes=0-99", 1000) == (0, 99)
+    assert parse_range("bytes=900-", 1000) == (900, 999)
+    assert parse_range("bytes=-100", 1000) == (900, 999)
+    assert parse_range("bytes=900-5000", 1000) == (900, 999)
+    assert parse_range("bytes=0-1,5-6", 1000) is None
+    assert parse_range("items=0-1", 1000) is None
+    with pytest.raises(RangeNotSatisfiable):
+        parse_range("bytes=1000-", 1000)
+
+def test_full_download_has_strong_etag(client, pdf_file):
+    """Test that a download sends the whole file with a content-based ETag."""
+    response = client.get("/download")
+
+    assert response.status_code == 200
+    assert response.content == pdf_file.read_bytes()
+    assert response.headers["accept-ranges"] == "bytes"
+    assert response.headers["etag"].startswith('"') and not response.headers["etag"].startswith('W/')
+
+def test_if_none_match_returns_not_modified(client, pdf_file):
+    """Test that an unchanged file is not sent again."""
+    etag = client.get("/download").headers["etag"]
+
+    response = client.get("/download", headers={"If-None-Match": etag})
+    assert response.status_code == 304
+    assert response.content == b""
+
+    # Andere inhoud geeft een nieuwe ETag
+    pdf_file.write_bytes(b"%PDF nieuw")
+    os.utime(pdf_file, ns=(0, 1))
+    response = client.get("/download", headers={"If-None-Match": etag})
+    assert response.status_code == 200
+    assert response.headers["etag"] != etag
+
+def test_range_request_resumes_download(client, pdf_file):
+    """Test that a range request returns only the requested bytes."""
+    content = pdf_file.read_bytes()
+
+    response = client.get("/download", headers={"Range": "bytes=100000-"})
+    assert response.status_code == 206
+    assert response.content == content[100000:]
+    assert response.headers["content-range"] == f"bytes 100000-{len(content) - 1}/{len(content)}"
+
+    response = client.get("/download", headers={"Range": "bytes=10-19"})
+    assert response.content == content[10:20]
+
+def test_range_outside_file_is_rejected(client, pdf_file):
+    """Test that an unsatisfiable range returns 416."""
+    response = client.get("/download", headers={"Range": "bytes=999999-"})
+    assert response.status_code == 416
+    assert response.headers["content-range"] == f"bytes */{pdf_file.stat().st_size}"
+
+def test_range_ignored_when_if_range_does_not_match(client, pdf_file):
+    """Test that a stale If-Range sends the whole file."""
+    response = client.get("/download", headers={"Range": "bytes=0-9", "If-Range": '"verouderd"'})
+    assert response.status_code == 200
+    assert len(response.content) == pdf_file.stat().st_size
+
+def test_etag_is_cached_per_file_version(pdf_file, monkeypatch):
+    """Test that unchanged files are not hashed again."""
+    first = etag_cache.get(pdf_file)
+    monkeypatch.setattr("builtins.open", None)
+    assert etag_cache.get(pdf_file) == first
+
+def test_iter_zip_streams_valid_archive(tmp_path, pdf_file):
+    """Test that the streamed zip contains every file unchanged."""
+    empty = tmp_path / "leeg.pdf"
+    empty.write_bytes(b"")
+    parts = list(iter_zip([(pdf_file, pdf_file.name), (empty, empty.name)]))
+
+    assert len(parts) > 2
+    archive = zipfile.ZipFile(io.BytesIO(b"".join(parts)))
+    assert archive.testzip() is None
+    assert archive.read(pdf_file.name) == pdf_file.read_bytes()
+    assert archive.read("leeg.pdf") == b""
+    assert {info.compress_type for info in archive.infolist()} == {zipfile.ZIP_STORED}
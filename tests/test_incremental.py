@@ -0,0 +1,159 @@
+"""Tests for incremental re-analysis of edited documents."""
+import re
+
+import pytest
+from fastapi import FastAPI, WebSocket
+from fastapi.testclient import TestClient
+from presidio_analyzer import RecognizerResult
+
+from src.api.incremental import incremental_session
+from src.api.lanes import Lane
+from src.core.incremental import IncrementalDocument, split_paragraphs
+
+
+class NameAnalyzer:
+    """Analyzer that marks capitalised words as PERSON and records what it analyzed."""
+
+    def __init__(self):
+        self.analyzed = []
+
+    def analyze_batch(self, texts, entities=None, batch_size=32):
+        for text in texts:
+            self.analyzed.append(text)
+            yield [
+                RecognizerResult("PERSON", match.start(), match.end(), 0.9)
+                for match in re.finditer(r"\b[A-Z][a-z]+\b", text)
+            ]
+
+
+def _spans(document):
+    return [(document.text[r.start:r.end], r.start, r.end) for r in document.results()]
+
+
+def test_split_paragraphs():
+    """Test that paragraphs are split at blank lines with their offsets."""
+    text = "Eerste alinea.\n\nTweede\nregel.\n \n\nDerde."
+    assert split_paragraphs(text) == [(0, "Eerste alinea."), (16, "Tweede\nregel."), (33, "Derde.")]
+    assert split_paragraphs("") == []
+
+
+def test_edit_reanalyzes_only_changed_paragraph():
+    """Test that an edit re-runs the analyzer on the edited paragraph only."""
+    analyzer = NameAnalyzer()
+    document = IncrementalDocument(analyzer)
+    assert document.set_text("Jan woont hier.\n\nPiet werkt daar.\n\nKlaas ook.") == 3
+
+    analyzer.analyzed.clear()
+    # "Jan" vervangen door "Marieke": de rest van het document verschuift
+    assert document.apply_edits([{"start": 0, "end": 3, "text": "Marieke"}]) == 1
+
+    assert analyzer.analyzed == ["Marieke woont hier."]
+    assert _spans(document) == [("Marieke", 0, 7), ("Piet", 21, 25), ("Klaas", 39, 44)]
+    assert document.version == 2
+
+
+def test_edit_matches_full_analysis():
+    """Test that incremental results equal analyzing the final text from scratch."""
+    document = IncrementalDocument(NameAnalyzer())
+    document.set_text("Jan woont hier.\n\nPiet werkt daar.")
+    document.apply_edits([
+        {"start": 15, "end": 15, "text": " Samen met Anna."},
+        {"start": 0, "end": 0, "text": "Brief\n\n"},
+        {"start": 48, "end": 48, "text": "\n\nNieuwe alinea met Kees."},
+    ])
+
+    fresh = IncrementalDocument(NameAnalyzer())
+    fresh.set_text(document.text)
+    assert _spans(document) == _spans(fresh)
+
+
+def test_invalid_edit_leaves_document_unchanged():
+    """Test that an edit outside the document is refused as a whole."""
+    document = IncrementalDocument(NameAnalyzer())
+    document.set_text("Jan woont hier.")
+
+    with pytest.raises(ValueError):
+        document.apply_edits([{"start": 0, "end": 3, "text": "Piet"}, {"start": 10, "end": 99, "text": ""}])
+
+    assert document.text == "Jan woont hier."
+    assert document.version == 1
+
+
+def test_failed_analysis_leaves_document_unchanged():
+    """Test that an edit is not applied when the analyzer fails, so resending it applies it once."""
+    analyzer = NameAnalyzer()
+    document = IncrementalDocument(analyzer)
+    document.set_text("Jan woont hier.")
+
+    def broken(texts, entities=None, batch_size=32):
+        raise RuntimeError("model niet beschikbaar")
+
+    analyzer.analyze_batch, working = broken, analyzer.analyze_batch
+    edit = [{"start": 0, "end": 0, "text": "Piet en "}]
+    with pytest.raises(RuntimeError):
+        document.apply_edits(edit)
+    with pytest.raises(RuntimeError):
+        document.set_text("Iets anders.")
+    assert (document.text, document.version) == ("Jan woont hier.", 1)
+
+    analyzer.analyze_batch = working
+    document.apply_edits(edit)
+    assert (document.text, document.version) == ("Piet en Jan woont hier.", 2)
+    assert [span[0] for span in _spans(document)] == ["Piet", "Jan"]
+
+
+@pytest.fixture
+def client():
+    """Create a test app with an incremental analysis WebSocket."""
+    lane = Lane("test_incremental", workers=1, max_queue=4)
+    app = FastAPI()
+
+    @app.websocket("/analyze/ws")
+    async def analyze_ws(websocket: WebSocket):
+        await incremental_session(websocket, NameAnalyzer(), lane)
+
+    yield TestClient(app)
+    lane.shutdown()
+
+
+def test_websocket_session(client):
+    """Test that a session returns shifted spans after every edit."""
+    with client.websocket_connect("/analyze/ws") as websocket:
+        websocket.send_json({"type": "open", "text": "Jan woont hier.\n\nPiet werkt daar."})
+        reply = websocket.receive_json()
+        assert reply["type"] == "entities"
+        assert reply["version"] == 1
+        assert reply["reanalyzed"] == 2
+        assert [(e["start"], e["end"]) for e in reply["entities"]] == [(0, 3), (17, 21)]
+
+        websocket.send_json({"type": "edit", "version": 1, "edits": [{"start": 0, "end": 0, "text": "Ook "}]})
+        reply = websocket.receive_json()
+        assert reply["version"] == 2
+        assert reply["reanalyzed"] == 1
+        assert [(e["type"], e["start"], e["end"]) for e in reply["entities"]] == [
+            ("PERSON", 0, 3), ("PERSON", 4, 7), ("PERSON", 21, 25)
+        ]
+
+
+def test_websocket_errors_keep_session_open(client):
+    """Test that invalid messages get an error reply without closing the session."""
+    with client.websocket_connect("/analyze/ws") as websocket:
+        websocket.send_json({"type": "edit", "edits": []})
+        assert websocket.receive_json()["type"] == "error"
+
+        websocket.send_text("geen json")
+        assert websocket.receive_json()["type"] == "error"
+
+        websocket.send_json({"type": "open", "text": "Jan"})
+        assert websocket.receive_json()["version"] == 1
+
+        websocket.send_json({"type": "edit", "version": 5, "edits": []})
+        assert "Versie" in websocket.receive_json()["detail"]
+
+        websocket.send_json({"type": "edit", "edits": [{"start": 2, "end": 1, "text": ""}]})
+        assert websocket.receive_json()["type"] == "error"
+
+        websocket.send_json({"type": "edit", "version": 1, "edits": [{"start": 3, "end": 3, "text": " en Piet"}]})
+        reply = websocket.receive_json()
+        assert reply["version"] == 2
+        assert len(reply["entities"]) == 2
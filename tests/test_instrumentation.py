@@ -0,0 +1,179 @@
+"""Tests for the stage metrics and the /metrics endpoint."""
+import base64
+import marshal
+import time
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from prometheus_client import REGISTRY
+
+from src.api.metrics import IN_FLIGHT, InFlightMiddleware, metrics_response
+from src.core.memory import RSSSampler
+from src.core.instrumentation import (
+    ProfilerBusy,
+    model_load,
+    observe,
+    profile_calls,
+    profile_stages,
+    stage,
+)
+
+
+def _sample(name, **labels):
+    return REGISTRY.get_sample_value(name, labels) or 0.0
+
+
+def test_stage_records_duration():
+    """Test that a stage is recorded as one observation with its duration."""
+    count = _sample("presidio_stage_seconds_count", stage="test_stage")
+    total = _sample("presidio_stage_seconds_sum", stage="test_stage")
+
+    with stage("test_stage"):
+        time.sleep(0.01)
+
+    assert _sample("presidio_stage_seconds_count", stage="test_stage") == count + 1
+    assert _sample("presidio_stage_seconds_sum", stage="test_stage") - total >= 0.01
+
+
+def test_stage_records_on_error():
+    """Test that a failing stage is still recorded."""
+    count = _sample("presidio_stage_seconds_count", stage="test_error")
+
+    try:
+        with stage("test_error"):
+            raise ValueError("mislukt")
+    except ValueError:
+        pass
+
+    assert _sample("presidio_stage_seconds_count", stage="test_error") == count + 1
+
+
+def test_observe_and_model_load():
+    """Test that externally timed stages and model load times are recorded."""
+    observe("test_external", 0.5)
+    assert _sample("presidio_stage_seconds_bucket", stage="test_external", le="0.5") >= 1
+
+    with model_load("test_model"):
+        time.sleep(0.01)
+    assert _sample("presidio_model_load_seconds", model="test_model") >= 0.01
+
+
+def test_metrics_endpoint_and_in_flight():
+    """Test that in-flight requests are counted and /metrics renders the Prometheus format."""
+    app = FastAPI()
+    app.add_middleware(InFlightMiddleware)
+    seen = {}
+
+    @app.get("/work")
+    def work():
+        seen["in_flight"] = IN_FLIGHT._value.get()
+        return {}
+
+    @app.get("/metrics")
+    def metrics():
+        return metrics_response()
+
+    client = TestClient(app)
+    before = IN_FLIGHT._value.get()
+    client.get("/work")
+    assert seen["in_flight"] == before + 1
+    assert IN_FLIGHT._value.get() == before
+
+    observe("test_endpoint", 0.1)
+    response = client.get("/metrics")
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("text/plain")
+    assert 'presidio_stage_seconds_count{stage="test_endpoint"}' in response.text
+    assert "presidio_requests_in_flight" in response.text
+
+
+def test_stage_profile_builds_tree():
+    """Test that nested and repeated stages form a merged timing tree."""
+    with profile_stages() as profile:
+        with stage("outer"):
+            for _ in range(3):
+                with stage("inner"):
+                    pass
+            observe("external", 0.25)
+        with stage("second"):
+            pass
+
+    tree = profile.tree()
+    assert tree["stage"] == "total"
+    assert [node["stage"] for node in tree["stages"]] == ["outer", "second"]
+
+    outer = tree["stages"][0]
+    assert outer["calls"] == 1
+    assert {node["stage"]: node["calls"] for node in outer["stages"]} == {"inner": 3, "external": 1}
+    assert outer["stages"][1]["seconds"] == 0.25
+    assert tree["seconds"] >= outer["seconds"]
+
+
+def test_stage_profile_records_peak_memory_per_stage():
+    """Test that with a sampler every stage gets its own peak, and a nested peak counts for its parent."""
+    with RSSSampler(interval=0.001) as sampler, profile_stages(sampler) as profile:
+        with stage("outer"):
+            with stage("small"):
+                pass
+            with stage("large"):
+                blob = b"x" * (64 * 1024 * 1024)
+                time.sleep(0.02)
+                del blob
+
+    outer = profile.tree()["stages"][0]
+    stages = {node["stage"]: node for node in outer["stages"]}
+    assert stages["large"]["peak_rss_bytes"] >= 32 * 1024 * 1024
+    assert stages["small"]["peak_rss_bytes"] < 16 * 1024 * 1024
+    assert outer["peak_rss_bytes"] >= stages["large"]["peak_rss_bytes"]
+
+    # Zonder sampler geen geheugenvelden
+    with profile_stages() as profile:
+        with stage("plain"):
+            pass
+    assert "peak_rss_bytes" not in profile.tree()["stages"][0]
+
+
+def test_pattern_recognizers_have_their_own_stage():
+    """Test that the pattern recognizers are timed as "patterns", apart from the models."""
+    from src.core.recognizers.patterns import DutchIBANRecognizer
+
+    count = _sample("presidio_stage_seconds_count", stage="patterns")
+    with profile_stages() as profile:
+        results = DutchIBANRecognizer().analyze("Rekening NL91ABNA0417164300", ["IBAN"])
+
+    assert [result.entity_type for result in results] == ["IBAN"]
+    assert [node["stage"] for node in profile.tree()["stages"]] == ["patterns"]
+    assert _sample("presidio_stage_seconds_count", stage="patterns") == count + 1
+
+
+def test_stages_outside_profile_are_not_recorded():
+    """Test that stages after the profiled block do not end up in the tree."""
+    with profile_stages() as profile:
+        with stage("inside"):
+            pass
+    with stage("outside"):
+        pass
+
+    assert [node["stage"] for node in profile.tree()["stages"]] == ["inside"]
+
+
+def test_profile_calls_returns_pstats():
+    """Test that a cProfile session yields a summary and loadable pstats data."""
+    def work():
+        return sum(i * i for i in range(10_000))
+
+    with profile_calls() as calls:
+        work()
+
+    assert "work" in calls.summary()
+    stats = marshal.loads(base64.b64decode(calls.dump()))
+    assert any(function[2] == "work" for function in stats)
+
+
+def test_profile_calls_is_exclusive():
+    """Test that only one cProfile session can run at a time."""
+    with profile_calls():
+        with pytest.raises(ProfilerBusy):
+            with profile_calls():
+                pass
@@ -0,0 +1,154 @@
+import threading
+import time
+import pytest
+from src.api.jobs import DONE, FAILED, QUEUED, RUNNING, JobQueue, JobWorkerPool
+
+@pytest.fixture
+def queue(tmp_path):
+    job_queue = JobQueue(tmp_path / "jobs.db")
+    yield job_queue
+    job_queue.close()
+
+def wait_for(queue, job_id, statuses, timeout=5.0):
+    """Poll a job until it reaches one of the given statuses."""
+    deadline = time.time() + timeout
+    while time.time() < deadline:
+        job = queue.get(job_id)
+        if job["status"] in statuses:
+            return job
+        time.sleep(0.01)
+    raise AssertionError(f"Job {job_id} bleef in status {job['status']}")
+
+def test_submit_and_claim_in_order(queue):
+    """Test that jobs are claimed oldest first and marked as running."""
+    first = queue.submit("a.pdf", "/tmp/a.pdf", {"use_ocr": True})
+    second = queue.submit("b.pdf", "/tmp/b.pdf", {})
+    assert queue.depth() == 2
+
+    job = queue.claim()
+    assert job["id"] == first
+    assert job["status"] == RUNNING
+    assert job["options"] == {"use_ocr": True}
+    assert queue.get(first)["status"] == RUNNING
+    assert queue.get(second)["status"] == QUEUED
+    assert queue.depth() == 1
+
+def test_claim_on_empty_queue(queue):
+    """Test that claiming from an empty queue returns None."""
+    assert queue.claim() is None
+
+def test_jobs_survive_restart(tmp_path):
+    """Test that jobs are persisted and interrupted jobs are requeued."""
+    queue = JobQueue(tmp_path / "jobs.db")
+    job_id = queue.submit("a.pdf", "/tmp/a.pdf", {})
+    queue.claim()
+    queue.update_progress(job_id, 3, 10)
+    queue.close()
+
+    queue = JobQueue(tmp_path / "jobs.db")
+    assert queue.requeue_running() == 1
+    job = queue.get(job_id)
+    assert job["status"] == QUEUED
+    assert job["pages_done"] == 0
+    queue.close()
+
+def test_purge_removes_old_finished_jobs(queue):
+    """Test that only finished jobs older than the maximum age are removed."""
+    done = queue.submit("a.pdf", "/tmp/a.pdf", {})
+    waiting = queue.submit("b.pdf", "/tmp/b.pdf", {})
+    queue.complete(done, {"total_entities": 0})
+
+    assert queue.purge(max_age=3600) == []
+    removed = queue.purge(max_age=-1)
+    assert [job["id"] for job in removed] == [done]
+    assert queue.get(done) is None
+    assert queue.get(waiting) is not None
+
+def test_worker_pool_processes_jobs_with_progress(queue):
+    """Test that workers run the handler, record progress and store the result."""
+    seen_progress = []
+
+    def handler(job, progress):
+        for page in range(1, 4):
+            progress(page, 3)
+            seen_progress.append(queue.get(job["id"])["pages_done"])
+        return {"filename": job["filename"]}
+
+    pool = JobWorkerPool(queue, handler, workers=2, poll_interval=0.05)
+    pool.start()
+    try:
+        ids = [queue.submit(f"{i}.pdf", f"/tmp/{i}.pdf", {}) for i in range(4)]
+        jobs = [wait_for(queue, job_id, {DONE, FAILED}) for job_id in ids]
+    finally:
+        pool.stop(timeout=5)
+
+    assert all(job["status"] == DONE for job in jobs)
+    assert [job["result"]["filename"] for job in jobs] == [f"{i}.pdf" for i in range(4)]
+    assert all(job["pages_done"] == 3 and job["pages_total"] == 3 for job in jobs)
+    assert 1 in seen_progress
+
+def test_worker_pool_records_failures(queue):
+    """Test that an exception in the handler marks the job as failed."""
+    def handler(job, progress):
+        raise RuntimeError("kapotte PDF")
+
+    pool = JobWorkerPool(queue, handler, workers=1, poll_interval=0.05)
+    pool.start()
+    try:
+        job = wait_for(queue, queue.submit("a.pdf", "/tmp/a.pdf", {}), {DONE, FAILED})
+    finally:
+        pool.stop(timeout=5)
+
+    assert job["status"] == FAILED
+    assert job["error"] == "kapotte PDF"
+
+def test_claims_are_exclusive(queue):
+    """Test that concurrent workers never claim the same job twice."""
+    ids = {queue.submit(f"{i}.pdf", f"/tmp/{i}.pdf", {}) for i in range(50)}
+    claimed = []
+
+    def worker():
+        while (job := queue.claim()) is not None:
+            claimed.append(job["id"])
+
+    threads = [threading.Thread(target=worker) for _ in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert sorted(claimed) == sorted(ids)
+
+def test_requeue_only_jobs_with_expired_lease(queue):
+    """Test that running jobs with a recent heartbeat are not taken over."""
+    stale = queue.submit("a.pdf", "/tmp/a.pdf", {})
+    live = queue.submit("b.pdf", "/tmp/b.pdf", {})
+    queue.claim()
+    queue.claim()
+    time.sleep(0.2)
+    queue.heartbeat([live])
+
+    assert queue.requeue_running(lease=0.1) == 1
+    assert queue.get(stale)["status"] == QUEUED
+    assert queue.get(live)["status"] == RUNNING
+
+def test_worker_pool_renews_lease_of_running_jobs(queue):
+    """Test that a long job keeps its lease through heartbeats."""
+    release = threading.Event()
+
+    def handler(job, progress):
+        release.wait(5)
+        return {}
+
+    pool = JobWorkerPool(queue, handler, workers=1, poll_interval=0.05, heartbeat_interval=0.05)
+    pool.start()
+    try:
+        job_id = queue.submit("a.pdf", "/tmp/a.pdf", {})
+        wait_for(queue, job_id, {RUNNING})
+        time.sleep(0.5)
+        assert queue.requeue_running(lease=0.3) == 0
+        release.set()
+        assert wait_for(queue, job_id, {DONE, FAILED})["status"] == DONE
+    finally:
+        release.set()
+        pool.stop(timeout=5)
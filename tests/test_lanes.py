@@ -0,0 +1,177 @@
+"""Tests for the interactive and bulk execution lanes."""
+import asyncio
+import contextvars
+import threading
+import time
+
+import pytest
+from fastapi import HTTPException
+from prometheus_client import REGISTRY
+
+from src.api.lanes import Lane
+
+request_id = contextvars.ContextVar("request_id", default=None)
+
+
+def test_run_returns_result_in_caller_context():
+    """Test that tasks run on the lane workers with the caller's context."""
+    lane = Lane("test_context", workers=1, max_queue=4)
+
+    async def main():
+        request_id.set("abc")
+        return await lane.run(lambda x: (x * 2, request_id.get(), threading.current_thread().name), 21)
+
+    value, seen_id, thread = asyncio.run(main())
+    assert value == 42
+    assert seen_id == "abc"
+    assert thread.startswith("lane-test_context")
+    lane.shutdown()
+
+
+def test_full_queue_is_refused_with_429():
+    """Test that a lane refuses new work once its queue is full."""
+    lane = Lane("test_full", workers=1, max_queue=1)
+    release = threading.Event()
+
+    async def main():
+        running = asyncio.ensure_future(lane.run(release.wait))
+        await asyncio.sleep(0.05)
+        queued = asyncio.ensure_future(lane.run(lambda: "later"))
+        await asyncio.sleep(0.05)
+
+        with pytest.raises(HTTPException) as error:
+            await lane.run(lambda: "refused")
+        assert error.value.status_code == 429
+        assert error.value.headers["Retry-After"] == "1"
+        assert lane.stats() == {"queued": 1, "active": 1, "workers": 1}
+
+        release.set()
+        return await running, await queued
+
+    assert asyncio.run(main()) == (True, "later")
+    assert lane.stats()["queued"] == 0
+    assert REGISTRY.get_sample_value("presidio_lane_rejected_total", {"lane": "test_full"}) == 1
+    lane.shutdown()
+
+
+def test_interactive_work_does_not_wait_for_bulk():
+    """Test that a busy bulk lane does not delay the interactive lane."""
+    interactive = Lane("test_fast", workers=1, max_queue=4)
+    bulk = Lane("test_slow", workers=1, max_queue=4, yield_to=interactive)
+    release = threading.Event()
+
+    async def main():
+        slow = asyncio.ensure_future(bulk.run(release.wait))
+        await asyncio.sleep(0.05)
+        start = time.perf_counter()
+        await interactive.run(lambda: None)
+        elapsed = time.perf_counter() - start
+        release.set()
+        await slow
+        return elapsed
+
+    assert asyncio.run(main()) < 0.5
+    interactive.shutdown()
+    bulk.shutdown()
+
+
+def test_bulk_yields_to_interactive():
+    """Test that bulk tasks start only after the interactive lane is idle."""
+    interactive = Lane("test_priority", workers=1, max_queue=4)
+    bulk = Lane("test_background", workers=1, max_queue=4, yield_to=interactive, max_yield=5.0)
+    order = []
+
+    def interactive_task():
+        time.sleep(0.2)
+        order.append("interactive")
+
+    async def main():
+        first = asyncio.ensure_future(interactive.run(interactive_task))
+        await asyncio.sleep(0.05)
+        second = asyncio.ensure_future(bulk.run(lambda: order.append("bulk")))
+        await asyncio.gather(first, second)
+
+    asyncio.run(main())
+    assert order == ["interactive", "bulk"]
+    interactive.shutdown()
+    bulk.shutdown()
+
+
+def test_bulk_yield_is_bounded():
+    """Test that bulk work starts anyway after max_yield seconds."""
+    interactive = Lane("test_busy", workers=1, max_queue=4)
+    bulk = Lane("test_starved", workers=1, max_queue=4, yield_to=interactive, max_yield=0.1)
+    release = threading.Event()
+
+    async def main():
+        busy = asyncio.ensure_future(interactive.run(release.wait))
+        await asyncio.sleep(0.05)
+        result = await bulk.run(lambda: "done")
+        release.set()
+        await busy
+        return result
+
+    assert asyncio.run(main()) == "done"
+    interactive.shutdown()
+    bulk.shutdown()
+
+
+def test_call_runs_in_calling_thread_with_metrics():
+    """Test that call() runs inline and is reported in the lane metrics."""
+    lane = Lane("test_inline", workers=1, max_queue=4)
+    seen = {}
+
+    def task():
+        seen["thread"] = threading.current_thread()
+        seen["active"] = REGISTRY.get_sample_value("presidio_lane_active", {"lane": "test_inline"})
+        return "ok"
+
+    assert lane.call(task) == "ok"
+    assert seen == {"thread": threading.current_thread(), "active": 1}
+    assert REGISTRY.get_sample_value("presidio_lane_active", {"lane": "test_inline"}) == 0
+    assert REGISTRY.get_sample_value("presidio_lane_wait_seconds_count", {"lane": "test_inline"}) == 1
+    lane.shutdown()
+
+
+def test_admit_reserves_a_queue_slot():
+    """Test that admitted requests count as queued before their task is submitted."""
+    lane = Lane("test_reserve", workers=1, max_queue=2)
+    first = lane.admit()
+    second = lane.admit()
+
+    with pytest.raises(HTTPException) as error:
+        lane.admit()
+    assert error.value.status_code == 429
+    assert lane.stats()["queued"] == 2
+
+    first.release()
+    first.release()
+    assert lane.stats()["queued"] == 1
+
+    async def main():
+        # De taak neemt de plek over; vrijgeven daarna telt niet nog eens
+        result = await lane.run(lambda: "done", reservation=second)
+        second.release()
+        return result
+
+    assert asyncio.run(main()) == "done"
+    assert lane.stats() == {"queued": 0, "active": 0, "workers": 1}
+    lane.shutdown()
+
+
+def test_reservation_released_after_stream():
+    """Test that a slot held for a streamed response is released when the stream ends."""
+    lane = Lane("test_stream_slot", workers=1, max_queue=1)
+
+    async def items():
+        yield 1
+        yield 2
+
+    async def main():
+        slot = lane.admit()
+        seen = [item async for item in slot.release_after(items())]
+        return seen
+
+    assert asyncio.run(main()) == [1, 2]
+    assert lane.stats()["queued"] == 0
+    lane.shutdown()
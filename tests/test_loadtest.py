@@ -0,0 +1,85 @@
+"""Tests for the HTTP load test."""
+import pytest
+from fastapi import FastAPI, File, UploadFile
+from fastapi.responses import PlainTextResponse
+
+from src.cli.loadtest import format_report, parse_mix, run_load_test, run_server, sizing, summarize
+
+
+def stub_app():
+    """API stand-in with the load-tested endpoints; PDFs are always rejected."""
+    app = FastAPI()
+
+    @app.post("/analyze")
+    async def analyze(body: dict):
+        return {"entities_found": []}
+
+    @app.post("/anonymize/text")
+    async def anonymize_text(body: dict):
+        return {"anonymized_text": body["text"]}
+
+    @app.post("/anonymize/pdf")
+    async def anonymize_pdf(file: UploadFile = File(...)):
+        await file.read()
+        return PlainTextResponse("druk", status_code=429)
+
+    @app.get("/metrics")
+    async def metrics():
+        return PlainTextResponse("process_resident_memory_bytes 1.048576e+08\n")
+
+    return app
+
+
+def test_parse_mix():
+    """Test that a mix is parsed and unknown endpoints or bad weights are refused."""
+    assert parse_mix("analyze=2, anonymize_pdf=1") == {"analyze": 2.0, "anonymize_pdf": 1.0}
+    assert parse_mix("anonymize_text") == {"anonymize_text": 1.0}
+    for value in ("ocr=1", "analyze=veel", "analyze=-1", "analyze=0"):
+        with pytest.raises(ValueError):
+            parse_mix(value)
+
+
+def test_summarize_and_sizing():
+    """Test per-endpoint rates, percentiles over successes only and the sizing advice."""
+    records = [("analyze", 0.1, 0.2, 200, None), ("analyze", 0.5, 0.4, 200, None),
+               ("anonymize_pdf", 1.2, 0.1, 429, None), ("anonymize_pdf", 1.5, 5.0, 0, "ReadTimeout")]
+    results = summarize(records, [(0.0, 400.0), (1.0, 700.0)], elapsed=2.0)
+
+    analyze = results["endpoints"]["analyze"]
+    assert analyze["ok"] == 2 and analyze["rps"] == 1.0
+    assert analyze["latency"]["p50"] == pytest.approx(0.3)
+    pdf = results["endpoints"]["anonymize_pdf"]
+    assert pdf["reject_rate"] == 0.5 and pdf["error_rate"] == 0.5 and pdf["latency"]["p99"] == 0.0
+    assert pdf["errors_by_kind"] == {"ReadTimeout": 1} and analyze["errors_by_kind"] == {}
+    assert results["rss_mb"] == {"start": 400.0, "peak": 700.0, "end": 700.0}
+    assert [bucket["completed"] for bucket in results["timeline"]] == [2, 1]
+
+    advice = sizing(results, target_rps=5)
+    assert advice["replicas"] == 5
+    assert advice["memory_limit_mb"] == 1024
+
+
+def test_run_load_test_against_server():
+    """Test a short in-process run against a stand-in app, including 429s and RSS samples."""
+    with run_server(stub_app()) as url:
+        results = run_load_test(url=url, concurrency=2, duration=1.0, seed=1, sample_interval=0.5, warmup=1)
+
+    assert set(results["endpoints"]) == {"analyze", "anonymize_text", "anonymize_pdf"}
+    assert results["endpoints"]["analyze"]["ok"] > 0
+    assert results["endpoints"]["anonymize_pdf"]["reject_rate"] == 1.0
+    assert results["total"]["errors"] == 0
+    assert results["rss_mb"]["peak"] == 100.0
+    assert "anonymize_pdf" in format_report(results)
+
+
+def test_failures_are_reported_by_cause():
+    """Test that failed requests are counted per exception type or HTTP status and shown in the report."""
+    with run_server(stub_app()) as url:
+        # Verkeerde root path: elke request geeft 404
+        results = run_load_test(url=url + "/verkeerd", concurrency=1, duration=0.3, mix="analyze", warmup=0)
+    assert results["endpoints"]["analyze"]["errors_by_kind"] == {"HTTP 404": results["total"]["errors"]}
+
+    # Geen server op deze poort: de verbinding mislukt
+    results = run_load_test(url="http://127.0.0.1:9", concurrency=1, duration=0.3, mix="analyze", warmup=0)
+    assert set(results["total"]["errors_by_kind"]) == {"ConnectError"}
+    assert "ConnectError" in format_report(results)
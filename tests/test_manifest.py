@@ -0,0 +1,71 @@
+"""Tests for the batch run manifest."""
+from src.cli.manifest import DONE, FAILED, Manifest, config_hash, file_hash
+
+
+def test_unchanged_file_is_current(tmp_path):
+    """Test that a successfully processed, unchanged file is skipped on the next run."""
+    source = tmp_path / "brief.txt"
+    source.write_text("Jan de Vries woont in Amsterdam.", encoding="utf-8")
+    output = tmp_path / "brief_anon.txt"
+    output.write_text("[PERSOON] woont in [LOCATIE].", encoding="utf-8")
+    settings = config_hash(command="anonymize", entities=[], use_ocr=False)
+
+    manifest = Manifest(tmp_path / "verwerkt" / "manifest.jsonl")
+    manifest.record("brief.txt", file_hash(source), settings, output)
+    manifest.close()
+
+    reopened = Manifest(tmp_path / "verwerkt" / "manifest.jsonl")
+    assert reopened.records["brief.txt"]["status"] == DONE
+    assert reopened.is_current("brief.txt", file_hash(source), settings)
+
+    # Gewijzigde inhoud, andere instellingen of een verdwenen output: opnieuw verwerken
+    source.write_text("Piet woont in Utrecht.", encoding="utf-8")
+    assert not reopened.is_current("brief.txt", file_hash(source), settings)
+    assert not reopened.is_current("brief.txt", reopened.records["brief.txt"]["input_hash"],
+                                   config_hash(command="anonymize", entities=["PERSON"], use_ocr=False))
+    output.unlink()
+    assert not reopened.is_current("brief.txt", reopened.records["brief.txt"]["input_hash"], settings)
+    reopened.close()
+
+
+def test_failed_file_is_retried(tmp_path):
+    """Test that a file that failed is not considered done."""
+    manifest = Manifest(tmp_path / "manifest.jsonl")
+    manifest.record("kapot.pdf", "abc", "def", error="Geen tekst gevonden")
+
+    assert manifest.records["kapot.pdf"]["status"] == FAILED
+    assert not manifest.is_current("kapot.pdf", "abc", "def")
+
+    manifest.record("kapot.pdf", "abc", "def")
+    assert manifest.is_current("kapot.pdf", "abc", "def")
+    manifest.close()
+
+
+def test_truncated_line_is_ignored(tmp_path):
+    """Test that a line cut off by a crash does not break the next run."""
+    path = tmp_path / "manifest.jsonl"
+    manifest = Manifest(path)
+    manifest.record("a.txt", "1", "x")
+    manifest.close()
+    with open(path, "a", encoding="utf-8") as f:
+        f.write('{"input": "b.txt", "input_ha')
+
+    reopened = Manifest(path)
+    assert set(reopened.records) == {"a.txt"}
+    reopened.close()
+
+
+def test_close_compacts_superseded_lines(tmp_path):
+    """Test that repeated records of the same file are compacted on close."""
+    path = tmp_path / "manifest.jsonl"
+    manifest = Manifest(path)
+    for attempt in range(5):
+        manifest.record("a.txt", str(attempt), "x")
+    manifest.record("b.txt", "1", "x")
+    manifest.close()
+
+    lines = path.read_text(encoding="utf-8").splitlines()
+    assert len(lines) == 2
+    reopened = Manifest(path)
+    assert reopened.records["a.txt"]["input_hash"] == "4"
+    reopened.close()
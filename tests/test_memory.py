@@ -0,0 +1,91 @@
+"""Tests for memory accounting and tracemalloc snapshot diffs."""
+import time
+import tracemalloc
+
+import pytest
+from prometheus_client import REGISTRY
+
+from src.core.instrumentation import model_load
+from src.core.memory import AllocationTracker, PeakMemory, current_rss, format_memory_report, memory_report
+
+
+@pytest.fixture
+def tracker():
+    """Create a tracker and make sure tracing stops afterwards."""
+    tracker = AllocationTracker()
+    yield tracker
+    tracker.stop()
+
+
+def test_model_load_records_memory():
+    """Test that loading a model records the memory it added."""
+    with model_load("test_model"):
+        blob = b"x" * (64 * 1024 * 1024)
+
+    size = REGISTRY.get_sample_value("presidio_model_memory_bytes", {"model": "test_model"})
+    assert size >= 32 * 1024 * 1024
+    report = memory_report()
+    assert report["models"]["test_model"] == size
+    assert report["rss_bytes"] == pytest.approx(current_rss(), rel=0.5)
+    assert "test_model" in format_memory_report(report)
+
+
+def test_repeated_model_loads_add_up():
+    """Test that a model loaded twice is reported with the memory of both copies."""
+    for _ in range(2):
+        with model_load("twice_loaded"):
+            blob = b"x" * (16 * 1024 * 1024)
+            time.sleep(0.01)
+        del blob
+
+    report = memory_report()
+    assert report["model_loads"]["twice_loaded"] == 2
+    assert report["models"]["twice_loaded"] == REGISTRY.get_sample_value(
+        "presidio_model_memory_bytes", {"model": "twice_loaded"}
+    )
+    assert "twice_loaded" in format_memory_report(report)
+    assert "(2x loaded)" in format_memory_report(report)
+
+
+def test_peak_memory_of_a_block():
+    """Test that the peak is measured relative to the start, also when the memory is freed again."""
+    with PeakMemory(interval=0.001) as peak:
+        blob = b"x" * (64 * 1024 * 1024)
+        time.sleep(0.05)
+        del blob
+
+    assert peak.rss_bytes >= 32 * 1024 * 1024
+    assert peak.to_dict()["peak_traced_bytes"] is None
+
+
+def test_snapshot_diff_shows_growth(tracker):
+    """Test that the first snapshot starts tracing and the next one shows where memory grew."""
+    assert tracker.snapshot()["status"] == "started"
+    assert tracemalloc.is_tracing()
+
+    kept = [bytes(1000) for _ in range(2000)]
+    result = tracker.snapshot(limit=5)
+
+    assert result["status"] == "diff"
+    assert len(result["top"]) <= 5
+    assert result["size_diff"] >= 2000 * 1000
+    top = result["top"][0]
+    assert top["location"].startswith(__file__) and top["size_diff"] >= 2000 * 1000
+    assert kept
+
+
+def test_peak_memory_with_tracing(tracker):
+    """Test that Python allocations are measured while tracing."""
+    tracker.snapshot()
+    with PeakMemory() as peak:
+        [bytes(1000) for _ in range(1000)]
+    assert peak.traced_bytes >= 1000 * 1000
+
+
+def test_stop(tracker):
+    """Test that stopping ends tracing and the next snapshot starts again."""
+    tracker.snapshot()
+    assert tracker.stop() is True
+    assert not tracemalloc.is_tracing()
+    assert tracker.stop() is False
+    assert tracker.snapshot()["status"] == "started"
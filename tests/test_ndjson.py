@@ -0,0 +1,92 @@
+import json
+import pytest
+from fastapi import FastAPI, Request
+from fastapi.testclient import TestClient
+from src.api.ndjson import NDJSONStreamingResponse, stream_batches
+
+@pytest.fixture
+def batches():
+    """Record the batches passed to the handler."""
+    return []
+
+@pytest.fixture
+def client(batches):
+    """Create a test app with a batch endpoint that upper-cases texts."""
+    app = FastAPI()
+
+    def handle(documents):
+        batches.append([document.text for document in documents])
+        if any(document.text == "kapot" for document in documents):
+            raise RuntimeError("analyse mislukt")
+        return [{"text": document.text.upper()} for document in documents]
+
+    @app.post("/batch")
+    async def batch(request: Request):
+        return NDJSONStreamingResponse(stream_batches(request, handle, batch_size=2))
+
+    return TestClient(app)
+
+def ndjson_body(*items):
+    """Stream request lines one by one, like a client uploading a large export."""
+    for item in items:
+        yield ((item if isinstance(item, str) else json.dumps(item)) + "\n").encode()
+
+def test_batch_results_in_input_order(client, batches):
+    """Test that every document gets one result line, in order and in batches."""
+    response = client.post("/batch", content=ndjson_body(
+        {"text": "jan", "id": "a"},
+        {"text": "piet"},
+        {"text": "klaas", "id": 3}
+    ))
+
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("application/x-ndjson")
+    lines = [json.loads(line) for line in response.text.splitlines()]
+    assert lines == [
+        {"index": 0, "id": "a", "text": "JAN"},
+        {"index": 1, "text": "PIET"},
+        {"index": 2, "id": "3", "text": "KLAAS"},
+    ]
+    assert batches == [["jan", "piet"], ["klaas"]]
+
+def test_invalid_lines_do_not_stop_the_stream(client):
+    """Test that invalid lines and failing batches are reported per document."""
+    response = client.post("/batch", content=ndjson_body(
+        "geen json",
+        {"geen": "tekst"},
+        {"text": "jan"},
+        {"text": "kapot"},
+        {"text": "piet"}
+    ))
+
+    lines = [json.loads(line) for line in response.text.splitlines()]
+    assert [line["index"] for line in lines] == [0, 1, 2, 3, 4]
+    assert "Ongeldige JSON" in lines[0]["error"]
+    assert "Ongeldig document" in lines[1]["error"]
+    assert lines[2]["error"] == lines[3]["error"] == "analyse mislukt"
+    assert lines[4] == {"index": 4, "text": "PIET"}
+
+def test_oversized_line_is_rejected(client, monkeypatch):
+    """Test that a line over the size limit ends the stream with an error."""
+    monkeypatch.setattr("src.api.ndjson.BATCH_MAX_LINE_BYTES", 100)
+    response = client.post("/batch", content=ndjson_body({"text": "jan"}, {"text": "x" * 500}))
+
+    lines = [json.loads(line) for line in response.text.splitlines()]
+    assert lines[0] == {"index": 0, "text": "JAN"}
+    assert lines[1]["index"] == 1
+    assert "Regel groter dan 100 bytes" in lines[1]["error"]
+
+def test_empty_lines_count_for_the_index(client):
+    """Test that empty lines are skipped but counted, as in the CLI, also when lines span chunks."""
+    body = b'{"text": "jan"}\n\n\r\ngeen json\n{"text": "piet", "id": "p"}'
+
+    def chunks(size):
+        for start in range(0, len(body), size):
+            yield body[start:start + size]
+
+    for size in (1, 3, len(body)):
+        lines = [json.loads(line) for line in client.post("/batch", content=chunks(size)).text.splitlines()]
+        assert [line["index"] for line in lines] == [0, 3, 4]
+        assert lines[0] == {"index": 0, "text": "JAN"}
+        assert "Ongeldige JSON" in lines[1]["error"]
+        assert lines[2] == {"index": 4, "id": "p", "text": "PIET"}
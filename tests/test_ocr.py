@@ -0,0 +1,268 @@
+import shutil
+import time
+import numpy as np
+import pytest
+from PIL import Image, ImageDraw, ImageFont
+from presidio_analyzer import RecognizerResult
+from src.core.ocr import (
+    PSM_AUTO,
+    PSM_AUTO_OSD,
+    OCRProcessor,
+    _layout_words,
+    _map_box,
+    cpu_budget,
+    preprocess_image
+)
+from src.core.ocr_backends import TesserocrBackend, get_backend
+from src.core.ocr_cache import OCRCache
+from src.core.redaction import find_redaction_boxes, render_redacted_pdf
+
+requires_tesseract = pytest.mark.skipif(
+    shutil.which("tesseract") is None or shutil.which("pdftoppm") is None,
+    reason="Tesseract en Poppler zijn niet geïnstalleerd"
+)
+
+PAGE_LINES = [
+    "Geachte heer De Vries,",
+    "Hierbij ontvangt u de beschikking van pagina {page}.",
+    "Jan de Vries woont in Amsterdam.",
+    "Met vriendelijke groet,",
+]
+
+def make_scanned_pdf(path, pages=8):
+    """Create a scanned-style PDF: every page is only an image of text."""
+    try:
+        font = ImageFont.load_default(size=36)
+    except TypeError:
+        font = ImageFont.load_default()
+
+    images = []
+    for page in range(1, pages + 1):
+        image = Image.new("L", (1654, 2339), color=255)  # A4 op 200 DPI
+        draw = ImageDraw.Draw(image)
+        for i, line in enumerate(PAGE_LINES):
+            draw.text((150, 200 + i * 80), line.format(page=page), fill=0, font=font)
+        images.append(image)
+
+    images[0].save(path, save_all=True, append_images=images[1:], resolution=200)
+    return path
+
+@pytest.fixture
+def scanned_pdf(tmp_path):
+    return make_scanned_pdf(tmp_path / "scan.pdf")
+
+def test_cpu_budget():
+    """Test that the CPU budget is a sane positive number."""
+    assert cpu_budget() >= 1
+
+def test_max_workers_from_environment(monkeypatch):
+    """Test that OCR_WORKERS overrides the CPU budget."""
+    monkeypatch.setenv("OCR_WORKERS", "3")
+    assert OCRProcessor().max_workers == 3
+    assert OCRProcessor(max_workers=2).max_workers == 2
+
+@requires_tesseract
+@pytest.mark.slow
+def test_parallel_ocr_benchmark(scanned_pdf):
+    """Benchmark serial vs. parallel OCR on a multi-page scan."""
+    serial = OCRProcessor(max_workers=1)
+    parallel = OCRProcessor(max_workers=max(2, cpu_budget()))
+
+    start = time.time()
+    serial_text = serial.process_pdf(str(scanned_pdf))
+    serial_time = time.time() - start
+
+    try:
+        start = time.time()
+        parallel_text = parallel.process_pdf(str(scanned_pdf))
+        parallel_time = time.time() - start
+    finally:
+        parallel.close()
+
+    print(f"\nSerieel: {serial_time:.2f}s, parallel ({parallel.max_workers} workers): "
+          f"{parallel_time:.2f}s, speedup {serial_time / parallel_time:.1f}x")
+
+    # Pagina volgorde moet behouden blijven
+    assert parallel_text == serial_text
+    assert parallel_text.index("pagina 1") < parallel_text.index("pagina 8")
+
+def test_iter_pages_rasterises_in_batches(monkeypatch):
+    """Test that pages are rendered lazily, one batch per Poppler call."""
+    calls = []
+
+    def fake_convert(pdf_path, first_page, last_page, dpi, **kwargs):
+        calls.append((first_page, last_page, dpi))
+        return [Image.new("L", (10, 10)) for _ in range(first_page, last_page + 1)]
+
+    monkeypatch.setattr("src.core.ocr.pdfinfo_from_path", lambda *a, **k: {"Pages": 5})
+    monkeypatch.setattr("src.core.ocr.convert_from_path", fake_convert)
+
+    processor = OCRProcessor(max_workers=1, batch_size=2, dpi=150)
+    pages = processor.iter_pages("scan.pdf")
+
+    next(pages)
+    assert calls == [(1, 2, 150)]
+
+    assert len(list(pages)) == 4
+    assert calls == [(1, 2, 150), (3, 4, 150), (5, 5, 150)]
+
+@requires_tesseract
+def test_spool_to_disk_matches_in_memory(scanned_pdf):
+    """Test that rendering pages to temporary files gives the same text."""
+    in_memory = OCRProcessor(max_workers=1).process_pdf(str(scanned_pdf), dpi=150)
+    spooled = OCRProcessor(max_workers=1, spool_to_disk=True).process_pdf(str(scanned_pdf), dpi=150)
+    assert spooled == in_memory
+
+def test_ocr_cache_roundtrip_and_eviction(tmp_path):
+    """Test that the OCR cache stores text per page and evicts LRU entries."""
+    cache = OCRCache(tmp_path, max_bytes=10)
+    page = Image.new("L", (20, 20), color=255)
+
+    key = cache.key(page, "lang=nld|dpi=200")
+    assert key != cache.key(page, "lang=nld|dpi=300")
+    assert cache.get(key) is None
+
+    cache.put(key, "Jan de Vries")
+    assert cache.get(key) == "Jan de Vries"
+
+    cache.put(cache.key(page, "lang=nld|dpi=300"), "Amsterdam")
+    assert cache.evict() >= 1
+    assert sum(p.stat().st_size for p in tmp_path.glob("*.txt")) <= 10
+
+class FakeBackend:
+    """OCR backend that returns a fixed line of words."""
+
+    def __init__(self):
+        self.calls = 0
+
+    def image_to_words(self, image, psm=None):
+        self.calls += 1
+        return [
+            {"text": text, "block": 1, "par": 1, "line": 1, "box": (10 + i * 50, 20, 40, 12)}
+            for i, text in enumerate(["Jan", "de", "Vries"])
+        ]
+
+def test_ocr_pdf_reports_cache_hits(monkeypatch, tmp_path):
+    """Test that repeated pages skip Tesseract and show up in the hit rate."""
+    backend = FakeBackend()
+    pages = [Image.new("L", (10, 10), color=255) for _ in range(3)]
+    monkeypatch.setattr("src.core.ocr.get_backend", lambda name: backend)
+    monkeypatch.setattr(OCRProcessor, "iter_pages", lambda self, *a, **k: iter(pages))
+
+    processor = OCRProcessor(max_workers=1, cache_dir=tmp_path)
+    result = processor.ocr_pdf("scan.pdf")
+
+    assert result["text"] == "\n\n".join(["Jan de Vries"] * 3)
+    assert backend.calls == 1
+    assert result["stats"]["cache_hits"] == 2
+    assert result["stats"]["cache_hit_rate"] == pytest.approx(2 / 3)
+    assert [page["offset"] for page in result["pages"]] == [0, 14, 28]
+
+def test_layout_words_tracks_offsets():
+    """Test that OCR words are joined into text with matching offsets."""
+    words = [
+        {"text": "Jan", "block": 1, "par": 1, "line": 1, "box": (0, 0, 10, 10)},
+        {"text": "de", "block": 1, "par": 1, "line": 1, "box": (12, 0, 10, 10)},
+        {"text": "Vries", "block": 1, "par": 1, "line": 2, "box": (0, 12, 10, 10)},
+        {"text": "Amsterdam", "block": 2, "par": 1, "line": 1, "box": (0, 40, 10, 10)},
+    ]
+    page = _layout_words(words)
+
+    assert page["text"] == "Jan de\nVries\n\nAmsterdam"
+    for word in page["words"]:
+        assert page["text"][word["start"]:word["end"]] == word["text"]
+
+def test_find_redaction_boxes_maps_spans_to_words():
+    """Test that entity spans in the OCR text are mapped to word boxes."""
+    page = _layout_words(FakeBackend().image_to_words(None))
+    pages = [
+        dict(page, page=1, offset=0),
+        dict(page, page=2, offset=len(page["text"]) + 2),
+    ]
+    text = "\n\n".join(p["text"] for p in pages)
+    start = text.index("Vries", pages[1]["offset"])
+    results = [RecognizerResult("PERSON", start, start + len("Vries"), 0.9)]
+
+    boxes = find_redaction_boxes(pages, results)
+
+    assert boxes == {2: [[110, 20, 40, 12]]}
+
+def test_render_redacted_pdf_burns_in_boxes(tmp_path):
+    """Test that redacted boxes are black in the page image of the output."""
+    image_path = tmp_path / "page-1.png"
+    Image.new("RGB", (200, 100), color="white").save(image_path)
+    pages = [{"page": 1, "dpi": 72, "image_path": str(image_path), "text": "", "words": []}]
+    output_path = tmp_path / "redacted.pdf"
+
+    assert render_redacted_pdf(pages, {1: [[10, 10, 50, 20]]}, output_path) == 1
+    assert output_path.read_bytes().startswith(b"%PDF")
+
+def test_unknown_backend_is_rejected():
+    """Test that an unknown OCR backend fails at construction."""
+    with pytest.raises(ValueError):
+        OCRProcessor(backend="onbekend")
+
+def test_backend_is_reused_per_thread():
+    """Test that the OCR engine is created once and kept alive."""
+    assert get_backend("pytesseract") is get_backend("pytesseract")
+
+@requires_tesseract
+@pytest.mark.slow
+@pytest.mark.skipif(not TesserocrBackend.is_available(), reason="tesserocr is niet geïnstalleerd")
+def test_backend_latency_comparison(scanned_pdf):
+    """Compare per-page OCR latency of the subprocess and in-process backends."""
+    pages = list(OCRProcessor(max_workers=1).iter_pages(str(scanned_pdf)))
+    latencies = {}
+    texts = {}
+
+    for backend in ("pytesseract", "tesserocr"):
+        engine = get_backend(backend)
+        engine.image_to_string(pages[0])  # Warm-up: laadt de taaldata
+
+        start = time.time()
+        texts[backend] = [engine.image_to_string(page) for page in pages]
+        latencies[backend] = (time.time() - start) / len(pages)
+
+    print("\nLatency per pagina: " + ", ".join(
+        f"{backend} {seconds * 1000:.0f}ms" for backend, seconds in latencies.items()
+    ))
+
+    for expected, actual in zip(texts["pytesseract"], texts["tesserocr"]):
+        assert "Jan de Vries" in expected
+        assert "Jan de Vries" in actual
+
+def make_skewed_page(angle=-3):
+    """Create a page with rows of word-like blocks, rotated by angle degrees."""
+    image = Image.new("L", (1600, 2000), color=255)
+    draw = ImageDraw.Draw(image)
+    for row in range(20):
+        for column in range(15):
+            left, top = 150 + column * 85, 200 + row * 80
+            draw.rectangle([left, top, left + 60, top + 25], fill=0)
+    return image.rotate(angle, expand=True, fillcolor=255)
+
+def test_preprocess_image_deskews_binarises_and_downscales():
+    """Test the preprocessing stages and their timings."""
+    page = make_skewed_page(angle=-3)
+    processed, transform, timings = preprocess_image(page, source_dpi=400, target_dpi=200)
+
+    assert transform["scale"] == pytest.approx(0.5)
+    assert transform["angle"] == pytest.approx(3, abs=0.5)
+    assert set(np.unique(np.asarray(processed))) <= {0, 255}
+    assert set(timings) == {"resize", "deskew", "binarise"}
+
+def test_map_box_inverts_preprocessing():
+    """Test that boxes on the preprocessed page map back to the original page."""
+    transform = {"scale": 0.5, "angle": 0.0, "size": [800, 1000], "rotated_size": [800, 1000]}
+    assert _map_box([10, 20, 30, 40], transform) == [20, 40, 60, 80]
+
+    # Draaiing om het midden van de pagina
+    transform = {"scale": 1.0, "angle": 90.0, "size": [100, 100], "rotated_size": [100, 100]}
+    left, top, width, height = _map_box([50, 0, 10, 10], transform)
+    assert (left, top, width, height) == (90, 50, 10, 10)
+
+def test_orientation_detection_can_be_skipped():
+    """Test that disabling OSD selects the page segmentation mode without OSD."""
+    processor = OCRProcessor(max_workers=1, detect_orientation=False)
+    assert processor._options(200)["psm"] == PSM_AUTO
+    assert processor._options(200, detect_orientation=True)["psm"] == PSM_AUTO_OSD
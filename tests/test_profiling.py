@@ -0,0 +1,89 @@
+"""Tests for opt-in per-request profiling."""
+from typing import Optional
+
+import pytest
+from fastapi import FastAPI, Query, Request
+from fastapi.testclient import TestClient
+
+from src.api import security
+from src.api.profiling import PROFILE_PATTERN, RequestProfiler
+from src.core.instrumentation import stage
+
+TOKEN = "geheim"
+
+
+@pytest.fixture
+def client(monkeypatch):
+    """Create a test app with a profiled endpoint."""
+    monkeypatch.setattr(security, "ADMIN_TOKEN", TOKEN)
+    app = FastAPI()
+
+    @app.post("/work")
+    def work(request: Request, profile: Optional[str] = Query(None, pattern=PROFILE_PATTERN)):
+        with RequestProfiler(request, profile) as profiler:
+            with stage("analyze"):
+                with stage("spacy"):
+                    pass
+        return {"profile": profiler.result}
+
+    return TestClient(app)
+
+
+def test_no_profile_by_default(client):
+    """Test that nothing is recorded without the profile parameter."""
+    assert client.post("/work").json() == {"profile": None}
+
+
+def test_timings_profile(client):
+    """Test that profile=timings returns the stage timing tree."""
+    profile = client.post("/work", params={"profile": "timings"}).json()["profile"]
+
+    assert profile["mode"] == "timings"
+    assert "cprofile" not in profile
+    analyze = profile["timings"]["stages"][0]
+    assert analyze["stage"] == "analyze"
+    assert analyze["stages"][0]["stage"] == "spacy"
+
+
+def test_cprofile_requires_admin_token(client):
+    """Test that profile=cprofile is refused without a valid admin token."""
+    assert client.post("/work", params={"profile": "cprofile"}).status_code == 403
+
+    response = client.post(
+        "/work",
+        params={"profile": "cprofile"},
+        headers={security.ADMIN_TOKEN_HEADER: "fout"}
+    )
+    assert response.status_code == 403
+
+
+def test_cprofile_with_admin_token(client):
+    """Test that admins get the cProfile summary and pstats data."""
+    response = client.post(
+        "/work",
+        params={"profile": "cprofile"},
+        headers={security.ADMIN_TOKEN_HEADER: TOKEN}
+    )
+
+    assert response.status_code == 200
+    profile = response.json()["profile"]
+    assert profile["mode"] == "cprofile"
+    assert profile["timings"]["stages"][0]["stage"] == "analyze"
+    assert "cumulative" in profile["cprofile"]["summary"]
+    assert profile["cprofile"]["pstats"]
+
+
+def test_cprofile_disabled_without_configured_token(client, monkeypatch):
+    """Test that cprofile is unavailable when no admin token is configured."""
+    monkeypatch.setattr(security, "ADMIN_TOKEN", "")
+    response = client.post(
+        "/work",
+        params={"profile": "cprofile"},
+        headers={security.ADMIN_TOKEN_HEADER: ""}
+    )
+    assert response.status_code == 403
+
+
+def test_invalid_profile_mode(client):
+    """Test that unknown profile modes are rejected."""
+    assert client.post("/work", params={"profile": "everything"}).status_code == 422
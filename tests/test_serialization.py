@@ -0,0 +1,132 @@
+import gzip
+import json
+import random
+import time
+import pytest
+from fastapi import FastAPI, Request
+from fastapi.encoders import jsonable_encoder
+from fastapi.testclient import TestClient
+from presidio_analyzer import RecognizerResult
+from src.api.models import AnalysisResponse, Entity
+from src.api.serialization import (
+    brotli,
+    compress,
+    dumps,
+    lean_entities,
+    lean_response,
+    negotiate_encoding
+)
+
+RESULTS = [
+    RecognizerResult("PERSON", 0, 12, 0.98),
+    RecognizerResult("LOCATION", 22, 31, 0.851234),
+]
+
+def test_lean_entities_rows_and_columns():
+    """Test the lean and columnar span encodings."""
+    assert lean_entities(RESULTS) == [
+        {"type": "PERSON", "start": 0, "end": 12, "score": 0.98},
+        {"type": "LOCATION", "start": 22, "end": 31, "score": 0.8512},
+    ]
+    assert lean_entities(RESULTS, columnar=True) == {
+        "type": ["PERSON", "LOCATION"],
+        "start": [0, 22],
+        "end": [12, 31],
+        "score": [0.98, 0.8512],
+    }
+
+def test_dumps_is_compact_json():
+    """Test that the fast serialiser writes valid JSON without whitespace."""
+    data = {"anonymized_text": "[NAAM] woont in Zoëterwoude", "entities": lean_entities(RESULTS)}
+    body = dumps(data)
+    assert json.loads(body) == data
+    assert b", " not in body and b": " not in body
+
+def test_negotiate_encoding():
+    """Test that brotli is preferred when available and q=0 is respected."""
+    assert negotiate_encoding("") is None
+    assert negotiate_encoding("identity") is None
+    assert negotiate_encoding("gzip, deflate") == "gzip"
+    assert negotiate_encoding("gzip;q=0, deflate") is None
+    assert negotiate_encoding("gzip, br") == ("br" if brotli else "gzip")
+    assert negotiate_encoding("*") == ("br" if brotli else "gzip")
+
+def test_lean_response_is_compressed_when_accepted(monkeypatch):
+    """Test that large lean responses are gzipped and small ones are not."""
+    monkeypatch.setattr("src.api.serialization.COMPRESS_MIN_BYTES", 500)
+    app = FastAPI()
+
+    @app.get("/lean")
+    async def lean(request: Request, size: int):
+        return lean_response(request, {"entities": lean_entities(RESULTS * size)})
+
+    client = TestClient(app)
+    response = client.get("/lean?size=50", headers={"Accept-Encoding": "gzip"})
+    assert response.headers["content-encoding"] == "gzip"
+    assert response.headers["vary"] == "Accept-Encoding"
+    assert len(response.json()["entities"]) == 100
+
+    response = client.get("/lean?size=1", headers={"Accept-Encoding": "gzip"})
+    assert "content-encoding" not in response.headers
+
+def make_document(size=1024 * 1024, seed=42):
+    """Create a ~1 MB text with a person, location and phone number per sentence."""
+    rng = random.Random(seed)
+    names = ["Jan de Vries", "Fatima el Amrani", "Pieter Jansen", "Sanne Bakker", "Mohamed Yilmaz"]
+    cities = ["Amsterdam", "Rotterdam", "Utrecht", "Zwolle", "Maastricht", "Den Haag"]
+    parts = []
+    results = []
+    length = 0
+    while length < size:
+        name, city = rng.choice(names), rng.choice(cities)
+        phone = f"06-{rng.randrange(10 ** 8):08d}"
+        sentence = f"{name} woont sinds {rng.randrange(1950, 2024)} in {city} en belt naar {phone}. "
+        for value, entity_type in ((name, "PERSON"), (city, "LOCATION"), (phone, "PHONE_NUMBER")):
+            start = length + sentence.index(value)
+            results.append(RecognizerResult(entity_type, start, start + len(value), rng.uniform(0.5, 1.0)))
+        parts.append(sentence)
+        length += len(sentence)
+    return "".join(parts), results
+
+@pytest.mark.slow
+def test_serialisation_benchmark():
+    """Benchmark serialisation time and bytes on the wire for a 1 MB document."""
+    text, results = make_document()
+
+    def full():
+        response = AnalysisResponse(
+            text=text,
+            entities_found=[
+                Entity(entity_type=r.entity_type, text=text[r.start:r.end], score=r.score)
+                for r in results
+            ]
+        )
+        return json.dumps(jsonable_encoder(response)).encode("utf-8")
+
+    variants = {
+        "full": full,
+        "lean": lambda: dumps({"entities": lean_entities(results)}),
+        "columnar": lambda: dumps({"entities": lean_entities(results, columnar=True)}),
+    }
+
+    print(f"\n{len(text) / 1024:.0f} KB tekst, {len(results)} entiteiten")
+    sizes = {}
+    for name, serialise in variants.items():
+        start = time.perf_counter()
+        body = serialise()
+        seconds = time.perf_counter() - start
+        encoded = {"identity": len(body)}
+        for encoding in ("gzip", "br") if brotli else ("gzip",):
+            start = time.perf_counter()
+            encoded[encoding] = len(compress(body, encoding))
+            encoded[f"{encoding}_ms"] = (time.perf_counter() - start) * 1000
+        sizes[name] = encoded
+        print(f"{name:>9}: {seconds * 1000:7.1f} ms, " + ", ".join(
+            f"{key} {value / 1024:.0f} KB" if not key.endswith("_ms") else f"{key} {value:.1f}"
+            for key, value in encoded.items()
+        ))
+
+    assert sizes["lean"]["identity"] < sizes["full"]["identity"]
+    assert sizes["columnar"]["identity"] < sizes["lean"]["identity"]
+    assert sizes["columnar"]["gzip"] < sizes["columnar"]["identity"]
+    assert gzip.decompress(compress(variants["lean"](), "gzip")) == variants["lean"]()
@@ -0,0 +1,100 @@
+import time
+import pytest
+from src.api.storage import StorageIndex, StorageReaper
+
+@pytest.fixture
+def storage(tmp_path):
+    """Create a storage directory with an index."""
+    directory = tmp_path / "storage"
+    directory.mkdir()
+    index = StorageIndex(tmp_path / "storage.db")
+    yield directory, index
+    index.close()
+
+def store(directory, index, name, size=100, ttl=3600, now=None):
+    """Write a file and register it, like process_uploaded_pdf does."""
+    (directory / name).write_bytes(b"x" * size)
+    index.register(name, size, ttl, now=now)
+
+def test_reaper_removes_expired_files(storage):
+    """Test that only expired files are removed from disk and index."""
+    directory, index = storage
+    store(directory, index, "oud.pdf", ttl=-1)
+    store(directory, index, "nieuw.pdf")
+
+    reaper = StorageReaper(index, directory, ttl=3600)
+    assert reaper.reap() == 1
+
+    assert not (directory / "oud.pdf").exists()
+    assert (directory / "nieuw.pdf").exists()
+    assert index.usage() == {"files": 1, "bytes": 100}
+    assert reaper.stats["expired"] == 1
+
+def test_reaper_pass_is_bounded(storage):
+    """Test that one pass removes at most batch_size files."""
+    directory, index = storage
+    for i in range(25):
+        store(directory, index, f"{i}.pdf", ttl=-1)
+
+    reaper = StorageReaper(index, directory, ttl=3600, batch_size=10)
+    assert [reaper.reap() for _ in range(4)] == [10, 10, 5, 0]
+    assert list(directory.iterdir()) == []
+
+def test_quota_evicts_least_recently_used(storage):
+    """Test that files over the quota are evicted in LRU order."""
+    directory, index = storage
+    now = time.time()
+    for i, name in enumerate(["a.pdf", "b.pdf", "c.pdf"]):
+        store(directory, index, name, now=now - 100 + i)
+    index.touch("a.pdf")  # a is net gedownload
+
+    reaper = StorageReaper(index, directory, ttl=3600, max_bytes=200)
+    assert reaper.reap() == 1
+
+    assert sorted(path.name for path in directory.iterdir()) == ["a.pdf", "c.pdf"]
+    assert reaper.usage()["bytes"] == 200
+    assert reaper.usage()["evicted"] == 1
+
+def test_sync_indexes_existing_files(storage):
+    """Test that files from before the index are picked up with their mtime."""
+    directory, index = storage
+    (directory / "bestaand.pdf").write_bytes(b"x" * 10)
+    (directory / "storage.db").write_bytes(b"")
+
+    reaper = StorageReaper(index, directory, ttl=0)
+    assert reaper.sync() == 1
+    assert reaper.sync() == 0
+    assert reaper.reap() == 1
+    assert not (directory / "bestaand.pdf").exists()
+
+def test_reaper_thread_runs_in_background(storage):
+    """Test that the background thread removes files without explicit calls."""
+    directory, index = storage
+    store(directory, index, "oud.pdf", ttl=-1)
+
+    reaper = StorageReaper(index, directory, ttl=3600, interval=0.05)
+    reaper.start()
+    try:
+        deadline = time.time() + 5
+        while (directory / "oud.pdf").exists() and time.time() < deadline:
+            time.sleep(0.01)
+    finally:
+        reaper.stop(timeout=5)
+
+    assert not (directory / "oud.pdf").exists()
+
+def test_reaper_runs_added_tasks(storage):
+    """Test that added cleanup tasks run every pass and a failing task does not stop the pass."""
+    directory, index = storage
+    calls = []
+
+    def failing():
+        raise RuntimeError("kapot")
+
+    reaper = StorageReaper(index, directory, ttl=3600)
+    reaper.add_task(failing)
+    reaper.add_task(lambda: calls.append(1))
+    reaper.reap()
+    reaper.reap()
+
+    assert calls == [1, 1]
@@ -0,0 +1,87 @@
+"""Tests for NDJSON streaming through the CLI."""
+import io
+import json
+
+from src.cli.stream import parse_record, stream_records
+
+
+def upper(texts):
+    return [{"text": text.upper()} for text in texts]
+
+
+def run(data: bytes, handler=upper, **kwargs):
+    sink = io.StringIO()
+    summary = stream_records(io.BytesIO(data), sink, handler, **kwargs)
+    return [json.loads(line) for line in sink.getvalue().splitlines()], summary
+
+
+def test_parse_record():
+    """Test that records are parsed with their id and invalid lines get an error."""
+    assert parse_record(0, b'{"text": "Jan", "id": 7}') == (0, "7", "Jan", None)
+    assert parse_record(1, b"Jan de Vries", plain=True) == (1, None, "Jan de Vries", None)
+
+    _, _, text, error = parse_record(2, b"geen json")
+    assert text is None and error.startswith("Ongeldige JSON")
+    _, record_id, text, error = parse_record(3, b'{"id": "a"}')
+    assert record_id == "a" and text is None and "text" in error
+
+
+def test_stream_records_in_order_with_errors():
+    """Test that every input line gets one output line in order, also invalid ones."""
+    data = b'{"text": "jan", "id": "a"}\n\nkapot\n{"text": "piet"}\n'
+    lines, summary = run(data, batch_size=1)
+
+    assert lines == [
+        {"index": 0, "id": "a", "text": "JAN"},
+        {"index": 2, "error": lines[1]["error"]},
+        {"index": 3, "text": "PIET"},
+    ]
+    assert summary == {"records": 3, "failed": 1}
+
+
+def test_empty_lines_count_for_the_index():
+    """Test that empty lines are skipped but counted, as in the API batch endpoints."""
+    lines, _ = run(b'{"text": "jan"}\n\n\r\ngeen json\n{"text": "piet", "id": "p"}')
+
+    assert [line["index"] for line in lines] == [0, 3, 4]
+    assert lines[0] == {"index": 0, "text": "JAN"}
+    assert "Ongeldige JSON" in lines[1]["error"]
+    assert lines[2] == {"index": 4, "id": "p", "text": "PIET"}
+
+
+def test_stream_records_plain_lines():
+    """Test that plain lines are processed as texts."""
+    lines, _ = run("jan\r\nmariëtte\n".encode("utf-8"), plain=True)
+    assert [line["text"] for line in lines] == ["JAN", "MARIËTTE"]
+
+
+def test_stream_records_batches_and_failures():
+    """Test that texts reach the handler in batches and a failed batch does not end the stream."""
+    calls = []
+
+    def handler(texts):
+        calls.append(list(texts))
+        if "fout" in texts:
+            raise RuntimeError("model kapot")
+        return upper(texts)
+
+    data = b"".join(json.dumps({"text": text}).encode() + b"\n" for text in ["a", "b", "fout", "c", "d"])
+    lines, summary = run(data, handler=handler, batch_size=2)
+
+    assert calls == [["a", "b"], ["fout", "c"], ["d"]]
+    assert [line.get("error") for line in lines] == [None, None, "model kapot", "model kapot", None]
+    assert summary == {"records": 5, "failed": 2}
+
+
+def test_stream_records_writes_each_batch_before_reading_on():
+    """Test that results of a batch are written before the next line is read."""
+    sink = io.StringIO()
+
+    def source():
+        yield b'{"text": "a"}\n'
+        # De eerste batch moet nu al geschreven zijn
+        assert sink.getvalue().count("\n") == 1
+        yield b'{"text": "b"}\n'
+
+    stream_records(source(), sink, upper, batch_size=1)
+    assert sink.getvalue().count("\n") == 2
@@ -0,0 +1,84 @@
+import asyncio
+import io
+import pytest
+from fastapi import FastAPI, File, HTTPException, UploadFile
+from fastapi.testclient import TestClient
+from src.api.uploads import UploadSizeLimitMiddleware, spool_upload
+
+MAX_SIZE = 100_000
+
+@pytest.fixture
+def client(tmp_path):
+    """Create a test app with a size-limited upload endpoint."""
+    app = FastAPI()
+    app.add_middleware(UploadSizeLimitMiddleware, max_size=MAX_SIZE)
+
+    @app.post("/upload/pdf")
+    async def upload(file: UploadFile = File(...)):
+        size = await spool_upload(file, tmp_path / "upload.pdf", max_size=MAX_SIZE)
+        return {"size": size}
+
+    return TestClient(app)
+
+def test_upload_is_spooled_to_disk(client, tmp_path):
+    """Test that an upload within the limit is written to disk unchanged."""
+    content = b"%PDF-1.4 " + bytes(range(256)) * 100
+    response = client.post("/upload/pdf", files={"file": ("scan.pdf", content, "application/pdf")})
+
+    assert response.status_code == 200
+    assert response.json() == {"size": len(content)}
+    assert (tmp_path / "upload.pdf").read_bytes() == content
+
+def test_content_length_over_limit_is_rejected(client, tmp_path):
+    """Test that a too large upload is refused based on Content-Length."""
+    content = b"x" * (MAX_SIZE + 1)
+    response = client.post("/upload/pdf", files={"file": ("scan.pdf", content, "application/pdf")})
+
+    assert response.status_code == 413
+    assert not (tmp_path / "upload.pdf").exists()
+
+def test_chunked_upload_over_limit_is_aborted():
+    """Test that a chunked upload is aborted once it passes the limit."""
+    received = []
+
+    async def app(scope, receive, send):
+        while (await receive()).get("more_body"):
+            pass
+
+    async def receive():
+        received.append(1)
+        return {"type": "http.request", "body": b"x" * 10_000, "more_body": True}
+
+    scope = {"type": "http", "path": "/anonymize/pdf", "headers": []}
+    middleware = UploadSizeLimitMiddleware(app, max_size=MAX_SIZE)
+
+    with pytest.raises(HTTPException) as error:
+        asyncio.run(middleware(scope, receive, None))
+
+    assert error.value.status_code == 413
+    assert len(received) == MAX_SIZE // 10_000 + 1
+
+def test_other_paths_are_not_limited():
+    """Test that only upload paths are limited."""
+    received = []
+
+    async def app(scope, receive, send):
+        while (await receive()).get("more_body"):
+            pass
+
+    async def receive():
+        received.append(1)
+        return {"type": "http.request", "body": b"x" * 10_000, "more_body": len(received) < 50}
+
+    scope = {"type": "http", "path": "/anonymize/batch", "headers": []}
+    asyncio.run(UploadSizeLimitMiddleware(app, max_size=MAX_SIZE)(scope, receive, None))
+    assert len(received) == 50
+
+def test_spool_upload_removes_partial_file(tmp_path):
+    """Test that a rejected upload leaves no partial file behind."""
+    upload = UploadFile(io.BytesIO(b"x" * 1000), filename="scan.pdf")
+    with pytest.raises(HTTPException) as error:
+        asyncio.run(spool_upload(upload, tmp_path / "upload.pdf", max_size=100))
+
+    assert error.value.status_code == 413
+    assert not (tmp_path / "upload.pdf").exists()